@@ -1,139 +1,13 @@
-# pip install requests
-import json, re, csv
-from typing import Any, Dict, List, Tuple, Optional
-import requests
+# pip install requests  (streaming mode: pip install ijson, --parquet/--arrow: pip install pyarrow)
+import json, csv, sys
+from typing import Any, Dict, List, Optional
 from pathlib import Path
 
-BASE = "https://www.pgatour.com"
-STATS_LANDING = f"{BASE}/stats"
-LANG_PATH = "en"
-STAT_ID = "120"  # ← your statId (driving distance page you clicked)
+import metrics
+from snapshots import SnapshotStore, write_delta
+from stat_detail import fetch_stat_detail_json, locate_rows_columns, normalize_rows, iter_normalized, payload_season, stream_stat_table
 
-DEFAULT_HEADERS = {
-    "User-Agent": "Mozilla/5.0 (compatible; PGAStatScraper/1.2)",
-    "Accept": "*/*",
-    "x-nextjs-data": "1",
-}
-DEFAULT_COOKIES = {
-    # Drop in consent cookies if needed
-    # "OptanonConsent": "...",
-    # "OTGPPConsent": "...",
-}
-
-# ===== BuildId discovery (stays stable across deployments) ===================
-def get_build_id() -> str:
-    r = requests.get(STATS_LANDING, headers=DEFAULT_HEADERS, cookies=DEFAULT_COOKIES, timeout=20)
-    r.raise_for_status()
-    html = r.text
-    m = re.search(r'<script id="__NEXT_DATA__" type="application/json">(.+?)</script>', html, re.S)
-    if m:
-        try:
-            return json.loads(m.group(1))["buildId"]
-        except Exception:
-            pass
-    m2 = re.search(r'"buildId"\s*:\s*"([^"]+)"', html)
-    if not m2:
-        raise RuntimeError("Could not find Next.js buildId from /stats")
-    return m2.group(1)
-
-def fetch_stat_detail_json(stat_id: str) -> Dict[str, Any]:
-    url = f"{BASE}/_next/data/{get_build_id()}/{LANG_PATH}/stats/detail/{stat_id}.json"
-    r = requests.get(url, headers=DEFAULT_HEADERS, cookies=DEFAULT_COOKIES, params={"statId": stat_id}, timeout=30)
-    r.raise_for_status()
-    return r.json()
-
-# ===== Find which React Query contains the table =============================
-def _looks_like_rows(arr: Any) -> bool:
-    return isinstance(arr, list) and arr and isinstance(arr[0], dict)
-
-def _extract_table_like(node: Any) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-    rows, cols = [], []
-    def scan(x: Any):
-        nonlocal rows, cols
-        if rows: return
-        if isinstance(x, dict):
-            for rk in ("rows", "data", "tableRows", "items"):
-                if rk in x and _looks_like_rows(x[rk]):
-                    rows = x[rk]
-                    if "columns" in x and isinstance(x["columns"], list):
-                        cols = [c for c in x["columns"] if isinstance(c, dict)]
-                    return
-            for v in x.values(): scan(v)
-        elif isinstance(x, list):
-            for v in x: scan(v)
-    scan(node)
-    return rows, cols
-
-def locate_rows_columns(page_props: Dict[str, Any], stat_id: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Optional[Dict[str, Any]]]:
-    dehydrated = (page_props.get("dehydratedState") or {}).get("queries") or []
-    best = None
-    # Prefer the query whose key mentions our statId
-    for q in dehydrated:
-        key = q.get("queryKey")
-        key_str = json.dumps(key, ensure_ascii=False)
-        if stat_id in (key_str or ""):
-            best = q
-            break
-    if best is None and dehydrated:
-        best = dehydrated[0]
-
-    if not best: return [], [], None
-    data = (best.get("state") or {}).get("data")
-    if not data: return [], [], best
-
-    rows, cols = _extract_table_like(data)
-    if rows: return rows, cols, best
-
-    # Rare fallback
-    rows, cols = _extract_table_like(page_props)
-    return rows, cols, best
-
-# ===== Normalization helpers ==================================================
-def normalize_rows(rows: List[Dict[str, Any]], cols: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    # likely keys
-    player_fields = ["playerName", "player", "fullName", "name", "playerFullName"]
-    rank_fields   = ["rank", "ranking", "position"]
-    avg_candidates = {"avg", "average", "avg_distance", "average_distance", "avgdist", "AVG"}
-    tot_candidates = {"total", "total_yards", "yards", "distance_total", "TOT"}
-    att_candidates = {"attempts", "events", "rounds", "ATT", "EVT", "count"}
-
-    # map column metadata → normalized names
-    col_map = {}
-    for c in cols:
-        raw = (c.get("field") or c.get("id") or c.get("key") or c.get("name") or "").lower()
-        if not raw: continue
-        if any(a in raw for a in avg_candidates): col_map[c.get("field") or c.get("id") or raw] = "avg_distance"
-        elif any(t in raw for t in tot_candidates): col_map[c.get("field") or c.get("id") or raw] = "total_yards"
-        elif any(a in raw for a in att_candidates): col_map[c.get("field") or c.get("id") or raw] = "attempts_or_events"
-
-    def pick_first(d, keys):
-        for k in keys:
-            if k in d and d[k] not in (None, ""):
-                return d[k]
-        return None
-
-    out = []
-    for r in rows:
-        item = {"rank": pick_first(r, rank_fields), "player": pick_first(r, player_fields)}
-        for k, v in r.items():
-            tgt = col_map.get(k)
-            if tgt: item[tgt] = v
-
-        # fallback by raw keys
-        lk = {k.lower(): k for k in r.keys()}
-        if "avg_distance" not in item:
-            for cand in avg_candidates:
-                if cand in lk: item["avg_distance"] = r[lk[cand]]; break
-        if "total_yards" not in item:
-            for cand in tot_candidates:
-                if cand in lk: item["total_yards"] = r[lk[cand]]; break
-        if "attempts_or_events" not in item:
-            for cand in att_candidates:
-                if cand in lk: item["attempts_or_events"] = r[lk[cand]]; break
-
-        if any(item.get(x) is not None for x in ("player","avg_distance","total_yards","rank")):
-            out.append(item)
-    return out
+STAT_ID = "120"  # ← your statId (driving distance page you clicked)
 
 # ===== Pretty printers / full export =========================================
 def preview_columns(cols: List[Dict[str, Any]]):
@@ -162,34 +36,81 @@ def export_raw_and_normalized(rows: List[Dict[str, Any]], cols: List[Dict[str, A
     norm_path = outdir / f"stat_{stat_id}_normalized.json"
     csv_path = outdir / f"stat_{stat_id}_rows_raw.csv"
 
-    # JSON exports
-    raw_path.write_text(json.dumps(rows, ensure_ascii=False, indent=2))
-    cols_path.write_text(json.dumps(cols, ensure_ascii=False, indent=2))
-
     normalized = normalize_rows(rows, cols)
-    norm_path.write_text(json.dumps(normalized, ensure_ascii=False, indent=2))
-
-    # CSV with union of all keys (so you see EVERYTHING each row offers)
-    all_keys = set()
-    for r in rows: all_keys.update(r.keys())
-    headers = sorted(all_keys)
-    with csv_path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=headers)
-        w.writeheader(); w.writerows(rows)
+    with metrics.timer("export", stat_id=stat_id, format="json+csv") as t:
+        # JSON exports
+        raw_path.write_text(json.dumps(rows, ensure_ascii=False, indent=2))
+        cols_path.write_text(json.dumps(cols, ensure_ascii=False, indent=2))
+        norm_path.write_text(json.dumps(normalized, ensure_ascii=False, indent=2))
+
+        # CSV with union of all keys (so you see EVERYTHING each row offers)
+        all_keys = set()
+        for r in rows: all_keys.update(r.keys())
+        headers = sorted(all_keys)
+        with csv_path.open("w", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=headers)
+            w.writeheader(); w.writerows(rows)
+        t.add(rows=len(rows), bytes=sum(p.stat().st_size for p in (raw_path, cols_path, norm_path, csv_path)))
 
     print(f"Saved:\n  {raw_path}\n  {cols_path}\n  {norm_path}\n  {csv_path}\n")
 
-def main():
-    blob = fetch_stat_detail_json(STAT_ID)
+def export_streaming(stat_id: str) -> bool:
+    """
+    Streams rows straight off the response into JSON-lines writers (raw +
+    normalized) without holding the table in memory. Returns False if
+    streaming isn't possible (no ijson, or no table found where expected) so
+    the caller can do a full run.
+    """
+    table = stream_stat_table(stat_id)
+    if table is None:
+        return False
+    cols, rows = table
+    outdir = Path("out"); outdir.mkdir(exist_ok=True)
+    cols_path = outdir / f"stat_{stat_id}_columns.json"
+    raw_path = outdir / f"stat_{stat_id}_rows_raw.jsonl"
+    norm_path = outdir / f"stat_{stat_id}_normalized.jsonl"
+    cols_path.write_text(json.dumps(cols, ensure_ascii=False, indent=2))
+
+    def tee_raw(f):
+        for r in rows:
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+            yield r
+
+    n = 0
+    with metrics.timer("export", stat_id=stat_id, format="jsonl-stream") as t:
+        with raw_path.open("w", encoding="utf-8") as raw_f, norm_path.open("w", encoding="utf-8") as norm_f:
+            for item in iter_normalized(tee_raw(raw_f), cols):
+                norm_f.write(json.dumps(item, ensure_ascii=False) + "\n")
+                n += 1
+        t.add(rows=n, bytes=raw_path.stat().st_size + norm_path.stat().st_size)
+    print(f"Streamed {n} normalized rows:\n  {cols_path}\n  {raw_path}\n  {norm_path}\n")
+    return True
+
+def main(argv: Optional[List[str]] = None):
+    # python 2.py [statId] [flags]; see `python sweep.py --list-categories` for IDs
+    argv = sys.argv[1:] if argv is None else argv
+    stat_id = next((a for a in argv if not a.startswith("--")), STAT_ID)
+    if "--stream" in argv:
+        if export_streaming(stat_id):
+            return
+        print("// Streaming not available (needs ijson, or the table wasn't found); doing a full run\n")
+
+    blob = fetch_stat_detail_json(stat_id)
     page_props = blob.get("pageProps", {}) or {}
 
-    rows, cols, q = locate_rows_columns(page_props, STAT_ID)
+    rows, cols, q = locate_rows_columns(page_props, stat_id)
     if not rows:
         print("// Could not locate rows. Query keys present:")
         keys = [(qi.get("queryKey"), (qi.get('state') or {}).get('data') is not None) for qi in (page_props.get("dehydratedState") or {}).get("queries", [])]
         print(json.dumps(keys, ensure_ascii=False, indent=2))
         return
 
+    if "--delta" in argv:
+        # Only what changed since the last scrape of this stat
+        events = SnapshotStore().diff(stat_id, rows)
+        counts = {op: sum(1 for e in events if e["op"] == op) for op in ("insert", "update", "remove")}
+        print(f"Delta vs last scrape: {counts} -> {write_delta(stat_id, events) or 'no changes'}\n")
+
     # Show which query we matched (helps confirm you’re in the right payload)
     print("=== Matched Query ===")
     print(json.dumps(q.get("queryKey"), ensure_ascii=False, indent=2), "\n")
@@ -198,11 +119,22 @@ def main():
     preview_columns(cols)
     preview_sample_row(rows)
 
-    # Export everything (raw rows, columns, normalized rows, and a wide CSV)
-    export_raw_and_normalized(rows, cols, STAT_ID)
+    normalized = normalize_rows(rows, cols)
+    fmt = next((a[2:] for a in argv if a in ("--parquet", "--arrow")), None)
+    if fmt:
+        # Typed columnar file, partitioned by stat and scrape date
+        import columnar
+        print(f"Saved:\n  {columnar.write_partition(normalized, stat_id, fmt=fmt, season=payload_season(q))}\n")
+    else:
+        # Export everything (raw rows, columns, normalized rows, and a wide CSV)
+        export_raw_and_normalized(rows, cols, stat_id)
+
+    if "--warehouse" in argv:
+        from warehouse import Warehouse
+        with Warehouse() as wh:
+            print(f"Loaded {wh.load_normalized(stat_id, normalized, season=payload_season(q))} values into {wh.path}\n")
 
     # Also print normalized JSON to stdout (what you were expecting earlier)
-    normalized = normalize_rows(rows, cols)
     print("=== Normalized JSON (truncated to first 10) ===")
     print(json.dumps(normalized[:10], ensure_ascii=False, indent=2))
     if len(normalized) > 10:
@@ -1,47 +1,43 @@
 # This script scrapes a table of PGA Tour stats from a dynamic website
-# using the Python libraries Selenium, BeautifulSoup, and pandas.
+# using the Python libraries Selenium and BeautifulSoup.
 #
 # Before running this script, you must have Google Chrome installed on your system.
 # Then, install the required Python libraries using pip:
-# pip install selenium beautifulsoup4 pandas webdriver-manager
+# pip install selenium beautifulsoup4 webdriver-manager
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
-import pandas as pd
 import json
+import sys
 import time
 
-def get_pga_stats_table(url):
+from browser_pool import get_pool
+
+def get_pga_stats_table(url, pool=None):
     """
     Scrapes a table from a given URL using Selenium to handle dynamic content
     and returns the data as a list of dictionaries.
     
     Args:
         url (str): The URL of the webpage to scrape.
+        pool (BrowserPool): Pool to borrow a warm headless Chrome from.
+            Defaults to the process-wide pool, so repeated calls reuse browsers.
         
     Returns:
         list: A list of dictionaries, where each dictionary represents a player's
               stats. Returns an empty list if the table is not found or an
               error occurs.
     """
+    pool = pool or get_pool()
     driver = None
+    broken = False
     try:
-        # Set up headless mode to run the browser without a visible GUI
-        chrome_options = webdriver.ChromeOptions()
-        chrome_options.add_argument('--headless=new')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-
-        # Install and initialize the Chrome WebDriver
-        service = ChromeService(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        # Borrow an already-running headless Chrome from the pool
+        driver = pool.checkout()
 
-        print("Opening browser and navigating to URL...")
+        print("Navigating to URL...")
         driver.get(url)
 
         # Use an explicit wait to ensure the table content has loaded.
@@ -88,18 +84,29 @@ def get_pga_stats_table(url):
 
     except Exception as e:
         print(f"An error occurred during scraping: {e}")
+        broken = True
         return []
     finally:
         if driver:
-            driver.quit()
-            print("Browser closed.")
+            # Back to the pool; a session that errored is discarded instead
+            pool.checkin(driver, broken=broken)
 
-if __name__ == '__main__':
-    # URL for PGA Tour Driving Distance stats
-    url = "https://www.pgatour.com/stats/detail/101"
-    
+def main(url="https://www.pgatour.com/stats/detail/101", capture=False):
+    """
+    Scrapes one stats page and prints the rows as JSON.
+
+    Args:
+        url (str): The stats page. Defaults to Driving Distance (statId 101).
+        capture (bool): Read the stats JSON the page downloads instead of the
+            rendered table.
+    """
     print(f"Attempting to scrape data from: {url}")
-    scraped_data = get_pga_stats_table(url)
+    if capture:
+        # Read the stats JSON the page downloads instead of the rendered table
+        from browser_capture import capture_stat
+        scraped_data = capture_stat(url.rstrip("/").rsplit("/", 1)[-1])
+    else:
+        scraped_data = get_pga_stats_table(url)
 
     if scraped_data:
         # Print the data as a JSON object with indentation for readability
@@ -107,3 +114,6 @@ if __name__ == '__main__':
         print(json.dumps(scraped_data, indent=4))
     else:
         print("Scraping failed.")
+
+if __name__ == '__main__':
+    main(capture="--capture" in sys.argv[1:])
@@ -0,0 +1,155 @@
+# Cross-stat analytics on normalized stat data, vectorized with pandas/NumPy.
+#
+# Everything starts from one long frame
+#   stat_id | season | player_id | player | metric | value
+# built from normalize_rows() output, the SQLite warehouse or the columnar
+# dataset, which is pivoted into a player × stat matrix. Percentiles, z-scores,
+# composites, correlations and season-over-season rolling averages are then
+# whole-matrix operations, with no per-row Python.
+#
+#   python analytics.py --season 2025 --top 20
+#
+# pip install pandas numpy
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from records import StatColumns
+
+LONG_COLUMNS = ["stat_id", "season", "player_id", "player", "metric", "value"]
+PRIMARY_METRIC = "avg_distance"  # normalize_rows() puts a stat's headline value here
+
+# ===== Loading ===============================================================
+def long_from_normalized(tables: Iterable[Tuple[str, int, Union[Iterable[Dict[str, Any]], StatColumns]]],
+                         metrics: Sequence[str] = StatColumns.NUMERIC) -> pd.DataFrame:
+    """
+    Long frame from (stat_id, season, normalized rows) triples.
+
+    Rows come as a StatColumns (sweep results) or normalize_rows() dicts,
+    which are parsed into one first. Each metric is then sliced out of its
+    float column as a whole; values that aren't numbers are left out.
+    """
+    frames = []
+    for stat_id, season, rows in tables:
+        cols = rows if isinstance(rows, StatColumns) else StatColumns.from_normalized(stat_id, rows)
+        arrays = cols.to_numpy()
+        player_id = np.array([p if p is not None else f"name:{n}" for p, n in zip(cols.player_id, cols.player)],
+                             dtype=object)
+        for m in metrics:
+            values = arrays[m]
+            keep = ~np.isnan(values)
+            frames.append(pd.DataFrame({"stat_id": str(stat_id), "season": int(season), "player_id": player_id[keep],
+                                        "player": arrays["player"][keep], "metric": m, "value": values[keep]},
+                                       columns=LONG_COLUMNS))
+    if not frames:
+        return pd.DataFrame(columns=LONG_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+def long_from_warehouse(path: Path = Path("out") / "warehouse.sqlite", latest_only: bool = True) -> pd.DataFrame:
+    """Long frame of season-to-date values from the SQLite warehouse (latest scrape per stat/season by default)."""
+    import sqlite3
+    sql = ("SELECT v.stat_id, v.season, v.player_id, p.name AS player, v.metric, v.value, v.scraped_on "
+           "FROM stat_values v JOIN players p USING (player_id) WHERE v.tournament_id = ''")
+    with sqlite3.connect(str(path)) as conn:
+        df = pd.read_sql_query(sql, conn)
+    if latest_only and not df.empty:
+        last = df.groupby(["stat_id", "season"])["scraped_on"].transform("max")
+        df = df[df["scraped_on"] == last]
+    return df[LONG_COLUMNS].reset_index(drop=True)
+
+def long_from_columnar(root: Optional[Path] = None) -> pd.DataFrame:
+    """Long frame from the columnar 'normalized' dataset (season as stored; scrape year for older files)."""
+    import columnar
+    df = columnar.read_dataset("normalized", root=root or columnar.COLUMNAR_DIR).to_pandas()
+    if df.empty:
+        return pd.DataFrame(columns=LONG_COLUMNS)
+    df["season"] = df["season"].fillna(pd.to_datetime(df["scrape_date"]).dt.year).astype(int)
+    df["player_id"] = df["player_id"].fillna("name:" + df["player"].astype(str))
+    return df.melt(id_vars=["stat_id", "season", "player_id", "player"],
+                   value_vars=["avg_distance", "total_yards", "attempts_or_events"],
+                   var_name="metric", value_name="value")[LONG_COLUMNS]
+
+# ===== Matrix ================================================================
+def player_stat_matrix(long: pd.DataFrame, season: Optional[int] = None, metric: str = PRIMARY_METRIC) -> pd.DataFrame:
+    """
+    Pivots to players (rows) × stat_id (columns) for one metric and season
+    (default: the latest season in the data). Duplicates are averaged.
+    """
+    df = long[long["metric"] == metric]
+    if season is None and not df.empty:
+        season = int(df["season"].max())
+    df = df[df["season"] == season]
+    return df.pivot_table(index="player_id", columns="stat_id", values="value", aggfunc="mean")
+
+def _orient(matrix: pd.DataFrame, lower_is_better: Iterable[str]) -> pd.DataFrame:
+    """Flips stats where a smaller value is better (e.g. scoring average) so higher = better everywhere."""
+    flip = [c for c in matrix.columns if c in set(lower_is_better)]
+    if not flip:
+        return matrix
+    out = matrix.copy()
+    out[flip] = -out[flip]
+    return out
+
+def percentile_ranks(matrix: pd.DataFrame, lower_is_better: Iterable[str] = ()) -> pd.DataFrame:
+    """Percentile (0–1] of each player within each stat; NaN stays NaN."""
+    return _orient(matrix, lower_is_better).rank(pct=True, method="average")
+
+def zscores(matrix: pd.DataFrame, lower_is_better: Iterable[str] = ()) -> pd.DataFrame:
+    """Column-wise z-scores (population std), oriented so higher = better."""
+    m = _orient(matrix, lower_is_better)
+    std = m.std(ddof=0).replace(0, np.nan)
+    return (m - m.mean()) / std
+
+def composite_score(matrix: pd.DataFrame, weights: Optional[Dict[str, float]] = None,
+                    lower_is_better: Iterable[str] = (), min_stats: int = 1) -> pd.Series:
+    """Weighted mean z-score per player over the stats they have; sorted best first."""
+    z = zscores(matrix, lower_is_better)
+    w = pd.Series(1.0, index=z.columns) if weights is None else pd.Series(weights).reindex(z.columns).fillna(0.0)
+    present = z.notna()
+    num = z.fillna(0.0).mul(w, axis=1).sum(axis=1)
+    den = present.mul(w, axis=1).sum(axis=1)
+    score = num / den.replace(0, np.nan)
+    score[present.sum(axis=1) < min_stats] = np.nan
+    return score.sort_values(ascending=False)
+
+def correlations(matrix: pd.DataFrame, method: str = "pearson", min_periods: int = 20) -> pd.DataFrame:
+    """Stat × stat correlation over players that have both stats."""
+    return matrix.corr(method=method, min_periods=min_periods)
+
+def rolling_by_season(long: pd.DataFrame, window: int = 3, metric: str = PRIMARY_METRIC) -> pd.DataFrame:
+    """
+    Rolling mean of each player's value per stat across seasons.
+
+    Returns:
+        DataFrame: stat_id, player_id, season, value, rolling_mean.
+    """
+    df = (long[long["metric"] == metric]
+          .groupby(["stat_id", "player_id", "season"], as_index=False)["value"].mean()
+          .sort_values(["stat_id", "player_id", "season"]))
+    df = df.reset_index(drop=True)
+    rolled = df.groupby(["stat_id", "player_id"], sort=False)["value"].rolling(window, min_periods=1).mean()
+    df["rolling_mean"] = rolled.reset_index(level=[0, 1], drop=True)
+    return df
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Cross-stat player rankings from the stat warehouse.")
+    ap.add_argument("--warehouse", type=Path, default=Path("out") / "warehouse.sqlite")
+    ap.add_argument("--season", type=int)
+    ap.add_argument("--metric", default=PRIMARY_METRIC)
+    ap.add_argument("--lower-is-better", default="", help="comma-separated stat IDs where smaller is better")
+    ap.add_argument("--top", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    long = long_from_warehouse(args.warehouse)
+    matrix = player_stat_matrix(long, args.season, args.metric)
+    lower = [s for s in args.lower_is_better.split(",") if s]
+    names = long.drop_duplicates("player_id").set_index("player_id")["player"]
+    score = composite_score(matrix, lower_is_better=lower).head(args.top)
+    print(f"{matrix.shape[0]} players × {matrix.shape[1]} stats")
+    print(pd.DataFrame({"player": names.reindex(score.index), "composite_z": score.round(3)}).to_string())
+
+if __name__ == "__main__":
+    main()
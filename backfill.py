@@ -0,0 +1,197 @@
+# Resumable historical backfill: (stat_id, season[, tournament]) jobs.
+#
+#   python backfill.py 101,102,120 --seasons 2005-2025
+#   python backfill.py 120 --seasons 2024 --tournaments R2024014,R2024026
+#
+# Every finished job is appended (and fsynced) to a JSON-lines checkpoint, so
+# rerunning the same command after a crash skips the jobs already done and
+# only fetches what is left. Failed jobs are logged but not checkpointed, so
+# they are retried on the next run.
+# pip install requests
+import argparse, itertools, json, os, time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Union
+
+from http_client import DEFAULT_RATE, HostRateLimiter, rate_limited
+from records import StatColumns
+from sweep import DEFAULT_CONCURRENCY, parse_stat_ids, scrape_stat, select_stat_ids
+
+BACKFILL_DIR = Path("out") / "backfill"
+
+@dataclass(frozen=True)
+class Job:
+    stat_id: str
+    season: int
+    tournament_id: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.stat_id}|{self.season}|{self.tournament_id or ''}"
+
+def enumerate_jobs(stat_ids: Iterable[str], seasons: Iterable[int],
+                   tournaments: Sequence[Optional[str]] = (None,)) -> Iterator[Job]:
+    """All (stat, season, tournament) combinations, newest season first."""
+    stat_ids = list(stat_ids)
+    for season in sorted(set(seasons), reverse=True):
+        for tournament_id in tournaments or (None,):
+            for stat_id in stat_ids:
+                yield Job(stat_id, season, tournament_id)
+
+class Checkpoint:
+    """
+    Append-only JSON-lines record of finished jobs.
+
+    Args:
+        path (Path): Checkpoint file; created on first write.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.done: Set[str] = set()
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from a crash
+                    if entry.get("status") == "done":
+                        self.done.add(entry["job"])
+        except OSError:
+            pass
+
+    def record(self, job: Job, status: str, **extra: Any):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps({"job": job.key, "status": status, "at": time.time(), **extra}, ensure_ascii=False)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        if status == "done":
+            self.done.add(job.key)
+
+def check_result(job: Job, res: Dict[str, Any]):
+    """
+    Raises if a scrape_stat() result can't count as this job done: it failed,
+    or the payload is for another season than the job asked for (the site
+    ignoring `year` would otherwise file the current season under old ones).
+    """
+    if res["error"]:
+        raise RuntimeError(res["error"])
+    if res["season"] != job.season:
+        raise LookupError(f"payload is season {res['season']}, not {job.season}")
+
+def write_job_output(job: Job, normalized: Union[List[Dict[str, Any]], StatColumns], outdir: Path = BACKFILL_DIR,
+                     season: Optional[int] = None) -> Path:
+    """Writes one job's rows under <outdir>/<season> (the checked payload season, else the job's)."""
+    season_dir = outdir / str(job.season if season is None else season)
+    season_dir.mkdir(parents=True, exist_ok=True)
+    suffix = f"_{job.tournament_id}" if job.tournament_id else ""
+    path = season_dir / f"stat_{job.stat_id}{suffix}_normalized.json"
+    tmp = path.with_suffix(".tmp")
+    if isinstance(normalized, StatColumns):
+        normalized = list(normalized.dicts())
+    tmp.write_text(json.dumps(normalized, ensure_ascii=False))
+    tmp.replace(path)
+    return path
+
+def run_backfill(jobs: Iterable[Job], checkpoint: Checkpoint, concurrency: int = DEFAULT_CONCURRENCY,
+                 rate: float = DEFAULT_RATE, sink: Optional[Callable[[Job, Dict[str, Any]], None]] = None) -> Dict[str, int]:
+    """
+    Runs the jobs not yet in `checkpoint` on a bounded thread pool. Jobs are
+    submitted a window at a time and each result is dropped once sunk, so
+    memory stays flat however many jobs there are.
+
+    Args:
+        jobs: Jobs to run (already finished ones are skipped).
+        checkpoint (Checkpoint): Where completions are recorded.
+        concurrency (int): Maximum number of requests in flight.
+        rate (float): Requests per second per host.
+        sink: Called in the main thread with (job, sweep result) before the
+            job is checkpointed; an exception leaves the job unfinished. It
+            only sees results that passed check_result().
+
+    Returns:
+        dict: Counts of "skipped", "done" and "failed" jobs.
+    """
+    jobs = list(jobs)
+    pending = [j for j in jobs if j.key not in checkpoint.done]
+    counts = {"skipped": len(jobs) - len(pending), "done": 0, "failed": 0}
+    window = 2 * max(1, concurrency)  # keeps the pool busy while the main thread sinks
+
+    def finish(job: Job, res: Dict[str, Any]):
+        try:
+            check_result(job, res)
+            if sink:
+                sink(job, res)
+        except Exception as e:
+            counts["failed"] += 1
+            checkpoint.record(job, "failed", error=str(e))
+            print(f"{job.key}: FAILED ({e})")
+            return
+        counts["done"] += 1
+        checkpoint.record(job, "done", rows=len(res["normalized"]))
+        print(f"{job.key}: {len(res['normalized'])} rows in {res['seconds']}s")
+
+    todo = iter(pending)
+    inflight: Dict[Future, Job] = {}
+    with rate_limited(HostRateLimiter(rate, burst=concurrency)), ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        while True:
+            for j in itertools.islice(todo, window - len(inflight)):
+                inflight[pool.submit(scrape_stat, j.stat_id, j.season, j.tournament_id)] = j
+            if not inflight:
+                break
+            done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                finish(inflight.pop(fut), fut.result())
+    return counts
+
+def parse_seasons(spec: str) -> List[int]:
+    """"2005-2025" / "2019,2021" / "2024" → list of seasons."""
+    return [int(s) for s in parse_stat_ids([spec])]
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Backfill historical seasons of PGA Tour stats, resumably.")
+    ap.add_argument("stat_ids", nargs="*", help='stat IDs, comma lists or ranges like "100-200"')
+    ap.add_argument("--category", help="every stat in this catalog category")
+    ap.add_argument("--seasons", required=True, help='e.g. "2005-2025" or "2019,2021"')
+    ap.add_argument("--tournaments", default="", help="optional comma-separated tournament IDs")
+    ap.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    ap.add_argument("--rate", type=float, default=DEFAULT_RATE, help="requests/sec per host (0 = unlimited)")
+    ap.add_argument("--out", type=Path, default=BACKFILL_DIR)
+    ap.add_argument("--checkpoint", type=Path, help="defaults to <out>/checkpoint.jsonl")
+    ap.add_argument("--warehouse", type=Path, nargs="?", const=Path("out") / "warehouse.sqlite",
+                    help="also load each job into this SQLite warehouse")
+    args = ap.parse_args(argv)
+
+    if not args.stat_ids and not args.category:
+        ap.error("give stat IDs and/or --category")
+    tournaments = [t for t in args.tournaments.split(",") if t] or [None]
+    # Historical seasons can include retired stats, so only a category consults the catalog
+    stat_ids = select_stat_ids(args.stat_ids, args.category, use_catalog=False)
+    jobs = list(enumerate_jobs(stat_ids, parse_seasons(args.seasons), tournaments))
+    checkpoint = Checkpoint(args.checkpoint or args.out / "checkpoint.jsonl")
+
+    wh = None
+    if args.warehouse:
+        from warehouse import Warehouse
+        wh = Warehouse(args.warehouse)
+
+    def sink(job: Job, res: Dict[str, Any]):
+        write_job_output(job, res["normalized"], args.out, res["season"])
+        if wh:
+            wh.load_normalized(job.stat_id, res["normalized"], season=res["season"], tournament_id=job.tournament_id)
+
+    started = time.perf_counter()
+    try:
+        counts = run_backfill(jobs, checkpoint, args.concurrency, args.rate, sink)
+    finally:
+        if wh:
+            wh.close()
+    print(f"\n{len(jobs)} jobs: {counts['skipped']} already done, {counts['done']} done, "
+          f"{counts['failed']} failed in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
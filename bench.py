@@ -0,0 +1,371 @@
+# Offline benchmarks for the parse / locate / normalize / export hot paths.
+#
+# Every stage runs against synthetic enlargements of the recorded payloads in
+# fixtures/ (the table rows replicated with fresh player IDs), without touching
+# the network or the real cache/ and out/ dirs. Each stage reports its median
+# time over --repeat passes (after one discarded warm-up), rows/s, MB/s and
+# peak traced memory. --save-baseline stores the medians. Later runs are
+# compared against them and exit 1 when a stage gets slower than the tolerance
+# allows. The fixtures as recorded (a handful of rows) are too small to time
+# reliably; --fixtures adds them to the report but never to the baseline.
+#
+#   python bench.py                              # 5k and 50k rows
+#   python bench.py --fixtures                   # ...plus the recorded fixtures as-is
+#   python bench.py --sizes 1000000 --no-memory  # big payloads, timings only
+#   python bench.py --save-baseline              # record benchmarks/baseline.json (commit it)
+#   python bench.py --record 101,120             # refresh fixtures from the live site
+#   python bench.py --startup                    # cold-start time of each cli.py subcommand
+import argparse, contextlib, copy, gc, importlib.util, io, json, os, platform, re, statistics, subprocess, sys, tempfile, time, tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import cli, stat_detail
+from html_table import iter_table_rows
+from next_data import find_next_data, load_next_data
+from table_paths import TablePathIndex
+
+ROOT = Path(__file__).resolve().parent
+FIXTURES_DIR = ROOT / "fixtures"
+# Tracked next to the code (cache/ is gitignored), so every checkout compares against them
+BENCH_DIR = ROOT / "benchmarks"
+BASELINE_PATH = BENCH_DIR / "baseline.json"
+STARTUP_BASELINE_PATH = BENCH_DIR / "startup_baseline.json"
+DEFAULT_SIZES = (5_000, 50_000)
+DEFAULT_REPEAT = 11
+MIN_BASELINE_ROWS = 1_000  # smaller payloads are reported but never saved or compared
+NOISE_FLOOR = 0.002  # seconds; smaller differences never count as regressions
+BYTE_STAGES = {"decode", "next_data", "html_table"}  # stages that read the raw payload (MB/s applies)
+
+Stage = Tuple[str, Callable[[Dict[str, Any]], Any]]
+
+# ===== Fixtures ==============================================================
+def load_fixtures(directory: Path = FIXTURES_DIR) -> List[Tuple[str, str, bytes]]:
+    """(name, kind, raw bytes) for every stat_<id>_next_data.json / stat_<id>.html."""
+    out = []
+    for p in sorted(directory.glob("stat_*_next_data.json")):
+        out.append((p.stem, "next_data", p.read_bytes()))
+    for p in sorted(directory.glob("stat_*.html")):
+        out.append((p.stem, "html", p.read_bytes()))
+    return out
+
+def fixture_stat_id(name: str) -> str:
+    return name.split("_")[1]
+
+def _vary(row: Dict[str, Any], i: int) -> Dict[str, Any]:
+    """Copy of a fixture row that looks like a different player."""
+    r = copy.deepcopy(row)
+    for k in stat_detail.PLAYER_ID_FIELDS:
+        if k in r:
+            r[k] = f"{r[k]}{i:07d}"
+    for k in stat_detail.PLAYER_FIELDS:
+        if isinstance(r.get(k), str):
+            r[k] = f"{r[k]} {i}"
+    for k in stat_detail.RANK_FIELDS:
+        if k in r:
+            r[k] = i + 1 if isinstance(r[k], int) else str(i + 1)
+    return r
+
+def _enlarge_props(page_props: Dict[str, Any], n_rows: int) -> Dict[str, Any]:
+    """page_props with every table-like array grown to n_rows rows."""
+    props = copy.deepcopy(page_props)
+    for q in (props.get("dehydratedState") or {}).get("queries") or []:
+        data = (q.get("state") or {}).get("data")
+        path = stat_detail._find_table_path(data) if data else None
+        if not path:
+            continue
+        holder = data
+        for k in path[:-1]:
+            holder = holder[k]
+        seed = holder[path[-1]]
+        holder[path[-1]] = [_vary(seed[i % len(seed)], i) for i in range(n_rows)]
+    return props
+
+def enlarge(kind: str, raw: bytes, n_rows: int) -> bytes:
+    """A synthetic payload of the same shape as `raw` with n_rows table rows."""
+    if kind == "next_data":
+        blob = json.loads(raw)
+        blob["pageProps"] = _enlarge_props(blob["pageProps"], n_rows)
+        return json.dumps(blob, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    # html: grow the __NEXT_DATA__ table and the rendered <tbody> alike
+    view = find_next_data(raw)
+    page = json.loads(bytes(view))
+    page["props"]["pageProps"] = _enlarge_props(page["props"]["pageProps"], n_rows)
+    start = raw.find(bytes(view))
+    raw = raw[:start] + json.dumps(page, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + raw[start + len(view):]
+    m = re.search(rb"<tbody>(.*?)</tbody>", raw, re.S)
+    if m:
+        trs = re.findall(rb"<tr>.*?</tr>", m.group(1), re.S)
+        if trs:
+            body = b"".join(trs[i % len(trs)] for i in range(n_rows))
+            raw = raw[:m.start(1)] + body + raw[m.end(1):]
+    return raw
+
+def record_fixtures(stat_ids: List[str], directory: Path = FIXTURES_DIR):
+    """Overwrites the fixtures with live captures of these stats."""
+    import http_client
+    directory.mkdir(parents=True, exist_ok=True)
+    for stat_id in stat_ids:
+        blob = stat_detail.fetch_stat_detail_json(stat_id)
+        (directory / f"stat_{stat_id}_next_data.json").write_text(json.dumps(blob, ensure_ascii=False))
+        r = http_client.get(f"{stat_detail.BASE}/stats/detail/{stat_id}", timeout=30)
+        r.raise_for_status()
+        (directory / f"stat_{stat_id}.html").write_bytes(r.content)
+        print(f"recorded stat {stat_id}")
+
+# ===== Stages ================================================================
+def _load_2py():
+    spec = importlib.util.spec_from_file_location("stat_detail_2py", ROOT / "2.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def next_data_stages(workdir: Path) -> List[Stage]:
+    """decode → _extract_table_like → locate (cold, then learned path) → normalize → export."""
+    two = _load_2py()
+
+    def decode(ctx):
+        ctx["blob"] = json.loads(ctx["raw"])
+
+    def extract(ctx):
+        ctx["extracted"] = stat_detail._extract_table_like(ctx["blob"]["pageProps"])
+
+    def locate_cold(ctx):
+        stat_detail.TABLE_PATHS = TablePathIndex(workdir / f"table_paths_{time.perf_counter_ns()}.json")
+        ctx["table"] = stat_detail.locate_rows_columns(ctx["blob"]["pageProps"], ctx["stat_id"], build_id="bench")
+
+    def locate_warm(ctx):
+        ctx["table"] = stat_detail.locate_rows_columns(ctx["blob"]["pageProps"], ctx["stat_id"], build_id="bench")
+
+    def normalize(ctx):
+        rows, cols, _ = ctx["table"]
+        ctx["normalized"] = stat_detail.normalize_rows(rows, cols)
+
+    def export(ctx):
+        rows, cols, _ = ctx["table"]
+        with contextlib.redirect_stdout(io.StringIO()):
+            two.export_raw_and_normalized(rows, cols, ctx["stat_id"])
+
+    return [("decode", decode), ("extract_table_like", extract), ("locate_cold", locate_cold),
+            ("locate_warm", locate_warm), ("normalize", normalize), ("export", export)]
+
+def html_stages(workdir: Path) -> List[Stage]:
+    """pga.py's __NEXT_DATA__ parse and row extraction, plus the streaming <table> parser."""
+    import pga
+
+    def next_data(ctx):
+        ctx["page"] = load_next_data(ctx["raw"])
+
+    def player_rows(ctx):
+        ctx["players"] = pga.player_rows(ctx["page"])
+
+    def html_table(ctx):
+        ctx["table_rows"] = sum(1 for _ in iter_table_rows(ctx["raw"]))
+
+    return [("next_data", next_data), ("pga_player_rows", player_rows), ("html_table", html_table)]
+
+# ===== Runner ================================================================
+def _run_stages(stages: List[Stage], ctx: Dict[str, Any], memory: bool) -> Dict[str, Tuple[float, int]]:
+    """One pass over the stages: {stage: (seconds, peak bytes or 0)}."""
+    out = {}
+    for name, fn in stages:
+        gc.collect()
+        if memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        fn(ctx)
+        elapsed = time.perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1] - before if memory else 0
+        out[name] = (elapsed, peak)
+    return out
+
+def bench_payload(name: str, kind: str, raw: bytes, n_rows: int, workdir: Path,
+                  repeat: int = DEFAULT_REPEAT, memory: bool = True) -> List[Dict[str, Any]]:
+    """
+    Times every stage for one payload.
+
+    Args:
+        name (str): Fixture name (e.g. "stat_120_next_data").
+        kind (str): "next_data" or "html".
+        raw (bytes): The payload.
+        n_rows (int): Table rows in the payload (for rows/s).
+        workdir (Path): Scratch dir; exports and the table path index go here.
+        repeat (int): Timed passes after one warm-up; the median is reported.
+        memory (bool): Also do one tracemalloc pass for peak memory.
+
+    Returns:
+        list: One result dict per stage.
+    """
+    stages = next_data_stages(workdir) if kind == "next_data" else html_stages(workdir)
+    saved_paths = stat_detail.TABLE_PATHS
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        times: Dict[str, List[float]] = {s: [] for s, _ in stages}
+        for i in range(max(1, repeat) + 1):
+            ctx = {"raw": raw, "stat_id": fixture_stat_id(name)}
+            for stage, (seconds, _) in _run_stages(stages, ctx, memory=False).items():
+                if i:  # the first pass warms imports, the allocator and the path index
+                    times[stage].append(seconds)
+            del ctx
+        peaks: Dict[str, int] = {}
+        if memory:
+            tracemalloc.start()
+            try:
+                peaks = {s: p for s, (_, p) in _run_stages(stages, {"raw": raw, "stat_id": fixture_stat_id(name)}, True).items()}
+            finally:
+                tracemalloc.stop()
+    finally:
+        os.chdir(cwd)
+        stat_detail.TABLE_PATHS = saved_paths
+
+    results = []
+    for stage, _ in stages:
+        med = statistics.median(times[stage])
+        results.append({"fixture": name, "rows": n_rows, "stage": stage, "seconds": med, "min_seconds": min(times[stage]),
+                        "rows_per_s": n_rows / med if med else None, "mb_per_s": len(raw) / 1e6 / med if med and stage in BYTE_STAGES else None,
+                        "bytes": len(raw), "peak_bytes": peaks.get(stage)})
+    return results
+
+def count_rows(kind: str, raw: bytes) -> int:
+    blob = json.loads(raw) if kind == "next_data" else load_next_data(raw)["props"]
+    rows, _ = stat_detail._extract_table_like(blob["pageProps"])
+    return len(rows)
+
+def result_key(r: Dict[str, Any]) -> str:
+    return f"{r['fixture']}|{r['rows']}|{r['stage']}"
+
+# ===== Startup ===============================================================
+# What each cli.py subcommand imports before it does any work, run in a fresh
+# interpreter. "cli" is the dispatcher alone (what `--help` and every command pay).
+STARTUP_TARGETS = {
+    "interpreter": "pass",
+    "cli": "import cli; cli.build_parser()",
+    "fetch": "import cli; cli._load('2')",
+    "fetch --explore": "import cli; cli._load('requests_scraper_test')",
+    "export": "import cli; cli._load('pga'); import pandas",
+    "browser": "import cli; cli._load('2nd_pga_stats_scraper_test')",
+    **{name: f"import cli; cli._load({module!r})" for name, (module, _) in cli.PASSTHROUGH.items()},
+}
+HEAVY_MODULES = ("requests", "pandas", "numpy", "pyarrow", "bs4", "selenium", "ijson")
+
+def bench_startup(repeat: int) -> List[Dict[str, Any]]:
+    """Median wall time of a fresh `python -c <target>` per subcommand (first run discarded)."""
+    results = []
+    for stage, code in STARTUP_TARGETS.items():
+        times = []
+        for i in range(repeat + 1):
+            started = time.perf_counter()
+            proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True)
+            seconds = time.perf_counter() - started
+            if proc.returncode:
+                err = proc.stderr.decode(errors="replace").strip().splitlines()
+                print(f"// startup {stage}: skipped ({err[-1] if err else proc.returncode})")
+                break
+            if i:  # the first run warms the OS file cache and __pycache__
+                times.append(seconds)
+        if times:
+            med = statistics.median(times)
+            results.append({"fixture": "startup", "rows": 0, "stage": stage, "seconds": med, "min_seconds": min(times),
+                            "rows_per_s": None, "mb_per_s": None, "bytes": 0, "peak_bytes": None})
+    return results
+
+def heavy_imports_at_startup() -> List[str]:
+    """Heavy third-party modules the bare dispatcher pulls in (should be none)."""
+    code = f"import sys, cli; cli.build_parser(); print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return out.split()
+
+# ===== Baseline ==============================================================
+def save_baseline(results: List[Dict[str, Any]], path: Path = BASELINE_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"python": platform.python_version(), "machine": platform.machine(),
+                                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                                "seconds": {result_key(r): r["seconds"] for r in results if _comparable(r)}}, indent=2))
+
+def _comparable(r: Dict[str, Any]) -> bool:
+    return r["fixture"] == "startup" or r["rows"] >= MIN_BASELINE_ROWS
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """Annotates results with ratio-to-baseline; returns the regressions."""
+    base = baseline.get("seconds", {})
+    regressions = []
+    for r in results:
+        old = base.get(result_key(r))
+        if not old or not _comparable(r):
+            continue
+        r["ratio"] = r["seconds"] / old
+        if r["ratio"] > 1 + tolerance and r["seconds"] - old > NOISE_FLOOR:
+            regressions.append(r)
+    return regressions
+
+def print_report(results: List[Dict[str, Any]]):
+    print(f"{'fixture':<24}{'rows':>9}  {'stage':<20}{'median ms':>11}{'rows/s':>13}{'MB/s':>9}{'peak MiB':>10}{'vs base':>9}")
+    for r in results:
+        peak = f"{r['peak_bytes'] / 2**20:.1f}" if r.get("peak_bytes") is not None else "-"
+        ratio = f"{r['ratio']:.2f}x" if "ratio" in r else "-"
+        mb = f"{r['mb_per_s']:.1f}" if r.get("mb_per_s") else "-"
+        rps = f"{r['rows_per_s']:,.0f}" if r.get("rows_per_s") is not None else "-"
+        print(f"{r['fixture']:<24}{r['rows']:>9}  {r['stage']:<20}{r['seconds'] * 1e3:>11.2f}"
+              f"{rps:>13}{mb:>9}{peak:>10}{ratio:>9}")
+
+def main():
+    ap = argparse.ArgumentParser(description="Offline benchmarks for the stat parse/normalize hot paths.")
+    ap.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                    help="comma-separated synthetic row counts")
+    ap.add_argument("--fixtures", action="store_true", help="also time the recorded fixtures as-is (report only)")
+    ap.add_argument("--only", default="", help="substring filter on fixture names")
+    ap.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    ap.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    ap.add_argument("--baseline", type=Path, help=f"default {BASELINE_PATH} ({STARTUP_BASELINE_PATH} with --startup)")
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    ap.add_argument("--json", type=Path, help="also write the results here")
+    ap.add_argument("--record", help="comma-separated stat IDs to re-capture into fixtures/ first")
+    ap.add_argument("--startup", action="store_true", help="time cli.py subcommand cold starts instead of the payloads")
+    args = ap.parse_args()
+    args.baseline = args.baseline or (STARTUP_BASELINE_PATH if args.startup else BASELINE_PATH)
+
+    if args.record:
+        record_fixtures([s for s in args.record.split(",") if s])
+
+    results: List[Dict[str, Any]] = []
+    if args.startup:
+        heavy = heavy_imports_at_startup()
+        if heavy:
+            raise SystemExit(f"cli.py imports {', '.join(heavy)} at startup; subcommands must import their backends lazily")
+        results = bench_startup(args.repeat)
+    else:
+        sizes = [int(s) for s in args.sizes.split(",") if s]
+        with tempfile.TemporaryDirectory(prefix="pga-bench-") as tmp:
+            for name, kind, raw in load_fixtures():
+                if args.only not in name:
+                    continue
+                for n in ([None] if args.fixtures else []) + sizes:
+                    payload = raw if n is None else enlarge(kind, raw, n)
+                    n_rows = count_rows(kind, payload)
+                    print(f"// {name}: {n_rows} rows, {len(payload) / 1e6:.1f} MB", flush=True)
+                    results += bench_payload(name, kind, payload, n_rows, Path(tmp), args.repeat, not args.no_memory)
+                    del payload
+
+    regressions: List[Dict[str, Any]] = []
+    if args.baseline.exists() and not args.save_baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+    print()
+    print_report(results)
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(results, indent=2))
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"\nBaseline saved to {args.baseline}")
+    elif regressions:
+        print(f"\n{len(regressions)} stage(s) slower than baseline by more than {args.tolerance:.0%}:")
+        for r in regressions:
+            print(f"  {result_key(r)}: {r['ratio']:.2f}x")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# Read a stat table from the data the page itself downloads, not from the DOM.
+#
+# Chrome's DevTools performance log lists every network response. We watch it
+# for the page's own payloads — the server-rendered document (its
+# __NEXT_DATA__), `_next/data/...json` or GraphQL responses — pull the body
+# over CDP and hand it to the same locate/normalize code as 2.py. We return as
+# soon as a payload with rows arrives instead of waiting for the page to render,
+# and hashed CSS classes (css-1osk6s4, ...) no longer matter.
+#
+#   python browser_capture.py 120 101
+#
+# pip install selenium webdriver-manager
+import base64, json, sys, threading, time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from browser_pool import BrowserPool
+from next_data import load_next_data
+from stat_detail import BASE, _extract_table_like, locate_rows_columns, normalize_rows
+
+DATA_URL_HINTS = ("/_next/data/", "graphql")
+DEFAULT_TIMEOUT = 10.0
+
+Table = Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+def get_capture_pool(**kwargs) -> BrowserPool:
+    """Pool with the performance log on and pageLoadStrategy=none (driver.get doesn't block)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(performance_log=True, page_load_strategy="none", **kwargs)
+            import atexit
+            atexit.register(_pool.close)
+        return _pool
+
+def _events(driver) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for entry in driver.get_log("performance"):
+        try:
+            msg = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError, TypeError):
+            continue
+        yield msg.get("method", ""), msg.get("params") or {}
+
+def _response_body(driver, request_id: str) -> Optional[bytes]:
+    try:
+        body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+    except Exception:
+        return None  # evicted from the DevTools buffer, or no body
+    data = body.get("body") or ""
+    return base64.b64decode(data) if body.get("base64Encoded") else data.encode("utf-8")
+
+def _table_from_payload(body: bytes, kind: str, stat_id: str) -> Optional[Table]:
+    if kind == "document":
+        blob = load_next_data(body)
+        page_props = ((blob or {}).get("props") or {}).get("pageProps")
+    else:
+        try:
+            blob = json.loads(body)
+        except ValueError:
+            return None
+        page_props = blob.get("pageProps") if isinstance(blob, dict) else None
+        if page_props is None:
+            # GraphQL: no dehydrated queries, just scan the response data
+            rows, cols = _extract_table_like(blob)
+            return (rows, cols) if rows else None
+    if not isinstance(page_props, dict):
+        return None
+    rows, cols, _ = locate_rows_columns(page_props, stat_id)
+    return (rows, cols) if rows else None
+
+def capture_table(driver, url: str, stat_id: str, timeout: float = DEFAULT_TIMEOUT, poll: float = 0.05) -> Table:
+    """
+    Navigates `driver` to `url` and returns (rows, columns) from the first of
+    the page's own payloads that contains the stat table.
+
+    Raises:
+        TimeoutError: If no such payload arrives within `timeout` seconds.
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.get_log("performance")  # drop the previous page's entries
+    driver.get(url)
+    pending: Dict[str, str] = {}  # requestId -> "document" | "json"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for method, params in _events(driver):
+            rid = params.get("requestId")
+            if method == "Network.responseReceived":
+                resp = params.get("response") or {}
+                if params.get("type") == "Document" and "document" not in pending.values():
+                    pending[rid] = "document"
+                elif any(h in resp.get("url", "") for h in DATA_URL_HINTS) and "json" in resp.get("mimeType", ""):
+                    pending[rid] = "json"
+            elif method == "Network.loadingFinished" and rid in pending:
+                body = _response_body(driver, rid)
+                table = _table_from_payload(body, pending.pop(rid), stat_id) if body else None
+                if table:
+                    driver.execute_script("window.stop();")  # no need to finish rendering
+                    return table
+        time.sleep(poll)
+    raise TimeoutError(f"No stat payload captured from {url} within {timeout}s")
+
+def capture_stat(stat_id: str, pool: Optional[BrowserPool] = None, timeout: float = DEFAULT_TIMEOUT) -> List[Dict[str, Any]]:
+    """
+    Browser fallback for one stat, normalized exactly like 2.py.
+
+    Args:
+        stat_id (str): PGA Tour statId.
+        pool (BrowserPool): Must have performance_log=True; defaults to get_capture_pool().
+        timeout (float): Seconds to wait for the data response.
+
+    Returns:
+        list: normalize_rows() output.
+    """
+    pool = pool or get_capture_pool()
+    with pool.session() as driver:
+        rows, cols = capture_table(driver, f"{BASE}/stats/detail/{stat_id}", stat_id, timeout)
+    return normalize_rows(rows, cols)
+
+if __name__ == "__main__":
+    for sid in sys.argv[1:] or ["120"]:
+        started = time.perf_counter()
+        normalized = capture_stat(sid)
+        print(f"stat {sid}: {len(normalized)} rows in {time.perf_counter() - started:.2f}s")
+        print(json.dumps(normalized[:5], ensure_ascii=False, indent=2))
@@ -0,0 +1,177 @@
+# Pool of warm headless Chrome sessions for the Selenium scrapers.
+#
+# Launching Chrome costs seconds, so sessions are started once and handed out
+# with checkout()/checkin() (or the session() context manager). Each session
+# is recycled after `max_pages` pages to keep memory in check, and images /
+# stylesheets / fonts are blocked since we only ever read the DOM or the
+# page's own data requests.
+# pip install selenium webdriver-manager
+import queue, threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+
+BLOCKED_URLS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+                "*.css", "*.woff", "*.woff2", "*.ttf", "*.mp4"]
+
+class BrowserPool:
+    """
+    A fixed-size pool of reusable Chrome WebDriver sessions.
+
+    Args:
+        size (int): Maximum number of concurrent browser sessions.
+        max_pages (int): Pages served by a session before it is restarted.
+        headless (bool): Run Chrome without a window.
+        block_assets (bool): Don't load images, CSS and fonts.
+        driver_path (str): chromedriver executable; installed via
+            webdriver-manager (once per pool) when not given.
+        performance_log (bool): Record the DevTools performance log, which
+            carries the page's own network traffic (see browser_capture.py).
+        page_load_strategy (str): "normal", "eager" or "none" ("none" makes
+            driver.get return immediately).
+    """
+
+    def __init__(self, size: int = 2, max_pages: int = 50, headless: bool = True, block_assets: bool = True,
+                 driver_path: Optional[str] = None, performance_log: bool = False,
+                 page_load_strategy: str = "normal"):
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.headless = headless
+        self.block_assets = block_assets
+        self.driver_path = driver_path
+        self.performance_log = performance_log
+        self.page_load_strategy = page_load_strategy
+        self._idle: "queue.LifoQueue[webdriver.Chrome]" = queue.LifoQueue()
+        self._pages: Dict[int, int] = {}
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    # ----- lifecycle -----------------------------------------------------------
+    def _options(self) -> webdriver.ChromeOptions:
+        opts = webdriver.ChromeOptions()
+        if self.headless:
+            opts.add_argument("--headless=new")
+        opts.add_argument("--no-sandbox")
+        opts.add_argument("--disable-dev-shm-usage")
+        opts.add_argument("--disable-extensions")
+        if self.block_assets:
+            opts.add_argument("--blink-settings=imagesEnabled=false")
+            opts.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.managed_default_content_settings.stylesheets": 2,
+                "profile.managed_default_content_settings.fonts": 2,
+            })
+        if self.performance_log:
+            opts.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        opts.page_load_strategy = self.page_load_strategy
+        return opts
+
+    def _service(self) -> ChromeService:
+        with self._lock:
+            if self.driver_path is None:
+                from webdriver_manager.chrome import ChromeDriverManager
+                self.driver_path = ChromeDriverManager().install()
+        return ChromeService(executable_path=self.driver_path)
+
+    def _launch(self) -> webdriver.Chrome:
+        driver = webdriver.Chrome(service=self._service(), options=self._options())
+        if self.block_assets:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+        self._pages[id(driver)] = 0
+        return driver
+
+    def _quit(self, driver: webdriver.Chrome):
+        self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def warm_up(self, n: Optional[int] = None):
+        """Starts `n` (default: all) sessions now instead of on first checkout."""
+        drivers = [self.checkout() for _ in range(min(n or self.size, self.size))]
+        for d in drivers:
+            self.checkin(d, pages=0)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----- checkout / return ---------------------------------------------------
+    def checkout(self, timeout: Optional[float] = None) -> webdriver.Chrome:
+        """Borrows a warm session, launching one if the pool isn't full yet."""
+        if self._closed:
+            raise RuntimeError("BrowserPool is closed")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No browser session free within {timeout}s")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._launch()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def checkin(self, driver: webdriver.Chrome, pages: int = 1, broken: bool = False):
+        """
+        Returns a session. It is quit instead of reused when it is `broken`,
+        has served `max_pages` pages, or the pool was closed.
+        """
+        try:
+            served = self._pages.get(id(driver), 0) + pages
+            if broken or self._closed or served >= self.max_pages:
+                self._quit(driver)
+            else:
+                self._pages[id(driver)] = served
+                self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None) -> Iterator[webdriver.Chrome]:
+        """`with pool.session() as driver:` — one page per use; errors discard the session."""
+        driver = self.checkout(timeout)
+        broken = False
+        try:
+            yield driver
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.checkin(driver, broken=broken)
+
+_default_pool: Optional[BrowserPool] = None
+_default_lock = threading.Lock()
+
+def get_pool(**kwargs) -> BrowserPool:
+    """Process-wide pool (kwargs only apply on first call)."""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = BrowserPool(**kwargs)
+            import atexit
+            atexit.register(_default_pool.close)
+        return _default_pool
+
+def close_pool():
+    global _default_pool
+    with _default_lock:
+        if _default_pool is not None:
+            _default_pool.close()
+            _default_pool = None
@@ -0,0 +1,134 @@
+# Next.js buildId cache shared by the `_next/data` scrapers.
+#
+# The buildId only changes when pgatour.com deploys, so we discover it once,
+# persist it to disk, and only rediscover when the TTL runs out or a
+# `_next/data/<buildId>/...json` request comes back 404 (new deployment).
+# Entries are keyed by base URL, so switching PGA_BASE_URL between the real
+# site and mock_server.py never reuses the other host's buildId.
+import json, threading, time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+import metrics
+from next_data import find_build_id
+
+CACHE_PATH = Path("cache") / "build_id.json"
+DEFAULT_TTL = 6 * 60 * 60  # seconds
+DEFAULT_BASE_URL = "https://www.pgatour.com"
+CONFIRM_WINDOW = 60.0  # seconds a rediscovered, unchanged buildId rules out a new deployment
+
+def parse_build_id(html: Union[bytes, str]) -> str:
+    """Pulls the Next.js buildId out of a page's HTML (raw bytes preferred)."""
+    build_id = find_build_id(html)
+    if not build_id:
+        raise RuntimeError("Could not find Next.js buildId from /stats")
+    return build_id
+
+class BuildIdCache:
+    """
+    Disk-backed buildId with a TTL.
+
+    Args:
+        path (Path): Where the buildId is persisted between runs.
+        ttl (float): Seconds a discovered buildId is trusted without a 404.
+        seed (str): Optional known buildId to try before discovering one.
+        base_url (str): Site the buildId belongs to; the file holds one entry per site.
+    """
+
+    def __init__(self, path: Path = CACHE_PATH, ttl: float = DEFAULT_TTL, seed: Optional[str] = None,
+                 base_url: str = DEFAULT_BASE_URL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.seed = seed
+        self.base_url = base_url.rstrip("/")
+        self._build_id: Optional[str] = None
+        self._fetched_at = 0.0
+        self._confirmed_at = float("-inf")  # last time a 404 was checked against a rediscovery
+        self._lock = threading.RLock()  # sweep workers share one cache
+        self._load()
+
+    def _read_hosts(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            blob = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if isinstance(blob, dict) and "buildId" in blob:  # single-host file from before the per-site keys
+            return {DEFAULT_BASE_URL: blob}
+        hosts = blob.get("hosts") if isinstance(blob, dict) else None
+        return hosts if isinstance(hosts, dict) else {}
+
+    def _load(self):
+        try:
+            entry = self._read_hosts()[self.base_url]
+            self._build_id, self._fetched_at = entry["buildId"], float(entry["fetchedAt"])
+        except (KeyError, ValueError, TypeError):
+            self._build_id, self._fetched_at = None, 0.0
+
+    def _save(self):
+        # Re-read first so other sites' entries (written by other processes) survive
+        hosts = self._read_hosts()
+        hosts[self.base_url] = {"buildId": self._build_id, "fetchedAt": self._fetched_at}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"hosts": hosts}))
+        tmp.replace(self.path)
+
+    def peek(self) -> Optional[str]:
+        """Returns the cached buildId if it is still within its TTL."""
+        if self._build_id and time.time() - self._fetched_at < self.ttl:
+            return self._build_id
+        return None
+
+    def get(self, discover: Callable[[], str]) -> str:
+        build_id = self.peek()
+        if build_id:
+            metrics.cache_result("build_id", True)
+            return build_id
+        with self._lock:
+            build_id = self.peek()
+            if build_id:
+                metrics.cache_result("build_id", True)
+                return build_id  # another thread discovered it meanwhile
+            if self.seed and self._build_id is None:
+                # A hard-coded buildId is worth one try; a 404 will replace it.
+                return self.seed
+            metrics.cache_result("build_id", False)
+            self._build_id, self._fetched_at = discover(), time.time()
+            self._save()
+            return self._build_id
+
+    def invalidate(self, stale: Optional[str] = None):
+        """Drops the cached buildId (only if it still equals `stale`, when given)."""
+        with self._lock:
+            if stale is not None and stale not in (self._build_id, self.seed):
+                return  # someone already refreshed it
+            if stale is not None and stale == self.seed:
+                self.seed = None
+            self._build_id, self._fetched_at = "", 0.0
+            self._save()
+
+    def fetch(self, discover: Callable[[], str], request: Callable[[str], Any]) -> Any:
+        """
+        Calls `request(build_id)` and retries once with a fresh buildId on 404.
+
+        A 404 is also what a dead or retired stat gets, so the buildId is only
+        rediscovered if it wasn't just confirmed, and the request is only
+        retried if the buildId actually changed; otherwise the 404 stands.
+
+        Returns:
+            The response object returned by `request`.
+        """
+        build_id = self.get(discover)
+        r = request(build_id)
+        if getattr(r, "status_code", None) != 404:
+            return r
+        with self._lock:
+            if build_id == self._build_id and time.time() - self._confirmed_at < CONFIRM_WINDOW:
+                return r
+            self.invalidate(build_id)
+            fresh = self.get(discover)
+            if fresh == build_id:
+                self._confirmed_at = time.time()
+                return r
+        metrics.count("build_id_refreshes")
+        return request(fresh)
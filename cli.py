@@ -0,0 +1,96 @@
+# One entry point for every scraper in this repo.
+#
+#   python cli.py fetch 120 --parquet         # JSON endpoint → preview + export (2.py)
+#   python cli.py fetch 120 --explore         # print the raw JSON structure (requests_scraper_test.py)
+#   python cli.py export --warehouse          # page HTML → scoring-average table (pga.py)
+#   python cli.py browser 101 --capture       # headless Chrome fallback (Selenium scrapers)
+#   python cli.py sweep 100-200 --rate 8      # also: backfill, queue, live, analytics
+#
+# Only argparse is imported at startup; each subcommand imports its backend
+# (requests, pandas, selenium, ...) when it runs, so short cron/queue jobs and
+# `--help` don't pay for the others. `python bench.py --startup` tracks the
+# cold-start cost of each subcommand.
+import argparse, importlib, importlib.util, os, sys
+from typing import List, Optional
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Subcommands that hand their arguments to an existing argparse main()
+PASSTHROUGH = {
+    "sweep": ("sweep", "fetch and normalize many stats concurrently"),
+    "backfill": ("backfill", "backfill historical seasons, resumably"),
+    "queue": ("work_queue", "enqueue / work / inspect distributed scrape jobs"),
+    "live": ("live", "poll live stats on adaptive intervals and push changes"),
+    "analytics": ("analytics", "cross-stat player rankings (pandas)"),
+}
+
+def _load(module: str):
+    """Imports a sibling module; file names that aren't identifiers (2.py) are loaded by path."""
+    if module.isidentifier():
+        return importlib.import_module(module)
+    name = "pga_" + module.replace(".", "_")
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, module + ".py"))
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+def cmd_fetch(args: argparse.Namespace):
+    if args.explore:
+        _load("requests_scraper_test").main(args.stat_id)
+        return
+    flags = [f"--{f}" for f in ("stream", "delta", "warehouse") if getattr(args, f)]
+    _load("2").main([args.stat_id, *flags, *([f"--{args.format}"] if args.format else [])])
+
+def cmd_export(args: argparse.Namespace):
+    flags = [f"--{f}" for f in ("delta", "warehouse") if getattr(args, f)]
+    _load("pga").main([*flags, *([f"--{args.format}"] if args.format else [])])
+
+def cmd_browser(args: argparse.Namespace):
+    scraper = _load("2nd_pga_stats_scraper_test")
+    base = _load("stat_detail").BASE
+    for sid in args.stat_ids:
+        scraper.main(f"{base}/stats/detail/{sid}", capture=args.capture)
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="cli.py", description="PGA Tour stat scrapers.")
+    sub = ap.add_subparsers(dest="cmd", required=True, metavar="command")
+
+    fetch = sub.add_parser("fetch", help="one stat from the _next/data JSON endpoint")
+    fetch.add_argument("stat_id", nargs="?", default="120")
+    fetch.add_argument("--explore", action="store_true", help="print the JSON structure instead of exporting")
+    fetch.add_argument("--stream", action="store_true", help="stream rows to JSON lines (needs ijson)")
+    fetch.add_argument("--delta", action="store_true", help="also write changes vs the last scrape")
+    fetch.add_argument("--warehouse", action="store_true", help="also load into out/warehouse.sqlite")
+    fetch.add_argument("--format", choices=("parquet", "arrow"), help="columnar file instead of JSON/CSV")
+    fetch.set_defaults(func=cmd_fetch)
+
+    export = sub.add_parser("export", help="scoring-average table from the stats page HTML (pandas)")
+    export.add_argument("--delta", action="store_true", help="also write changes vs the last scrape")
+    export.add_argument("--warehouse", action="store_true", help="also load into out/warehouse.sqlite")
+    export.add_argument("--format", choices=("parquet", "arrow"), help="also write a columnar copy")
+    export.set_defaults(func=cmd_export)
+
+    browser = sub.add_parser("browser", help="scrape through headless Chrome (selenium)")
+    browser.add_argument("stat_ids", nargs="*", default=["101"])
+    browser.add_argument("--capture", action="store_true", help="read the page's data requests instead of the DOM")
+    browser.set_defaults(func=cmd_browser)
+
+    for name, (_, help_text) in PASSTHROUGH.items():
+        sub.add_parser(name, help=help_text, add_help=False)
+    return ap
+
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in PASSTHROUGH:
+        # The backend parses its own options (and -h); its usage line reads "cli.py <command>"
+        sys.argv[0] = f"cli.py {argv[0]}"
+        _load(PASSTHROUGH[argv[0]][0]).main(argv[1:])
+        return
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
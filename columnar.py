@@ -0,0 +1,136 @@
+# Columnar (Parquet / Arrow IPC) output for scraped stat tables.
+#
+# Each write appends one compressed file to a hive-partitioned dataset:
+#   out/columnar/<dataset>/stat_id=<id>/scrape_date=<YYYY-MM-DD>/part-<ts>.parquet
+# Every file of a dataset shares the same schema, so the whole tree can be
+# opened with pyarrow.dataset / DuckDB / pandas and filtered by partition.
+# pip install pyarrow
+import datetime as dt
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # columnar output is optional
+    pa = None
+
+from records import StatColumns, to_float
+
+COLUMNAR_DIR = Path("out") / "columnar"
+FORMATS = ("parquet", "arrow")
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Columnar output needs pyarrow: pip install pyarrow")
+
+def _str(v: Any) -> Optional[str]:
+    return None if v is None or v == "" else str(v)
+
+# ===== Schemas ===============================================================
+# (column, arrow type name, converter) — partition columns are not stored in
+# the files themselves, they come back from the directory names.
+SCHEMAS: Dict[str, List[Any]] = {
+    # normalize_rows() output from 2.py / sweep.py
+    "normalized": [
+        ("rank", "string", _str),
+        ("player", "string", _str),
+        ("player_id", "string", _str),
+        ("avg_distance", "float64", to_float),
+        ("total_yards", "float64", to_float),
+        ("attempts_or_events", "float64", to_float),
+    ],
+    # player_info rows from pga.py
+    "player_stats": [
+        ("rank", "string", _str),
+        ("player_id", "string", _str),
+        ("player_name", "string", _str),
+        ("country", "string", _str),
+        ("scoring_avg", "float64", to_float),
+        ("total_strokes", "float64", to_float),
+        ("total_adjustment", "float64", to_float),
+        ("total_rounds", "float64", to_float),
+    ],
+}
+
+def arrow_schema(dataset: str) -> "pa.Schema":
+    _require_pyarrow()
+    fields = [pa.field(name, getattr(pa, type_name)()) for name, type_name, _ in SCHEMAS[dataset]]
+    fields.append(pa.field("scraped_at", pa.timestamp("s", tz="UTC")))
+    fields.append(pa.field("season", pa.int32()))  # the payload's season (null if unknown)
+    return pa.schema(fields)
+
+def to_table(rows: Union[Iterable[Dict[str, Any]], StatColumns], dataset: str,
+             scraped_at: Optional[dt.datetime] = None, season: Optional[int] = None) -> "pa.Table":
+    """
+    Builds a typed Arrow table in one column-wise pass over `rows`. A
+    StatColumns is converted column by column, straight from its arrays.
+    """
+    _require_pyarrow()
+    spec = SCHEMAS[dataset]
+    scraped_at = scraped_at or dt.datetime.now(dt.timezone.utc)
+    if isinstance(rows, StatColumns):
+        arrays = rows.to_numpy()  # NaN marks a missing number; from_pandas turns it into null
+        columns = [pa.array(arrays[name], type=getattr(pa, type_name)(), from_pandas=True) for name, type_name, _ in spec]
+        n = len(rows)
+        return pa.Table.from_arrays(columns + [[scraped_at] * n, [season] * n], schema=arrow_schema(dataset))
+    columns: List[List[Any]] = [[] for _ in spec]
+    n = 0
+    for r in rows:
+        for col, (name, _, conv) in zip(columns, spec):
+            col.append(conv(r.get(name)))
+        n += 1
+    return pa.Table.from_arrays(columns + [[scraped_at] * n, [season] * n], schema=arrow_schema(dataset))
+
+def write_partition(rows: Union[Iterable[Dict[str, Any]], StatColumns], stat_id: str, dataset: str = "normalized", fmt: str = "parquet",
+                    root: Path = COLUMNAR_DIR, scraped_at: Optional[dt.datetime] = None,
+                    season: Optional[int] = None) -> Optional[Path]:
+    """
+    Appends `rows` as a new file in the stat_id / scrape_date partition.
+
+    Args:
+        rows: Dicts keyed by the dataset's column names (extra keys ignored),
+            or a StatColumns for the "normalized" dataset.
+        stat_id (str): PGA Tour statId, used as a partition key.
+        dataset (str): Key of SCHEMAS ("normalized" or "player_stats").
+        fmt (str): "parquet" (zstd) or "arrow" (uncompressed IPC, memory-mappable).
+        root (Path): Root directory of all datasets.
+        scraped_at (datetime): Timestamp for the rows (defaults to now, UTC).
+        season (int): Season the payload reports (stat_detail.payload_season),
+            stored per row; the scrape date doesn't say which season it was.
+
+    Returns:
+        Path: The file written, or None if there were no rows.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown columnar format {fmt!r} (expected one of {FORMATS})")
+    scraped_at = scraped_at or dt.datetime.now(dt.timezone.utc)
+    if dataset == "normalized" and not isinstance(rows, StatColumns):
+        rows = StatColumns.from_normalized(stat_id, rows)  # numbers parsed and strings interned once
+    table = to_table(rows, dataset, scraped_at, season)
+    if table.num_rows == 0:
+        return None
+    part_dir = Path(root) / dataset / f"stat_id={stat_id}" / f"scrape_date={scraped_at.date().isoformat()}"
+    part_dir.mkdir(parents=True, exist_ok=True)
+    name = f"part-{scraped_at.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    if fmt == "parquet":
+        path = part_dir / f"{name}.parquet"
+        pq.write_table(table, path, compression="zstd")
+    else:
+        path = part_dir / f"{name}.arrow"
+        feather.write_feather(table, path, compression="uncompressed")
+    return path
+
+def read_dataset(dataset: str = "normalized", fmt: str = "parquet", root: Path = COLUMNAR_DIR) -> "pa.Table":
+    """
+    Loads every partition of a dataset (stat_id / scrape_date come back as
+    columns). Files written before the season column read it as null.
+    """
+    _require_pyarrow()
+    import pyarrow.dataset as ds
+    keys = pa.schema([("stat_id", pa.string()), ("scrape_date", pa.string())])
+    schema = pa.schema(list(arrow_schema(dataset)) + list(keys))
+    return ds.dataset(Path(root) / dataset, schema=schema, format="parquet" if fmt == "parquet" else "feather",
+                      partitioning=ds.partitioning(keys, flavor="hive")).to_table()
@@ -0,0 +1,149 @@
+# Single-pass, streaming <table> extraction.
+#
+# A small html.parser state machine that emits each body row as a dict keyed
+# by the header cells while the HTML is being tokenized: no soup tree, no
+# second walk over the rows, no DataFrame. Writers consume the row iterator
+# and write CSV / JSON incrementally. Works for the pgatour.com stat tables
+# and the pgaclubtracker.com equipment tables.
+import codecs, csv, json
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Union
+
+class _TableParser(HTMLParser):
+    """Collects rows of the `table_index`-th top-level table into `self.ready`."""
+
+    def __init__(self, table_index: int = 0):
+        super().__init__(convert_charrefs=True)
+        self.table_index = table_index
+        self.tables_seen = -1
+        self.depth = 0           # <table> nesting depth
+        self.active = False      # inside the table we want
+        self.headers: Optional[List[str]] = None
+        self.cells: Optional[List[str]] = None
+        self.row_has_td = False
+        self.cell: Optional[List[str]] = None
+        self.ready: List[Dict[str, str]] = []
+        self.done = False
+
+    def handle_starttag(self, tag: str, attrs):
+        if self.done:
+            return
+        if tag == "table":
+            self.depth += 1
+            if self.depth == 1:
+                self.tables_seen += 1
+                self.active = self.tables_seen == self.table_index
+            return
+        if not self.active or self.depth != 1:
+            return
+        if tag == "tr":
+            self._end_row()
+            self.cells, self.row_has_td = [], False
+        elif tag in ("td", "th"):
+            self._end_cell()
+            if self.cells is None:  # cell without <tr>
+                self.cells, self.row_has_td = [], False
+            self.cell = []
+            self.row_has_td |= tag == "td"
+        elif tag == "br" and self.cell is not None:
+            self.cell.append(" ")
+
+    def handle_endtag(self, tag: str):
+        if self.done:
+            return
+        if tag == "table":
+            if self.depth == 1 and self.active:
+                self._end_row()
+                self.done = True
+            self.depth = max(0, self.depth - 1)
+        elif self.active and self.depth == 1:
+            if tag in ("td", "th"):
+                self._end_cell()
+            elif tag == "tr":
+                self._end_row()
+
+    def handle_data(self, data: str):
+        if self.cell is not None and self.active and self.depth == 1:
+            self.cell.append(data)
+
+    def _end_cell(self):
+        if self.cell is not None:
+            self.cells.append(" ".join("".join(self.cell).split()))
+            self.cell = None
+
+    def _end_row(self):
+        self._end_cell()
+        cells, self.cells = self.cells, None
+        if not cells:
+            return
+        if self.headers is None and not self.row_has_td:
+            self.headers = [h or f"col{i}" for i, h in enumerate(cells)]
+            return
+        headers = self.headers or [f"col{i}" for i in range(len(cells))]
+        if len(cells) > len(headers):
+            headers = headers + [f"col{i}" for i in range(len(headers), len(cells))]
+        self.ready.append(dict(zip(headers, cells)))
+
+def iter_table_rows(html: Union[str, bytes, Iterable[Union[str, bytes]]], table_index: int = 0,
+                    encoding: str = "utf-8") -> Iterator[Dict[str, str]]:
+    """
+    Yields the body rows of a table as {header: cell text} dicts, in one pass.
+
+    Args:
+        html: The page as str/bytes, or an iterable of chunks (e.g. a streamed
+            HTTP body) which is tokenized as it arrives.
+        table_index (int): Which top-level <table> on the page (0 = first).
+        encoding (str): Used to decode bytes chunks.
+    """
+    parser = _TableParser(table_index)
+    # Incremental, so a multibyte character split across two chunks still decodes
+    decoder = codecs.getincrementaldecoder(encoding)("replace")
+    chunks = [html] if isinstance(html, (str, bytes)) else html
+    for chunk in chunks:
+        parser.feed(decoder.decode(chunk) if isinstance(chunk, bytes) else chunk)
+        if parser.ready:
+            yield from parser.ready
+            parser.ready.clear()
+        if parser.done:
+            break
+    else:
+        parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+        parser._end_row()
+        yield from parser.ready
+
+def write_csv(rows: Iterable[Dict[str, Any]], dest: Union[str, Path, TextIO]) -> int:
+    """Streams rows to CSV; the first row's keys become the header. Returns the row count."""
+    f = open(dest, "w", newline="", encoding="utf-8") if isinstance(dest, (str, Path)) else dest
+    n = 0
+    try:
+        writer = None
+        for r in rows:
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(r), extrasaction="ignore")
+                writer.writeheader()
+            writer.writerow(r)
+            n += 1
+    finally:
+        if f is not dest:
+            f.close()
+    return n
+
+def write_json(rows: Iterable[Dict[str, Any]], dest: Union[str, Path, TextIO], indent: Optional[int] = None) -> int:
+    """Streams rows out as one JSON array without building the list first."""
+    f = open(dest, "w", encoding="utf-8") if isinstance(dest, (str, Path)) else dest
+    n = 0
+    try:
+        f.write("[")
+        for r in rows:
+            blob = json.dumps(r, ensure_ascii=False, indent=indent)
+            if indent is not None:
+                blob = "\n" + "\n".join(" " * indent + line for line in blob.splitlines())
+            f.write(("," if n else "") + blob)
+            n += 1
+        f.write("\n]\n" if indent is not None and n else "]\n")
+    finally:
+        if f is not dest:
+            f.close()
+    return n
@@ -0,0 +1,160 @@
+# On-disk HTTP response cache for conditional GETs.
+#
+# Bodies are stored with their ETag / Last-Modified validators. The next GET
+# for the same URL sends If-None-Match / If-Modified-Since and, when the server
+# answers 304, the body is served from disk instead of being re-downloaded.
+#
+# Each URL is one self-contained file (a JSON metadata line, then the body),
+# replaced atomically, so any number of processes sharing the directory
+# (sweep / backfill / queue workers) see each other's entries and no request
+# rewrites a shared index. Recency is the file's mtime (a 304 touches it); the
+# cache is bounded by total size, and evicting least-recently-used files only
+# scans the directory after every max_bytes / EVICT_FRACTION bytes written.
+import hashlib, json, os, threading, uuid
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CACHE_DIR = Path("cache") / "http"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+EVICT_FRACTION = 16
+
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+class ResponseCache:
+    """
+    Size-bounded LRU store of response bodies keyed by full request URL.
+
+    Args:
+        root (Path): Directory holding one `<sha1 of url>.entry` file per URL.
+        max_bytes (int): Total size kept on disk before evicting.
+    """
+
+    def __init__(self, root: Path = CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._written = 0  # bytes stored since the last eviction scan
+        self._lock = threading.Lock()
+        self._drop_legacy()
+
+    # ----- persistence ---------------------------------------------------------
+    def _entry_path(self, url: str) -> Path:
+        return self.root / (hashlib.sha1(url.encode("utf-8")).hexdigest() + ".entry")
+
+    def _drop_legacy(self):
+        # Caches from before the per-URL files: a shared index.json plus bare bodies
+        index = self.root / "index.json"
+        if index.exists():
+            for p in self.root.glob("*.body"):
+                p.unlink(missing_ok=True)
+            index.unlink(missing_ok=True)
+
+    def _read_meta(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with self._entry_path(url).open("rb") as f:
+                meta = json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+        return meta if isinstance(meta, dict) and meta.get("url") == url else None  # sha1 clash: a miss
+
+    def _read(self, url: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        try:
+            with self._entry_path(url).open("rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if not isinstance(meta, dict) or meta.get("url") != url:
+            return None
+        return meta, body
+
+    def _write(self, url: str, meta: Dict[str, Any], body: bytes) -> int:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(url)
+        tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")  # unique per writer
+        data = json.dumps(meta).encode("utf-8") + b"\n" + body
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        return len(data)
+
+    @property
+    def size(self) -> int:
+        return sum(p.stat().st_size for p in self.root.glob("*.entry"))
+
+    def _evict(self):
+        entries = []
+        for p in self.root.glob("*.entry"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue  # evicted by another process meanwhile
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+
+    # ----- conditional GET -----------------------------------------------------
+    def validators(self, url: str) -> Dict[str, str]:
+        """Headers to send so the server can answer 304 for `url`."""
+        e = self._read_meta(url)
+        if not e:
+            return {}
+        headers = {}
+        if e["headers"].get("ETag"):
+            headers["If-None-Match"] = e["headers"]["ETag"]
+        if e["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = e["headers"]["Last-Modified"]
+        return headers
+
+    def store(self, url: str, r: requests.Response):
+        """Keeps a 200 response if it carries a validator."""
+        kept = {h: r.headers[h] for h in _KEPT_HEADERS if h in r.headers}
+        if r.status_code != 200 or not ("ETag" in kept or "Last-Modified" in kept):
+            return
+        written = self._write(url, {"url": url, "headers": kept, "encoding": r.encoding}, r.content)
+        with self._lock:
+            self._written += written
+            if self._written * EVICT_FRACTION < self.max_bytes:
+                return
+            self._written = 0
+        self._evict()
+
+    def replay(self, url: str, not_modified: requests.Response) -> Optional[requests.Response]:
+        """
+        Turns a 304 for `url` into a 200 built from the stored body.
+
+        Returns:
+            requests.Response: The cached response, or None if the body is gone.
+        """
+        entry = self._read(url)
+        if entry is None:
+            return None
+        e, body = entry
+        # A 304 may carry refreshed validators; otherwise only the recency changes
+        fresh = {h: not_modified.headers[h] for h in ("ETag", "Last-Modified")
+                 if h in not_modified.headers and not_modified.headers[h] != e["headers"].get(h)}
+        try:
+            if fresh:
+                e["headers"].update(fresh)
+                self._write(url, e, body)
+            else:
+                os.utime(self._entry_path(url))
+        except OSError:
+            pass  # evicted meanwhile; the body read above is still good
+
+        r = requests.Response()
+        r.status_code = 200
+        r.reason = "OK"
+        r._content = body
+        r.headers = CaseInsensitiveDict(e["headers"])
+        r.encoding = e.get("encoding")
+        r.url = not_modified.url or url
+        r.request = not_modified.request
+        r.elapsed = not_modified.elapsed
+        r.from_cache = True
+        return r
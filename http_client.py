@@ -0,0 +1,204 @@
+# Shared HTTP client for every pgatour.com scraper.
+#
+# One pooled requests.Session (keep-alive, compressed transfer) plus a GET that
+# retries 429/5xx and connection errors with jittered exponential backoff,
+# honouring Retry-After when the server sends it. Successful bodies with an
+# ETag/Last-Modified go into the on-disk conditional-GET cache (http_cache.py).
+# Every attempt on the wire (retries and buildId rediscovery included) first
+# takes a token from the installed per-host rate limiter, if any.
+# pip install requests  (and optionally: pip install brotli)
+import random, threading, time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+from http_cache import ResponseCache
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; PGAStatScraper/1.2)",
+    "Accept": "*/*",
+    "x-nextjs-data": "1",
+}
+DEFAULT_COOKIES = {
+    # Drop in consent cookies if needed
+    # "OptanonConsent": "...",
+    # "OTGPPConsent": "...",
+}
+
+try:  # urllib3 only decodes brotli when a brotli module is importable
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+DEFAULT_TIMEOUT = 30
+DEFAULT_RATE = 5.0  # requests per second per host
+POOL_SIZE = 32  # should be >= the sweep concurrency
+
+_session: Optional[requests.Session] = None
+_cache: Optional[ResponseCache] = None
+_session_lock = threading.Lock()
+
+# ===== Per-host rate limiting ==================================================
+class HostRateLimiter:
+    """
+    Token bucket per host, shared by every thread of a run.
+
+    Args:
+        rate (float): Requests per second allowed for each host (<= 0 disables).
+        burst (int): How many requests may go out back to back.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._buckets: Dict[str, List[float]] = {}  # host -> [tokens, last refill]
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str):
+        if self.rate <= 0:
+            return
+        host = urlparse(url).netloc
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                bucket = self._buckets.setdefault(host, [float(self.burst), now])
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+                if bucket[0] >= 1:
+                    bucket[0] -= 1
+                    return
+                wait = (1 - bucket[0]) / self.rate
+            time.sleep(wait)
+
+_limiter: Optional[HostRateLimiter] = None
+
+@contextmanager
+def rate_limited(limiter: Optional[HostRateLimiter]) -> Iterator[Optional[HostRateLimiter]]:
+    """
+    Installs `limiter` for every request this process sends until the block
+    exits (the previous limiter is restored). Worker threads share it.
+    """
+    global _limiter
+    previous, _limiter = _limiter, limiter
+    try:
+        yield limiter
+    finally:
+        _limiter = previous
+
+# ===== Session ================================================================
+
+def get_session() -> requests.Session:
+    """Returns the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                s.headers.update(DEFAULT_HEADERS)
+                s.headers["Accept-Encoding"] = ACCEPT_ENCODING
+                s.cookies.update(DEFAULT_COOKIES)
+                _session = s
+    return _session
+
+def get_response_cache() -> ResponseCache:
+    """Returns the process-wide conditional-GET cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        with _session_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
+
+def _retry_after(r: requests.Response) -> Optional[float]:
+    value = r.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def _get_with_retries(url: str, retries: int, backoff: float, max_backoff: float, **kwargs) -> requests.Response:
+    session = get_session()
+    for attempt in range(retries + 1):
+        limiter = _limiter
+        if limiter:
+            limiter.acquire(url)
+        try:
+            r = session.get(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+            metrics.count("http_retries", reason="connection")
+            time.sleep(backoff_delay(attempt, backoff, max_backoff))
+            continue
+        if r.status_code not in RETRY_STATUSES or attempt == retries:
+            return r
+        metrics.count("http_retries", reason=str(r.status_code))
+        delay = _retry_after(r)
+        time.sleep(min(max_backoff, delay) if delay is not None else backoff_delay(attempt, backoff, max_backoff))
+    return r
+
+def get(url: str, retries: int = 4, backoff: float = 0.5, max_backoff: float = 30.0,
+        use_cache: bool = True, **kwargs) -> requests.Response:
+    """
+    GET through the shared session, retrying transient failures.
+
+    Args:
+        url (str): URL to fetch.
+        retries (int): Extra attempts after the first one.
+        backoff (float): Base delay in seconds for the exponential backoff.
+        max_backoff (float): Upper bound for a single sleep (Retry-After included).
+        use_cache (bool): Revalidate against / fill the on-disk response cache.
+        **kwargs: Passed to `requests.Session.get` (headers, params, cookies, ...).
+
+    Returns:
+        requests.Response: The last response. 429/5xx are only returned once
+        retries are exhausted; callers still call `raise_for_status()`.
+        A 304 is returned as the cached 200 with `from_cache = True`.
+    """
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    if not use_cache:
+        return _get_with_retries(url, retries, backoff, max_backoff, **kwargs)
+
+    cache = get_response_cache()
+    key = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+    conditional = cache.validators(key)
+    if conditional:
+        headers = dict(kwargs.get("headers") or {})
+        kwargs["headers"] = {**conditional, **headers}
+    r = _get_with_retries(url, retries, backoff, max_backoff, **kwargs)
+    if r.status_code == 304 and conditional:
+        cached = cache.replay(key, r)
+        if cached is not None:
+            metrics.cache_result("http", True)
+            return cached
+        # Body was evicted between the two steps: fetch it unconditionally.
+        kwargs["headers"] = headers
+        r = _get_with_retries(url, retries, backoff, max_backoff, **kwargs)
+    if r.status_code == 200:
+        metrics.cache_result("http", False)
+        cache.store(key, r)
+    return r
@@ -0,0 +1,56 @@
+# Incremental JSON reading for large _next/data payloads.
+#
+# A lazy wrapper over ijson's prefixed event stream, plus a builder that
+# materializes one sub-object (e.g. one table row) at a time, so a stat table
+# can be read row by row straight off the HTTP response as it downloads.
+# pip install ijson
+import importlib.util
+from typing import Any, BinaryIO, Iterator, Tuple
+
+Event = Tuple[str, str, Any]  # (prefix, event, value), as from ijson.parse
+SCALAR_EVENTS = {"null", "boolean", "integer", "double", "number", "string"}
+
+def available() -> bool:
+    # ijson is optional and only imported once a stream is actually read
+    return importlib.util.find_spec("ijson") is not None
+
+def _ijson():
+    try:
+        import ijson
+    except ImportError:  # streaming mode is optional
+        raise RuntimeError("Streaming mode needs ijson: pip install ijson") from None
+    return ijson
+
+def parse(fp: BinaryIO) -> Iterator[Event]:
+    """
+    (prefix, event, value) for the JSON read incrementally from `fp`.
+
+    Prefixes are dotted keys with "item" for array elements, e.g.
+    "pageProps.dehydratedState.queries.item.state.data.rows.item".
+    """
+    return _ijson().parse(fp, use_float=True)
+
+def build(first: Event, events: Iterator[Event]) -> Any:
+    """Materializes the value that `first` opens, consuming its events from `events`."""
+    _, event, value = first
+    if event not in ("start_map", "start_array"):
+        return value
+    builder = _ijson().ObjectBuilder()
+    builder.event(event, value)
+    depth = 1
+    for _, event, value in events:
+        builder.event(event, value)
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+            if depth == 0:
+                return builder.value
+    raise ValueError("JSON ended inside a value")
+
+def iter_array(prefix: str, events: Iterator[Event]) -> Iterator[Any]:
+    """Builds each element of the array at `prefix` whose start_array was just consumed."""
+    for p, event, value in events:
+        if p == prefix and event == "end_array":
+            return
+        yield build((p, event, value), events)
@@ -0,0 +1,306 @@
+# Live-tournament poller: one long-running process instead of cron re-runs.
+#
+# The session, buildId and each stat's parsed table stay in memory between
+# polls. A poll whose body is unchanged (304 from the conditional-GET cache, or
+# the same content hash) stops there: no JSON decode, no normalize. Otherwise
+# the table is diffed against the last one and the changed rows are pushed to
+# the sink. Every stat has its own interval: it halves when the stat changed
+# and grows by half when it didn't, between --min-interval and --max-interval,
+# so stats that move during play are polled often and the rest (and every
+# stat between rounds) drift to the slow end. Outside --active-hours every
+# stat waits the idle interval, but never past the start of the next window.
+#
+#   python live.py 101 102 120 --active-hours 7-20 --tz America/New_York
+#   python live.py --category "Scoring" --min-interval 30 --warehouse --jsonl
+#
+# pip install requests
+import argparse, hashlib, heapq, json, random, signal, threading, time
+import datetime as dt
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import metrics
+from http_client import DEFAULT_RATE, HostRateLimiter, rate_limited
+from snapshots import DELTA_DIR, SNAPSHOT_DIR, SnapshotStore, diff_rows, write_delta
+from stat_detail import fetch_stat_detail_response, locate_rows_columns, normalize_rows, payload_season
+from sweep import select_stat_ids
+
+MIN_INTERVAL = 60.0  # seconds
+MAX_INTERVAL = 15 * 60.0
+IDLE_INTERVAL = 60 * 60.0  # outside the active hours
+SPEEDUP = 0.5  # interval multiplier after a poll that found changes
+BACKOFF = 1.5  # ... after one that didn't (or failed)
+JITTER = 0.1  # +-10% so stats don't fall into lockstep
+LIVE_SNAPSHOT_DIR = SNAPSHOT_DIR / "live"  # normalized rows; sweep/2.py snapshots hold raw rows
+
+OnChange = Callable[[str, List[Dict[str, Any]], List[Dict[str, Any]]], None]
+
+@dataclass
+class StatState:
+    """What the poller remembers about one stat between polls."""
+    stat_id: str
+    interval: float
+    next_due: float = 0.0  # epoch seconds
+    body_hash: Optional[str] = None
+    snapshot: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    polls: int = 0
+    changes: int = 0
+    errors: int = 0
+    last_change: Optional[float] = None
+    last_error: Optional[str] = None
+    season: Optional[int] = None  # as reported by the last payload
+
+def parse_hours(spec: str) -> Tuple[int, int]:
+    """"7-20" → (7, 20): active from 07:00 up to 20:00 (wrapping past midnight if start > end)."""
+    start, end = (int(h) for h in spec.split("-", 1))
+    if not (0 <= start < 24 and 0 < end <= 24) or start == end:
+        raise ValueError(f"bad hour range {spec!r}")
+    return start, end
+
+class ActiveHours:
+    """
+    Daily polling window in a given time zone (the course's, usually).
+
+    Args:
+        start (int): First active hour.
+        end (int): Hour the window closes.
+        tz (str): IANA zone name; None uses the machine's local time.
+    """
+
+    def __init__(self, start: int, end: int, tz: Optional[str] = None):
+        self.start, self.end = start, end
+        if tz:
+            from zoneinfo import ZoneInfo
+            self.tz = ZoneInfo(tz)
+        else:
+            self.tz = None
+
+    def _active(self, hour: int) -> bool:
+        if self.start < self.end:
+            return self.start <= hour < self.end
+        return hour >= self.start or hour < self.end
+
+    def seconds_until_active(self, now: float) -> float:
+        """0 inside the window, else seconds until it next opens."""
+        local = dt.datetime.fromtimestamp(now, self.tz).astimezone(self.tz)
+        if self._active(local.hour):
+            return 0.0
+        opens = local.replace(hour=self.start, minute=0, second=0, microsecond=0)
+        if opens <= local:
+            opens += dt.timedelta(days=1)
+        return (opens - local).total_seconds()
+
+class LivePoller:
+    """
+    Polls stats on adaptive per-stat intervals and pushes row changes.
+
+    Args:
+        stat_ids (list): Stats to watch.
+        on_change: Called as on_change(stat_id, events, normalized_rows) with
+            the snapshots.diff_rows() events, from the thread that called run().
+        season (int): Season to poll (None = current).
+        tournament_id (str): Tournament to poll (None = season to date).
+        min_interval / max_interval (float): Bounds of the adaptive interval.
+        idle_interval (float): Wait between polls outside `active_hours`.
+        active_hours (ActiveHours): Daily window of live play (None = always).
+        concurrency (int): Polls in flight.
+        rate (float): Requests per second to the host.
+        store (SnapshotStore): Persists each table on change, so a restart
+            only pushes what changed while it was down (None = memory only).
+    """
+
+    def __init__(self, stat_ids: List[str], on_change: OnChange, season: Optional[int] = None,
+                 tournament_id: Optional[str] = None, min_interval: float = MIN_INTERVAL,
+                 max_interval: float = MAX_INTERVAL, idle_interval: float = IDLE_INTERVAL,
+                 active_hours: Optional[ActiveHours] = None, concurrency: int = 4, rate: float = DEFAULT_RATE,
+                 store: Optional[SnapshotStore] = None):
+        self.on_change = on_change
+        self.season, self.tournament_id = season, tournament_id
+        self.min_interval, self.max_interval, self.idle_interval = min_interval, max(min_interval, max_interval), idle_interval
+        self.active_hours = active_hours
+        self.concurrency = max(1, concurrency)
+        self.limiter = HostRateLimiter(rate, burst=self.concurrency)
+        self.store = store
+        self.outcomes: Dict[str, int] = {}
+        self._stop = threading.Event()
+        now = time.time()
+        self.states: Dict[str, StatState] = {}
+        for sid in stat_ids:
+            # First polls are spread over one min interval instead of all at once
+            st = StatState(sid, min_interval, now + random.uniform(0, min_interval) if len(stat_ids) > 1 else now)
+            if store:
+                st.snapshot = store.load(sid)
+            self.states[sid] = st
+
+    def stop(self):
+        self._stop.set()
+
+    # ===== One poll (worker thread) ==========================================
+    def _poll(self, st: StatState) -> Tuple[str, List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """(outcome, events, normalized rows); never raises. Only one poll per stat is in flight."""
+        try:
+            r = fetch_stat_detail_response(st.stat_id, self.season, self.tournament_id)
+            digest = hashlib.blake2b(r.content, digest_size=16).hexdigest()
+            if digest == st.body_hash:
+                return ("not_modified" if getattr(r, "from_cache", False) else "unchanged"), [], []
+            rows, cols, query = locate_rows_columns(r.json().get("pageProps", {}) or {}, st.stat_id)
+            if not rows:
+                raise LookupError("no stat table in the payload")
+            normalized = normalize_rows(rows, cols)
+            st.season = payload_season(query) or self.season
+            events, st.snapshot = diff_rows(st.stat_id, st.snapshot, normalized)
+            st.body_hash = digest
+            return ("changed" if events else "unchanged"), events, normalized
+        except Exception as e:
+            st.last_error = f"{type(e).__name__}: {e}"
+            return "error", [], []
+
+    # ===== Scheduling (run() thread) =========================================
+    def next_delay(self, st: StatState, changed: bool, now: float) -> float:
+        """Adapts st.interval to the outcome and returns the seconds until the next poll."""
+        st.interval *= SPEEDUP if changed else BACKOFF
+        st.interval = min(self.max_interval, max(self.min_interval, st.interval))
+        delay = st.interval * random.uniform(1 - JITTER, 1 + JITTER)
+        if self.active_hours:
+            closed_for = self.active_hours.seconds_until_active(now + delay)
+            if closed_for:  # sleep through the night, but be back when play resumes
+                delay = max(delay, min(self.idle_interval, delay + closed_for))
+        return delay
+
+    def _finish(self, st: StatState, outcome: str, events: List[Dict[str, Any]], normalized: List[Dict[str, Any]]):
+        now = time.time()
+        st.polls += 1
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        metrics.count("live_polls", outcome=outcome)
+        if outcome == "error":
+            st.errors += 1
+            print(f"stat {st.stat_id}: poll failed ({st.last_error})")
+        elif events:
+            st.changes += 1
+            st.last_change = now
+            try:
+                self.on_change(st.stat_id, events, normalized)
+            except Exception as e:
+                print(f"stat {st.stat_id}: sink failed ({type(e).__name__}: {e})")
+            if self.store:
+                self.store.save(st.stat_id, st.snapshot)
+        st.next_due = now + self.next_delay(st, bool(events), now)
+
+    def run(self, duration: Optional[float] = None, status_every: Optional[float] = None):
+        """
+        Polls until stop() (or `duration` seconds), then waits for in-flight polls.
+
+        Args:
+            duration (float): Stop after this many seconds (None = until stopped).
+            status_every (float): Print a one-line summary this often (None = never).
+        """
+        deadline = time.time() + duration if duration else None
+        next_status = time.time() + status_every if status_every else None
+        heap = [(st.next_due, sid) for sid, st in self.states.items()]
+        heapq.heapify(heap)
+        pending: Dict[Future, str] = {}
+        with rate_limited(self.limiter), ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while not self._stop.is_set():
+                now = time.time()
+                if deadline and now >= deadline:
+                    break
+                while heap and heap[0][0] <= now and len(pending) < self.concurrency:
+                    _, sid = heapq.heappop(heap)
+                    pending[pool.submit(self._poll, self.states[sid])] = sid
+                if next_status and now >= next_status:
+                    print(self.status_line())
+                    next_status = now + status_every
+                # Sleep until the next stat is due or a poll finishes (at most 1s, to notice stop())
+                timeout = 1.0
+                if heap and len(pending) < self.concurrency:
+                    timeout = min(timeout, max(0.0, heap[0][0] - now))
+                if deadline:
+                    timeout = min(timeout, max(0.0, deadline - now))
+                if pending:
+                    done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                else:
+                    done = set()
+                    self._stop.wait(timeout)
+                for fut in done:
+                    sid = pending.pop(fut)
+                    self._finish(self.states[sid], *fut.result())
+                    heapq.heappush(heap, (self.states[sid].next_due, sid))
+            for fut in wait(pending).done:
+                self._finish(self.states[pending[fut]], *fut.result())
+
+    # ===== Reporting =========================================================
+    def status_line(self) -> str:
+        polls = sum(self.outcomes.values())
+        fast = sorted(self.states.values(), key=lambda s: s.interval)[:3]
+        return (f"// {polls} polls {self.outcomes}; fastest: "
+                + ", ".join(f"{s.stat_id} every {s.interval:.0f}s" for s in fast))
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-stat polls, changes, errors and current interval, most active first."""
+        out = [{"stat_id": s.stat_id, "polls": s.polls, "changes": s.changes, "errors": s.errors,
+                "interval_s": round(s.interval, 1), "last_change": s.last_change} for s in self.states.values()]
+        return sorted(out, key=lambda r: (-r["changes"], r["interval_s"]))
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Poll live stats on adaptive intervals and push the changed rows.")
+    ap.add_argument("stat_ids", nargs="*", help='stat IDs, comma lists or ranges like "100-200"')
+    ap.add_argument("--category", help="every stat in this catalog category")
+    ap.add_argument("--no-catalog", action="store_true", help="poll the given IDs even if the catalog doesn't list them")
+    ap.add_argument("--season", type=int)
+    ap.add_argument("--tournament", help="tournament ID (default: season to date)")
+    ap.add_argument("--min-interval", type=float, default=MIN_INTERVAL, help="seconds between polls of a busy stat")
+    ap.add_argument("--max-interval", type=float, default=MAX_INTERVAL, help="seconds between polls of a quiet stat")
+    ap.add_argument("--idle-interval", type=float, default=IDLE_INTERVAL, help="seconds between polls outside --active-hours")
+    ap.add_argument("--active-hours", help='hours of play, e.g. "7-20" (default: always)')
+    ap.add_argument("--tz", help="time zone of --active-hours, e.g. America/New_York (default: local)")
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--rate", type=float, default=DEFAULT_RATE, help="requests/sec per host (0 = unlimited)")
+    ap.add_argument("--deltas", type=Path, default=DELTA_DIR, help="where change files go")
+    ap.add_argument("--jsonl", action="store_true", help="also print every change event as a JSON line")
+    ap.add_argument("--warehouse", type=Path, nargs="?", const=Path("out") / "warehouse.sqlite",
+                    help="also load each changed table into this SQLite warehouse")
+    ap.add_argument("--no-persist", action="store_true", help="keep table state in memory only")
+    ap.add_argument("--duration", type=float, help="stop after this many seconds")
+    ap.add_argument("--status-every", type=float, default=300.0, help="seconds between summary lines (0 = off)")
+    args = ap.parse_args(argv)
+
+    if not args.stat_ids and not args.category:
+        ap.error("give stat IDs and/or --category")
+    hours = ActiveHours(*parse_hours(args.active_hours), tz=args.tz) if args.active_hours else None
+    stat_ids = select_stat_ids(args.stat_ids, args.category, not args.no_catalog)
+
+    wh = None
+    if args.warehouse:
+        from warehouse import Warehouse
+        wh = Warehouse(args.warehouse)
+
+    def on_change(stat_id: str, events: List[Dict[str, Any]], normalized: List[Dict[str, Any]]):
+        counts = {op: sum(1 for e in events if e["op"] == op) for op in ("insert", "update", "remove")}
+        print(f"stat {stat_id}: {counts} -> {write_delta(stat_id, events, args.deltas)}")
+        if args.jsonl:
+            for e in events:
+                print(json.dumps(e, ensure_ascii=False))
+        if wh:
+            wh.load_normalized(stat_id, normalized, season=poller.states[stat_id].season, tournament_id=args.tournament)
+
+    poller = LivePoller(stat_ids, on_change, args.season, args.tournament, args.min_interval, args.max_interval,
+                        args.idle_interval, hours, args.concurrency, args.rate,
+                        None if args.no_persist else SnapshotStore(LIVE_SNAPSHOT_DIR))
+    signal.signal(signal.SIGTERM, lambda *_: poller.stop())
+    print(f"Watching {len(stat_ids)} stats (every {args.min_interval:g}-{args.max_interval:g}s)")
+    try:
+        poller.run(args.duration, args.status_every or None)
+    except KeyboardInterrupt:
+        poller.stop()
+    finally:
+        if wh:
+            wh.close()
+    print(f"\n{poller.status_line()}")
+    for r in poller.summary()[:20]:
+        print(f"  stat {r['stat_id']:>6}: {r['changes']}/{r['polls']} polls changed, {r['errors']} errors, "
+              f"now every {r['interval_s']:g}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# Per-stage timings and counters for the scrapers.
+#
+# Off by default: timer() then hands back one shared no-op context manager and
+# count() returns immediately, so instrumented code pays a function call and a
+# flag check. Turn it on from the environment
+#   PGA_METRICS_JSONL=out/metrics.jsonl   one JSON line per event
+#   PGA_METRICS_PROM=out/metrics.prom     Prometheus text file, written at exit
+# or from code with enable(). Stage events carry seconds plus optional byte
+# and row counts; counters cover cache hits/misses and HTTP retries.
+import atexit, json, os, threading, time
+from pathlib import Path
+from typing import Any, Dict, Optional, TextIO, Tuple
+
+Labels = Tuple[Tuple[str, str], ...]
+
+ENABLED = False
+_lock = threading.Lock()
+_jsonl: Optional[TextIO] = None
+_prom_path: Optional[Path] = None
+_counters: Dict[Tuple[str, Labels], float] = {}
+
+_HELP = {
+    "pga_stage_seconds_total": "Wall time spent per stage",
+    "pga_stage_calls_total": "Completed stage runs",
+    "pga_stage_errors_total": "Stage runs that raised",
+    "pga_stage_bytes_total": "Bytes read or written per stage",
+    "pga_stage_rows_total": "Rows produced per stage",
+    "pga_cache_requests_total": "Cache lookups by cache and result (hit/miss)",
+    "pga_http_retries_total": "HTTP attempts retried, by reason",
+    "pga_build_id_refreshes_total": "buildIds replaced after a _next/data 404 (new deployment)",
+}
+
+# ===== Recording =============================================================
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+def _add(name: str, value: float, labels: Labels):
+    key = (name, labels)
+    _counters[key] = _counters.get(key, 0.0) + value
+
+def _emit(event: Dict[str, Any]):
+    if _jsonl is not None:
+        _jsonl.write(json.dumps(event, ensure_ascii=False, default=str) + "\n")
+
+class _Timer:
+    """Times one stage run; add(bytes=..., rows=...) attaches sizes to it."""
+
+    __slots__ = ("stage", "labels", "fields", "t0")
+
+    def __init__(self, stage: str, labels: Dict[str, Any]):
+        self.stage, self.labels, self.fields = stage, labels, {}
+
+    def add(self, **fields: Any):
+        self.fields.update(fields)
+
+    def __enter__(self) -> "_Timer":
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.t0
+        stage = (("stage", self.stage),)
+        with _lock:
+            _add("pga_stage_seconds_total", seconds, stage)
+            _add("pga_stage_calls_total", 1, stage)
+            if exc_type is not None:
+                _add("pga_stage_errors_total", 1, stage)
+            for field in ("bytes", "rows"):
+                if self.fields.get(field) is not None:
+                    _add(f"pga_stage_{field}_total", self.fields[field], stage)
+            _emit({"ts": time.time(), "type": "stage", "stage": self.stage, "seconds": round(seconds, 6),
+                   "error": exc_type.__name__ if exc_type else None, **self.labels, **self.fields})
+        return False
+
+class _NullTimer:
+    __slots__ = ()
+
+    def add(self, **fields: Any):
+        pass
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+def timer(stage: str, **labels: Any):
+    """
+    Context manager timing one run of `stage`.
+
+    Args:
+        stage (str): Stage name, e.g. "download" or "normalize".
+        **labels: Extra context for the JSON-lines event (stat_id, ...);
+            not used as Prometheus labels, to keep cardinality bounded.
+    """
+    return _Timer(stage, labels) if ENABLED else _NULL_TIMER
+
+def count(name: str, n: float = 1, **labels: Any):
+    """Adds `n` to the counter pga_<name>_total{labels}."""
+    if not ENABLED:
+        return
+    with _lock:
+        _add(f"pga_{name}_total", n, _labels(labels))
+        _emit({"ts": time.time(), "type": "count", "name": name, "n": n, **labels})
+
+def cache_result(cache: str, hit: bool):
+    count("cache_requests", cache=cache, result="hit" if hit else "miss")
+
+# ===== Export ================================================================
+def snapshot() -> Dict[str, float]:
+    """Current counter values keyed like Prometheus series: 'name{k="v"}'."""
+    with _lock:
+        return {_series(name, labels): v for (name, labels), v in sorted(_counters.items())}
+
+def hit_rates() -> Dict[str, float]:
+    """Hit rate per cache from the pga_cache_requests_total counters."""
+    totals: Dict[str, Dict[str, float]] = {}
+    with _lock:
+        for (name, labels), v in _counters.items():
+            if name == "pga_cache_requests_total":
+                d = dict(labels)
+                totals.setdefault(d.get("cache", ""), {}).setdefault(d.get("result", ""), 0.0)
+                totals[d.get("cache", "")][d.get("result", "")] += v
+    return {c: r.get("hit", 0.0) / (sum(r.values()) or 1.0) for c, r in totals.items()}
+
+def _series(name: str, labels: Labels) -> str:
+    if not labels:
+        return name
+    body = ",".join(f'{k}="{v}"'.replace("\n", " ") for k, v in labels)
+    return f"{name}{{{body}}}"
+
+def prometheus_text() -> str:
+    lines, seen = [], set()
+    with _lock:
+        items = sorted(_counters.items())
+    for (name, labels), v in items:
+        if name not in seen:
+            seen.add(name)
+            if name in _HELP:
+                lines.append(f"# HELP {name} {_HELP[name]}")
+            lines.append(f"# TYPE {name} counter")
+        lines.append(f"{_series(name, labels)} {v:.6g}")
+    return "\n".join(lines) + "\n"
+
+def write_prometheus(path: Path):
+    """Atomically (re)writes a node_exporter textfile-collector file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(prometheus_text())
+    tmp.replace(path)
+
+def _flush_at_exit():
+    if _jsonl is not None:
+        _jsonl.flush()
+    if _prom_path is not None:
+        write_prometheus(_prom_path)
+
+def enable(jsonl: Optional[Path] = None, prom: Optional[Path] = None):
+    """
+    Turns collection on.
+
+    Args:
+        jsonl (Path): Append one JSON line per event to this file.
+        prom (Path): Write the counters here in Prometheus text format at exit.
+    """
+    global ENABLED, _jsonl, _prom_path
+    with _lock:
+        if jsonl and _jsonl is None:
+            Path(jsonl).parent.mkdir(parents=True, exist_ok=True)
+            _jsonl = open(jsonl, "a", encoding="utf-8", buffering=1)
+        if prom:
+            _prom_path = Path(prom)
+        if not ENABLED:
+            atexit.register(_flush_at_exit)
+        ENABLED = True
+
+if os.environ.get("PGA_METRICS_JSONL") or os.environ.get("PGA_METRICS_PROM"):
+    enable(os.environ.get("PGA_METRICS_JSONL") or None, os.environ.get("PGA_METRICS_PROM") or None)
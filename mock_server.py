@@ -0,0 +1,371 @@
+# Local stand-in for www.pgatour.com, for load-testing the scrapers offline.
+#
+# Serves the same URLs the scrapers hit, built from the payloads in fixtures/:
+#   /stats                                         stat catalog HTML with a __NEXT_DATA__ buildId
+#   /_next/data/<buildId>/en/stats/detail/<id>.json
+#   /stats/detail/<id>                             HTML stat page (pga.py)
+#   /__mock/stats                                  request counters (JSON)
+# with configurable latency, injected 429/5xx, ETag/304 revalidation,
+# buildId rotation (a stale buildId gets a 404, like a real deployment) and
+# tables that change every few seconds, like a stat during live play.
+# Point the scrapers at it with PGA_BASE_URL:
+#
+#   python mock_server.py serve --port 8765 --latency 20 --rate-429 0.02 --rotate-every 300
+#   PGA_BASE_URL=http://127.0.0.1:8765 python sweep.py 100-400 --no-catalog --rate 0 --concurrency 64
+#
+# or let it start a server and drive the fetchers itself:
+#
+#   python mock_server.py load --requests 20000 --concurrency 64 --workers 4
+import argparse, hashlib, json, os, random, re, socket, statistics, tempfile, threading, time, urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Process
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+TEMPLATE_STAT = "101"  # fixture used for stat IDs without their own
+
+_DATA_RE = re.compile(r"^/_next/data/([^/]+)/en/stats/detail/([^/]+)\.json$")
+_PAGE_RE = re.compile(r"^/stats/detail/([^/]+)/?$")
+_BUILD_ID_RE = re.compile(rb'"buildId"\s*:\s*"[^"]*"')
+
+class MockPGATour:
+    """
+    Payloads, fault injection and counters shared by all handler threads.
+
+    Args:
+        latency (float): Base response delay in seconds.
+        jitter (float): Extra uniform random delay in seconds.
+        rate_429 (float): Fraction of requests answered 429 (with Retry-After).
+        rate_5xx (float): Fraction of requests answered 500/502/503.
+        retry_after (float): Retry-After seconds sent with 429s.
+        rotate_every (float): Seconds between buildId changes (0 = never).
+            Derived from the wall clock so several server processes agree.
+        rows (int): Grow every table to this many rows (0 = fixture size).
+        change_every (float): Seconds between changes to one row of each live
+            stat's _next/data table (0 = static). Wall-clock based, like rotate_every.
+        live_stats (set): Stat IDs that change (empty = all of them).
+        fixtures (Path): Directory with stat_<id>_next_data.json / stat_<id>.html.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, rate_429: float = 0.0, rate_5xx: float = 0.0,
+                 retry_after: float = 1.0, rotate_every: float = 0.0, rows: int = 0, change_every: float = 0.0,
+                 live_stats: Optional[Set[str]] = None, fixtures: Path = FIXTURES_DIR):
+        self.latency, self.jitter = latency, jitter
+        self.rate_429, self.rate_5xx, self.retry_after = rate_429, rate_5xx, retry_after
+        self.rotate_every, self.rows, self.fixtures = rotate_every, rows, Path(fixtures)
+        self.change_every, self.live_stats = change_every, set(live_stats or ())
+        self._lock = threading.Lock()
+        self._bodies: Dict[Tuple[str, str], Tuple[bytes, str]] = {}
+        self.counters: Dict[str, int] = {}
+        self.started = time.time()
+
+    # ===== Payloads ==========================================================
+    def build_id(self) -> str:
+        if not self.rotate_every:
+            return "mock-build-0"
+        return f"mock-build-{int(time.time() // self.rotate_every)}"
+
+    def _fixture(self, stat_id: str, kind: str) -> Optional[bytes]:
+        if stat_id == "landing":
+            name = "stats_landing.html"
+        else:
+            name = f"stat_{stat_id}_next_data.json" if kind == "next_data" else f"stat_{stat_id}.html"
+        path = self.fixtures / name
+        return path.read_bytes() if path.exists() else None
+
+    def tick(self, stat_id: str) -> int:
+        """How many times a live stat's table has changed so far (0 for static stats)."""
+        if not self.change_every or (self.live_stats and stat_id not in self.live_stats):
+            return 0
+        return int(time.time() // self.change_every)
+
+    def _next_data(self, stat_id: str, tick: int = 0) -> bytes:
+        raw = self._fixture(stat_id, "next_data")
+        if raw is None:
+            blob = json.loads(self._fixture(TEMPLATE_STAT, "next_data"))
+            _retarget(blob["pageProps"], stat_id)
+            raw = json.dumps(blob, separators=(",", ":")).encode("utf-8")
+        if self.rows:
+            from bench import enlarge
+            raw = enlarge("next_data", raw, self.rows)
+        if tick:
+            blob = json.loads(raw)
+            _advance(blob["pageProps"], tick)
+            raw = json.dumps(blob, separators=(",", ":")).encode("utf-8")
+        return raw
+
+    def _page(self, stat_id: str, build_id: str) -> bytes:
+        raw = self._fixture(stat_id, "html") or self._fixture("120", "html") or b""
+        if self.rows and raw:
+            from bench import enlarge
+            raw = enlarge("html", raw, self.rows)
+        return _BUILD_ID_RE.sub(f'"buildId":"{build_id}"'.encode(), raw)
+
+    def body(self, kind: str, stat_id: str) -> Tuple[bytes, str]:
+        """(body, etag), built once per (kind, stat, buildId) and then served from memory."""
+        build_id = self.build_id()
+        tick = self.tick(stat_id) if kind == "next_data" else 0
+        key = (kind, f"{stat_id}|{build_id}" if kind != "next_data" else f"{stat_id}|{tick}")
+        cached = self._bodies.get(key)
+        if cached is None:
+            raw = self._next_data(stat_id, tick) if kind == "next_data" else self._page(stat_id, build_id)
+            cached = self._bodies[key] = (raw, '"%s"' % hashlib.blake2b(raw, digest_size=12).hexdigest())
+            if tick:
+                self._bodies.pop((kind, f"{stat_id}|{tick - 1}"), None)
+        return cached
+
+    # ===== Faults / counters =================================================
+    def fault(self) -> Optional[int]:
+        x = random.random()
+        if x < self.rate_429:
+            return 429
+        if x < self.rate_429 + self.rate_5xx:
+            return random.choice((500, 502, 503))
+        return None
+
+    def delay(self):
+        d = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if d > 0:
+            time.sleep(d)
+
+    def count(self, key: str):
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self.counters)
+        total = sum(v for k, v in counters.items() if k.startswith("status_"))
+        elapsed = time.time() - self.started
+        return {"pid": os.getpid(), "build_id": self.build_id(), "requests": total, "uptime_s": round(elapsed, 3),
+                "rps": round(total / elapsed, 1) if elapsed else None, **counters}
+
+def _retarget(page_props: Dict[str, Any], stat_id: str):
+    """Rewrites the template fixture's statId everywhere it identifies the stat."""
+    page_props["statId"] = stat_id
+    for q in (page_props.get("dehydratedState") or {}).get("queries") or []:
+        key = q.get("queryKey")
+        if isinstance(key, list) and len(key) > 1 and isinstance(key[1], dict) and "statId" in key[1]:
+            key[1] = {**key[1], "statId": stat_id}
+            q["queryHash"] = json.dumps(key, separators=(",", ":"))
+        data = (q.get("state") or {}).get("data")
+        if isinstance(data, dict) and "statId" in data:
+            data["statId"] = stat_id
+
+def _advance(page_props: Dict[str, Any], tick: int):
+    """Moves one row of every table to a new rank, as a live leaderboard would."""
+    from stat_detail import RANK_FIELDS, _find_table_path
+    for q in (page_props.get("dehydratedState") or {}).get("queries") or []:
+        data = (q.get("state") or {}).get("data")
+        path = _find_table_path(data) if data else None
+        if not path:
+            continue
+        holder = data
+        for k in path:
+            holder = holder[k]
+        row = holder[tick % len(holder)]
+        for k in RANK_FIELDS:
+            if k in row:
+                row[k] = f"T{tick % 50 + 1}"
+
+def make_handler(mock: MockPGATour):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real CDN
+        server_version = "MockPGATour/1.0"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, body: bytes = b"", content_type: str = "application/json",
+                  headers: Optional[Dict[str, str]] = None):
+            mock.count(f"status_{status}")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_cached(self, kind: str, stat_id: str, content_type: str):
+            body, etag = mock.body(kind, stat_id)
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, headers={"ETag": etag})
+            else:
+                self._send(200, body, content_type, {"ETag": etag, "Cache-Control": "private, no-cache"})
+
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/__mock/stats":
+                return self._send(200, json.dumps(mock.stats()).encode())
+            mock.delay()
+            status = mock.fault()
+            if status:
+                headers = {"Retry-After": f"{mock.retry_after:g}"} if status == 429 else {}
+                return self._send(status, b'{"error":"injected"}', headers=headers)
+
+            m = _DATA_RE.match(path)
+            if m:
+                mock.count("next_data")
+                if m.group(1) != mock.build_id():
+                    mock.count("stale_build_id")
+                    return self._send(404, b'{"notFound":true}')
+                return self._send_cached("next_data", m.group(2), "application/json")
+            m = _PAGE_RE.match(path)
+            if m:
+                mock.count("stat_page")
+                return self._send_cached("html", m.group(1), "text/html; charset=utf-8")
+            if path.rstrip("/") == "/stats":
+                mock.count("landing")
+                return self._send_cached("html", "landing", "text/html; charset=utf-8")
+            self._send(404, b'{"notFound":true}')
+
+    return Handler
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def server_bind(self):
+        if hasattr(socket, "SO_REUSEPORT"):  # several processes can share the port
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+def serve(host: str = "127.0.0.1", port: int = 8765, **options: Any):
+    """Runs one server process until interrupted (options: see MockPGATour)."""
+    mock = MockPGATour(**options)
+    server = _Server((host, port), make_handler(mock))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def start_servers(workers: int, host: str, port: int, **options: Any) -> List[Process]:
+    """Starts `workers` server processes on one port and waits until it accepts connections."""
+    procs = [Process(target=serve, args=(host, port), kwargs=options, daemon=True) for _ in range(max(1, workers))]
+    for p in procs:
+        p.start()
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=0.2).close()
+            return procs
+        except OSError:
+            time.sleep(0.05)
+    for p in procs:
+        p.terminate()
+    raise RuntimeError(f"mock server did not come up on {host}:{port}")
+
+# ===== Load driver ===========================================================
+def run_load(base_url: str, stat_ids: List[str], total: int, concurrency: int, mode: str = "next_data") -> Dict[str, Any]:
+    """
+    Fires `total` scrapes at `base_url` from `concurrency` threads.
+
+    "next_data" runs the 2.py pipeline (fetch_stat_detail_json → locate →
+    normalize), "html" the pga.py one (stat page → __NEXT_DATA__ → player
+    rows). Runs in a temp working dir so the buildId, table-path and HTTP
+    caches of the real site are not touched. Must run before stat_detail is
+    imported, since its URLs are fixed at import time from PGA_BASE_URL.
+    """
+    os.environ["PGA_BASE_URL"] = base_url
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="pga-load-") as tmp:
+        os.chdir(tmp)
+        try:
+            import http_client
+            http_client.POOL_SIZE = max(http_client.POOL_SIZE, concurrency)
+            import stat_detail
+            if stat_detail.BASE != base_url:
+                raise RuntimeError("stat_detail was imported before PGA_BASE_URL was set")
+            from next_data import load_next_data
+            if mode == "html":
+                from pga import player_rows
+
+            def one(i: int) -> Tuple[float, Optional[str], int]:
+                stat_id = stat_ids[i % len(stat_ids)]
+                t0 = time.perf_counter()
+                try:
+                    if mode == "html":
+                        r = http_client.get(f"{stat_detail.BASE}/stats/detail/{stat_id}", retries=4, backoff=0.05)
+                        r.raise_for_status()
+                        n = len(player_rows(load_next_data(r.content)) or [])
+                    else:
+                        blob = stat_detail.fetch_stat_detail_json(stat_id)
+                        rows, cols, _ = stat_detail.locate_rows_columns(blob.get("pageProps") or {}, stat_id)
+                        n = len(stat_detail.normalize_rows(rows, cols))
+                    return time.perf_counter() - t0, None, n
+                except Exception as e:
+                    return time.perf_counter() - t0, type(e).__name__, 0
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                results = list(pool.map(one, range(total)))
+            elapsed = time.perf_counter() - started
+        finally:
+            os.chdir(cwd)
+
+    latencies = sorted(r[0] for r in results)
+    errors: Dict[str, int] = {}
+    for _, err, _ in results:
+        if err:
+            errors[err] = errors.get(err, 0) + 1
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1e3
+    return {"mode": mode, "requests": total, "concurrency": concurrency, "seconds": round(elapsed, 3),
+            "scrapes_per_s": round(total / elapsed, 1), "rows": sum(r[2] for r in results), "errors": errors,
+            "latency_ms": {"p50": round(pct(0.50), 2), "p95": round(pct(0.95), 2), "p99": round(pct(0.99), 2),
+                           "mean": round(statistics.fmean(latencies) * 1e3, 2)}}
+
+def main():
+    ap = argparse.ArgumentParser(description="Local mock of www.pgatour.com for offline load tests.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    for name in ("serve", "load"):
+        p = sub.add_parser(name)
+        p.add_argument("--host", default="127.0.0.1")
+        p.add_argument("--port", type=int, default=8765)
+        p.add_argument("--workers", type=int, default=1, help="server processes sharing the port")
+        p.add_argument("--latency", type=float, default=0.0, help="base delay in ms")
+        p.add_argument("--jitter", type=float, default=0.0, help="extra random delay in ms")
+        p.add_argument("--rate-429", type=float, default=0.0, help="fraction of 429 responses")
+        p.add_argument("--rate-5xx", type=float, default=0.0, help="fraction of 500/502/503 responses")
+        p.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429s")
+        p.add_argument("--rotate-every", type=float, default=0.0, help="seconds between buildId changes (0 = never)")
+        p.add_argument("--rows", type=int, default=0, help="grow every table to this many rows")
+        p.add_argument("--change-every", type=float, default=0.0, help="seconds between live table changes (0 = static)")
+        p.add_argument("--live-stats", default="", help="stat IDs that change (default: all)")
+    load = sub.choices["load"]
+    load.add_argument("--requests", type=int, default=5000)
+    load.add_argument("--concurrency", type=int, default=32)
+    load.add_argument("--stats", default="101-160", help="stat IDs to cycle through")
+    load.add_argument("--mode", choices=("next_data", "html"), default="next_data")
+    load.add_argument("--url", help="drive an already running server instead of starting one")
+    args = ap.parse_args()
+
+    options = dict(latency=args.latency / 1e3, jitter=args.jitter / 1e3, rate_429=args.rate_429, rate_5xx=args.rate_5xx,
+                   retry_after=args.retry_after, rotate_every=args.rotate_every, rows=args.rows,
+                   change_every=args.change_every, live_stats={s for s in args.live_stats.split(",") if s})
+    if args.cmd == "serve":
+        if args.workers > 1:
+            start_servers(args.workers - 1, args.host, args.port, **options)
+        print(f"Serving mock pgatour.com on http://{args.host}:{args.port} ({args.workers} process(es))")
+        serve(args.host, args.port, **options)
+        return
+
+    base = (args.url or f"http://{args.host}:{args.port}").rstrip("/")
+    os.environ["PGA_BASE_URL"] = base
+    from sweep import parse_stat_ids
+    procs = [] if args.url else start_servers(args.workers, args.host, args.port, **options)
+    try:
+        report = run_load(base, parse_stat_ids([args.stats]), args.requests, args.concurrency, args.mode)
+        with urllib.request.urlopen(f"{base}/__mock/stats") as r:
+            report["server"] = json.loads(r.read())
+    finally:
+        for p in procs:
+            p.terminate()
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
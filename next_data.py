@@ -0,0 +1,82 @@
+# Fast extraction of Next.js `__NEXT_DATA__` from a raw HTML page.
+#
+# Instead of building a BeautifulSoup tree (or running a non-greedy regex over
+# the whole document) we find the script tag with bytes.find and hand a
+# zero-copy memoryview of its body to the JSON decoder. Only if that fails do
+# we fall back to a full HTML parse.
+import json, re
+from typing import Any, Dict, Optional, Union
+
+try:  # orjson decodes straight from a memoryview; stdlib json needs bytes
+    import orjson
+except ImportError:
+    orjson = None
+
+_TAG_ID = b'id="__NEXT_DATA__"'
+_SCRIPT_END = b"</script>"
+_BUILD_ID_RE = re.compile(rb'"buildId"\s*:\s*"([^"]+)"')
+
+def _as_bytes(html: Union[bytes, str]) -> bytes:
+    return html.encode("utf-8") if isinstance(html, str) else html
+
+def find_next_data(html: Union[bytes, str]) -> Optional[memoryview]:
+    """Returns a memoryview over the JSON inside <script id="__NEXT_DATA__">, or None."""
+    buf = _as_bytes(html)
+    tag = buf.find(_TAG_ID)
+    if tag < 0:
+        return None
+    start = buf.find(b">", tag)
+    end = buf.find(_SCRIPT_END, start)
+    if start < 0 or end < 0:
+        return None
+    return memoryview(buf)[start + 1:end]
+
+def _loads(data: memoryview) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+def _full_parse(html: Union[bytes, str]) -> Optional[Dict[str, Any]]:
+    """Slow path: let an HTML parser find the tag (handles odd attribute order/quoting)."""
+    try:
+        from bs4 import BeautifulSoup
+    except ImportError:
+        m = re.search(r'<script[^>]*id=["\']__NEXT_DATA__["\'][^>]*>(.+?)</script>',
+                      html.decode("utf-8", "replace") if isinstance(html, (bytes, bytearray)) else str(html), re.S)
+        return json.loads(m.group(1)) if m else None
+    tag = BeautifulSoup(html, "html.parser").find("script", id="__NEXT_DATA__")
+    return json.loads(tag.string) if tag and tag.string else None
+
+def load_next_data(html: Union[bytes, str]) -> Optional[Dict[str, Any]]:
+    """
+    Parses the page's __NEXT_DATA__ JSON.
+
+    Args:
+        html: Raw page bytes (preferred, e.g. `response.content`) or text.
+
+    Returns:
+        dict: The decoded __NEXT_DATA__ object, or None if the page has none.
+    """
+    data = find_next_data(html)
+    if data is not None:
+        try:
+            return _loads(data)
+        except ValueError:
+            pass
+    return _full_parse(html)
+
+def find_build_id(html: Union[bytes, str]) -> Optional[str]:
+    """
+    The buildId without decoding the (large) page props: Next.js writes it at
+    the top level after "props", so the last "buildId" in the tag is the one.
+    """
+    data = find_next_data(html)
+    if data is not None:
+        matches = _BUILD_ID_RE.findall(data[-4096:])
+        if matches:
+            return matches[-1].decode("utf-8")
+        blob = load_next_data(html)
+        if isinstance(blob, dict) and blob.get("buildId"):
+            return blob["buildId"]
+    m = _BUILD_ID_RE.search(_as_bytes(html))
+    return m.group(1).decode("utf-8") if m else None
@@ -1,83 +1,117 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 import json
 import re
+import sys
+from typing import Any, Dict, List, Optional
 
-url = "https://www.pgatour.com/stats/detail/120"
+import http_client
+from stat_detail import BASE, payload_season
+from next_data import load_next_data
+from records import intern_str
+
+stat_id = "120"
+url = f"{BASE}/stats/detail/{stat_id}"
 headers = {"User-Agent": "Mozilla/5.0"}
+# statName → player_info field
+STAT_FIELDS = {"Avg": "scoring_avg", "Total Strokes": "total_strokes", "Total Adjustment": "total_adjustment",
+               "Total Rounds": "total_rounds"}
+
+def player_rows(page_data: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """StatDetailsPlayer rows of a stats page's __NEXT_DATA__ as player_info dicts (None if absent)."""
+    # Navigate to the player data
+    queries = page_data["props"]["pageProps"]["dehydratedState"]["queries"]
+
+    # Find the statDetails query
+    stat_data = None
+    for query in queries:
+        if "statDetails" in str(query.get("queryKey", [])):
+            try:
+                # The rows are directly under state.data.rows
+                stat_data = query["state"]["data"]["rows"]
+                break
+            except KeyError:
+                print("Could not access rows in query")
+                continue
+    if not stat_data:
+        return None
+
+    # Extract player data
+    player_data = []
+    for row in stat_data:
+        if row.get("__typename") == "StatDetailsPlayer":
+            player_info = {
+                "rank": row.get("rank"),
+                "player_name": intern_str(row.get("playerName")),
+                "country": intern_str(row.get("country")),
+                "player_id": row.get("playerId")
+            }
 
-r = requests.get(url, headers=headers)
-soup = BeautifulSoup(r.text, "html.parser")
+            # Extract stats as shown ("70.123", "E", "-"); the warehouse and
+            # columnar loaders parse them once, into typed columns
+            for stat in row.get("stats", []):
+                field = STAT_FIELDS.get(stat.get("statName"))
+                if field is not None:
+                    player_info[field] = stat.get("statValue")
 
-# Find the script tag containing the data
-script_tags = soup.find_all("script", id="__NEXT_DATA__")
-if script_tags:
-    script_content = script_tags[0].string
+            player_data.append(player_info)
+    return player_data
+
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    r = http_client.get(url, headers=headers)
+
+    # Slice the __NEXT_DATA__ script straight out of the raw bytes (a full HTML
+    # parse only happens if that fails)
+    if b"__NEXT_DATA__" not in r.content:
+        print("Could not find data script tag")
+        print("Available script tags:", r.text.count("<script"))
+        return
     try:
         # Parse the JSON data
-        page_data = json.loads(script_content)
-        
-        # Navigate to the player data
-        queries = page_data["props"]["pageProps"]["dehydratedState"]["queries"]
-        
-        # Find the statDetails query
-        stat_data = None
-        for query in queries:
-            if "statDetails" in str(query.get("queryKey", [])):
-                try:
-                    # The rows are directly under state.data.rows
-                    stat_data = query["state"]["data"]["rows"]
-                    break
-                except KeyError:
-                    print("Could not access rows in query")
-                    continue
-        
-        if stat_data:
-            # Extract player data
-            player_data = []
-            for row in stat_data:
-                if row.get("__typename") == "StatDetailsPlayer":
-                    player_info = {
-                        "rank": row.get("rank"),
-                        "player_name": row.get("playerName"),
-                        "country": row.get("country"),
-                        "player_id": row.get("playerId")
-                    }
-                    
-                    # Extract stats
-                    for stat in row.get("stats", []):
-                        stat_name = stat.get("statName")
-                        stat_value = stat.get("statValue")
-                        
-                        if stat_name == "Avg":
-                            player_info["scoring_avg"] = stat_value
-                        elif stat_name == "Total Strokes":
-                            player_info["total_strokes"] = stat_value
-                        elif stat_name == "Total Adjustment":
-                            player_info["total_adjustment"] = stat_value
-                        elif stat_name == "Total Rounds":
-                            player_info["total_rounds"] = stat_value
-                    
-                    player_data.append(player_info)
-            
-            # Create DataFrame
-            df = pd.DataFrame(player_data)
-            
-            print(f"Found {len(df)} players")
-            print("\nTop 10 players by scoring average:")
-            print(df.head(10).to_string(index=False))
-            
-            # Save to CSV
-            df.to_csv("pga_scoring_average_2025.csv", index=False)
-            print(f"\nData saved to pga_scoring_average_2025.csv")
-            
-        else:
-            print("Could not find stat details data in the page")
-            
+        page_data = load_next_data(r.content)
+        if page_data is None:
+            raise json.JSONDecodeError("empty __NEXT_DATA__", "", 0)
+        player_data = player_rows(page_data)
     except json.JSONDecodeError as e:
         print(f"Error parsing JSON: {e}")
-        
-else:
-    print("Could not find data script tag")
-    print("Available script tags:", len(soup.find_all("script")))
+        return
+    if not player_data:
+        print("Could not find stat details data in the page")
+        return
+
+    # Create DataFrame (pandas is only needed here, so it isn't imported at startup)
+    import pandas as pd
+    df = pd.DataFrame(player_data)
+
+    print(f"Found {len(df)} players")
+    print("\nTop 10 players by scoring average:")
+    print(df.head(10).to_string(index=False))
+
+    # Save to CSV
+    df.to_csv("pga_scoring_average_2025.csv", index=False)
+    print(f"\nData saved to pga_scoring_average_2025.csv")
+
+    # Optional change feed: python pga.py --delta
+    if "--delta" in argv:
+        from snapshots import SNAPSHOT_DIR, SnapshotStore, write_delta
+        events = SnapshotStore(SNAPSHOT_DIR / "player_stats").diff(stat_id, player_data)
+        print(f"{len(events)} changed rows since last scrape -> {write_delta(stat_id, events) or 'nothing written'}")
+
+    queries = page_data["props"]["pageProps"]["dehydratedState"]["queries"]
+    season = next((payload_season(q) for q in queries if "statDetails" in str(q.get("queryKey", []))), None)
+
+    # Optional warehouse load: python pga.py --warehouse
+    if "--warehouse" in argv:
+        from warehouse import Warehouse
+        with Warehouse() as wh:
+            loaded = wh.load_player_stats(stat_id, player_data, season=season, stat_name="Scoring Average")
+            print(f"Loaded {loaded} values into {wh.path}")
+
+    # Optional typed columnar copy: python pga.py --parquet (or --arrow)
+    fmt = next((a[2:] for a in argv if a in ("--parquet", "--arrow")), None)
+    if fmt:
+        import columnar
+        path = columnar.write_partition(player_data, stat_id, dataset="player_stats", fmt=fmt, season=season)
+        print(f"Data saved to {path}")
+
+if __name__ == "__main__":
+    main()
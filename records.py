@@ -0,0 +1,106 @@
+# Typed, compact row representations.
+#
+# Scraped rows arrive as dicts of strings ("298.4", "1,234", "T5"). Here they
+# are parsed once into numbers, with repeated strings (names, countries, ranks)
+# interned, and stored as struct-of-arrays columns backed by array('d')
+# instead of one dict per row.
+import math, sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+def to_float(v: Any) -> Optional[float]:
+    """"298.4" / "1,234" / 70 → float; anything else (None, "", "T5", "-") → None."""
+    if v is None or isinstance(v, bool):
+        return None
+    if isinstance(v, (int, float)):
+        return float(v)
+    try:
+        return float(str(v).replace(",", "").strip())
+    except ValueError:
+        return None
+
+def parse_rank(v: Any) -> Optional[int]:
+    """"T5" / "5" / 5 → 5."""
+    if v is None:
+        return None
+    s = str(v).strip().lstrip("Tt")
+    return int(s) if s.isdigit() else None
+
+def intern_str(v: Any) -> Optional[str]:
+    return None if v is None or v == "" else sys.intern(str(v))
+
+# ===== Struct of arrays ======================================================
+class StatColumns:
+    """
+    Column store for many stats' normalized rows: interned string columns in
+    lists and numeric columns in array('d') (NaN = missing), ~8 bytes/value.
+    A value that isn't a number ("E", "-", 31' 5") is NaN in its column and
+    keeps its text in `text[name][row]`, so nothing scraped is lost.
+    """
+
+    __slots__ = ("stat_id", "rank", "rank_num", "player_id", "player", "numbers", "text")
+
+    NUMERIC = ("avg_distance", "total_yards", "attempts_or_events")
+
+    def __init__(self):
+        self.stat_id: List[str] = []
+        self.rank: List[Optional[str]] = []
+        self.rank_num = array("d")
+        self.player_id: List[Optional[str]] = []
+        self.player: List[Optional[str]] = []
+        self.numbers: Dict[str, array] = {name: array("d") for name in self.NUMERIC}
+        self.text: Dict[str, Dict[int, str]] = {name: {} for name in self.NUMERIC}
+
+    def __len__(self) -> int:
+        return len(self.stat_id)
+
+    def append(self, stat_id: str, item: Dict[str, Any]):
+        rank = intern_str(item.get("rank"))
+        r = parse_rank(rank)
+        self.stat_id.append(sys.intern(str(stat_id)))
+        self.rank.append(rank)
+        self.rank_num.append(math.nan if r is None else r)
+        self.player_id.append(intern_str(item.get("player_id")))
+        self.player.append(intern_str(item.get("player")))
+        for name, col in self.numbers.items():
+            raw = item.get(name)
+            v = to_float(raw)
+            if v is None and raw not in (None, ""):
+                self.text[name][len(col)] = intern_str(raw)
+            col.append(math.nan if v is None else v)
+
+    def extend(self, stat_id: str, items: Iterable[Dict[str, Any]]) -> "StatColumns":
+        for item in items:
+            self.append(stat_id, item)
+        return self
+
+    @classmethod
+    def from_normalized(cls, stat_id: str, items: Iterable[Dict[str, Any]]) -> "StatColumns":
+        return cls().extend(stat_id, items)
+
+    def column(self, name: str) -> Union[List[Any], array]:
+        return self.numbers[name] if name in self.numbers else getattr(self, name)
+
+    def value(self, name: str, i: int) -> Union[float, str, None]:
+        """Row i of a numeric column: the number, else its text, else None."""
+        v = self.numbers[name][i]
+        return self.text[name].get(i) if math.isnan(v) else v
+
+    def dicts(self) -> Iterator[Dict[str, Any]]:
+        """Rows back in normalize_rows() shape, numbers parsed (for JSON output)."""
+        for i in range(len(self)):
+            item: Dict[str, Any] = {"rank": self.rank[i], "player": self.player[i], "player_id": self.player_id[i]}
+            for name in self.NUMERIC:
+                v = self.value(name, i)
+                if v is not None:
+                    item[name] = v
+            yield item
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """Zero-copy NumPy views of the numeric columns (strings as object arrays)."""
+        import numpy as np
+        out: Dict[str, Any] = {n: np.frombuffer(col, dtype=np.float64) for n, col in self.numbers.items()}
+        out["rank_num"] = np.frombuffer(self.rank_num, dtype=np.float64)
+        for n in ("stat_id", "rank", "player_id", "player"):
+            out[n] = np.array(getattr(self, n), dtype=object)
+        return out
@@ -8,6 +8,22 @@ import requests
 import json
 import os
 
+import http_client
+from build_id_cache import BuildIdCache, parse_build_id
+
+STATS_LANDING = "https://www.pgatour.com/stats"
+
+# The buildId this script was written against. It is tried first and replaced
+# by a freshly discovered one as soon as pgatour.com answers 404 for it.
+BUILD_IDS = BuildIdCache(seed="pgatour-prod-2.5.0")
+
+# Define headers to mimic a web browser request
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:142.0) Gecko/20100101 Firefox/142.0',
+    'Accept': 'application/json',
+    'Referer': 'https://www.pgatour.com/stats'
+}
+
 def explore_json_structure(data, indent=0, max_depth=3):
     """
     Recursively explores and prints the structure of a JSON object.
@@ -47,15 +63,8 @@ def get_pga_stats_json(url):
         dict: The parsed JSON data. Returns None on failure.
     """
     try:
-        # Define headers to mimic a web browser request
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:142.0) Gecko/20100101 Firefox/142.0',
-            'Accept': 'application/json',
-            'Referer': 'https://www.pgatour.com/stats'
-        }
-        
         print(f"Attempting to fetch data from: {url}")
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=HEADERS)
         response.raise_for_status() # Raise an exception for bad status codes
 
         print("Data fetched successfully, parsing JSON...")
@@ -66,8 +75,51 @@ def get_pga_stats_json(url):
         return None
     except json.JSONDecodeError as e:
         print(f"Error decoding JSON response: {e}")
-        return None    
-print(json.dumps(json_data['pageProps']['pageContext'], indent=2))
+        return None
+
+def discover_build_id():
+    """
+    Reads the current Next.js buildId from the /stats landing page.
+
+    Returns:
+        str: The buildId of the live deployment.
+    """
+    response = http_client.get(STATS_LANDING, headers=HEADERS)
+    response.raise_for_status()
+    return parse_build_id(response.content)
+
+def stat_detail_url(build_id, stat_id):
+    return f"https://www.pgatour.com/_next/data/{build_id}/en/stats/detail/{stat_id}.json?statId={stat_id}"
+
+def get_stat_detail_json(stat_id):
+    """
+    Fetches the JSON for one stat using the cached buildId, rediscovering it
+    if the deployment changed (the old buildId answers 404).
+
+    Args:
+        stat_id (str): The PGA Tour statId, e.g. "120".
+
+    Returns:
+        dict: The parsed JSON data. Returns None on failure.
+    """
+    def request(build_id):
+        url = stat_detail_url(build_id, stat_id)
+        print(f"Attempting to fetch data from: {url}")
+        return http_client.get(url, headers=HEADERS)
+
+    try:
+        response = BUILD_IDS.fetch(discover_build_id, request)
+        response.raise_for_status()
+
+        print("Data fetched successfully, parsing JSON...")
+        return response.json()
+
+    except (requests.exceptions.RequestException, RuntimeError) as e:
+        print(f"An error occurred while fetching stat {stat_id}: {e}")
+        return None
+    except json.JSONDecodeError as e:
+        print(f"Error decoding JSON response: {e}")
+        return None
 
 def extract_player_stats(data):
     """
@@ -110,14 +162,17 @@ def extract_player_stats(data):
     
     return player_data
 
-if __name__ == '__main__':
-    # URL for PGA Tour Driving Distance stats. Note that the statId is part of the URL.
-    # The example URL you provided was for statId 120, so we'll use that.
-    stat_id = "120"
-    url = f"https://www.pgatour.com/_next/data/pgatour-prod-2.5.0/en/stats/detail/{stat_id}.json?statId={stat_id}"
-    
-    # Get the raw JSON data
-    json_data = get_pga_stats_json(url)
+def main(stat_id="120"):
+    """
+    Fetches one stat's JSON, previews its structure and prints the extracted
+    player stats.
+
+    Args:
+        stat_id (str): The PGA Tour statId. Defaults to 120, the page this
+            script was written against.
+    """
+    # Get the raw JSON data (buildId comes from the cache, see BUILD_IDS)
+    json_data = get_stat_detail_json(stat_id)
 
     if json_data:
         # Explore the structure of the JSON to understand what we have
@@ -137,3 +192,6 @@ if __name__ == '__main__':
             print("\nFailed to extract player stats.")
     else:
         print("Scraping failed.")
+
+if __name__ == '__main__':
+    main()
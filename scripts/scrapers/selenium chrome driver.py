@@ -1,41 +1,29 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from bs4 import BeautifulSoup
-import pandas as pd
+import sys
+from pathlib import Path
 import json
 
 #web = 'https://www.pgatour.com/stats/detail/101'
 web = 'https://www.pgatour.com/stats/detail/120'
 path = r'C:\Users\hkh82\OneDrive\Desktop\Codes\chromedriver-win64\chromedriver.exe'
-service = Service(executable_path=path)
-driver = webdriver.Chrome(service=service)
 
-driver.get(web)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root, for browser_pool / html_table
+from browser_pool import BrowserPool
+from html_table import iter_table_rows
 
-# Parse page source with BeautifulSoup
-soup = BeautifulSoup(driver.page_source, "html.parser")
+# Same Chrome setup as the pooled scrapers (images/CSS blocked); a pool of one
+pool = BrowserPool(size=1, headless=False, driver_path=path)
+driver = pool.checkout()
 
-# Find the stats table
-table = soup.find("table")
-if table:
-    headers = [th.text.strip() for th in table.find_all("th")]
-    rows = []
-    for tr in table.find_all("tr")[1:]:
-        cells = [td.text.strip() for td in tr.find_all("td")]
-        if cells:
-            rows.append(cells)
+driver.get(web)
 
-if table:
-    headers = [th.text.strip() for th in table.find_all("th")]
-    rows = []
-    for tr in table.find_all("tr")[1:]:
-        cells = [td.text.strip() for td in tr.find_all("td")]
-        if cells:
-            rows.append(dict(zip(headers, cells)))
+# Extract the stats table in a single pass over the page source
+rows = list(iter_table_rows(driver.page_source))
+if rows:
     # Print as JSON
     print(json.dumps(rows, indent=2))
     print("Scraping complete. Data printed as JSON.")
 else:
     print("No table found on the page.")
 
-driver.quit()
\ No newline at end of file
+pool.checkin(driver)
+pool.close()
\ No newline at end of file
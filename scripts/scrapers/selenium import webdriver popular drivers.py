@@ -1,32 +1,25 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from bs4 import BeautifulSoup
-import pandas as pd
+import sys
+from pathlib import Path
 
 web = 'https://pgaclubtracker.com/clubhead_types/most-popular-golf-drivers-on-tour'
 path = r'C:\Users\hkh82\OneDrive\Desktop\Codes\chromedriver-win64\chromedriver.exe'
-service = Service(executable_path=path)
-driver = webdriver.Chrome(service=service)
 
-driver.get(web)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root, for browser_pool / html_table
+from browser_pool import BrowserPool
+from html_table import iter_table_rows, write_csv
+
+# Same Chrome setup as the pooled scrapers (images/CSS blocked); a pool of one
+pool = BrowserPool(size=1, headless=False, driver_path=path)
+driver = pool.checkout()
 
-# Parse page source with BeautifulSoup
-soup = BeautifulSoup(driver.page_source, "html.parser")
+driver.get(web)
 
-# Find the stats table
-table = soup.find("table")
-if table:
-    headers = [th.text.strip() for th in table.find_all("th")]
-    rows = []
-    for tr in table.find_all("tr")[1:]:
-        cells = [td.text.strip() for td in tr.find_all("td")]
-        if cells:
-            rows.append(cells)
-    # Save to CSV
-    df = pd.DataFrame(rows, columns=headers)
-    df.to_csv("most_popular_golf_drivers.csv", index=False)
-    print("Scraping complete. Data saved to most_popular_golf_drivers.csv.")
+# Stream the table's rows straight into the CSV (one pass, no DataFrame)
+n = write_csv(iter_table_rows(driver.page_source), "most_popular_golf_drivers.csv")
+if n:
+    print(f"Scraping complete. {n} rows saved to most_popular_golf_drivers.csv.")
 else:
     print("No table found on the page.")
 
-driver.quit()
\ No newline at end of file
+pool.checkin(driver)
+pool.close()
\ No newline at end of file
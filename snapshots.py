@@ -0,0 +1,111 @@
+# Row-level change detection between scrapes.
+#
+# For every stat we keep a snapshot {player_id: content hash} of the last
+# scrape. A new scrape is diffed against it and only the inserted, updated and
+# removed rows are emitted, as a JSON-lines delta file / event list.
+import datetime as dt
+import hashlib, json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+SNAPSHOT_DIR = Path("cache") / "snapshots"
+DELTA_DIR = Path("out") / "deltas"
+
+KEY_FIELDS = ("playerId", "player_id", "id")
+NAME_FIELDS = ("playerName", "player_name", "player", "displayName")
+
+def row_key(row: Dict[str, Any]) -> Optional[str]:
+    """Natural key of a row: the player id, else the player name."""
+    for f in KEY_FIELDS + NAME_FIELDS:
+        v = row.get(f)
+        if v not in (None, "") and not isinstance(v, (dict, list)):
+            return str(v)
+    return None
+
+def row_hash(row: Dict[str, Any]) -> str:
+    blob = json.dumps(row, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.blake2b(blob.encode("utf-8"), digest_size=16).hexdigest()
+
+def diff_rows(stat_id: str, old: Dict[str, Dict[str, Any]], rows: Iterable[Dict[str, Any]],
+              key: Callable[[Dict[str, Any]], Optional[str]] = row_key) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """
+    Diffs `rows` against an in-memory snapshot (see SnapshotStore.diff).
+
+    Returns:
+        tuple: (events, the snapshot of `rows`).
+    """
+    new: Dict[str, Dict[str, Any]] = {}
+    events: List[Dict[str, Any]] = []
+    for r in rows:
+        k = key(r)
+        if k is None:
+            continue
+        h = row_hash(r)
+        new[k] = {"hash": h, "row": r}
+        prev = old.get(k)
+        if prev is None:
+            events.append({"op": "insert", "stat_id": stat_id, "player_id": k, "row": r})
+        elif prev["hash"] != h:
+            events.append({"op": "update", "stat_id": stat_id, "player_id": k, "row": r})
+    for k, prev in old.items():
+        if k not in new:
+            events.append({"op": "remove", "stat_id": stat_id, "player_id": k, "row": prev["row"]})
+    return events, new
+
+class SnapshotStore:
+    """
+    Per-stat snapshots of row hashes (and the rows, so removals can be emitted).
+
+    Args:
+        root (Path): Directory holding one `stat_<id>.json` snapshot per stat.
+    """
+
+    def __init__(self, root: Path = SNAPSHOT_DIR):
+        self.root = Path(root)
+
+    def _path(self, stat_id: str) -> Path:
+        return self.root / f"stat_{stat_id}.json"
+
+    def load(self, stat_id: str) -> Dict[str, Dict[str, Any]]:
+        try:
+            return json.loads(self._path(stat_id).read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def save(self, stat_id: str, snapshot: Dict[str, Dict[str, Any]]):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self._path(stat_id).with_suffix(".tmp")
+        tmp.write_text(json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")))
+        tmp.replace(self._path(stat_id))
+
+    def diff(self, stat_id: str, rows: Iterable[Dict[str, Any]],
+             key: Callable[[Dict[str, Any]], Optional[str]] = row_key, commit: bool = True) -> List[Dict[str, Any]]:
+        """
+        Compares `rows` with the last snapshot of `stat_id`.
+
+        Args:
+            stat_id (str): PGA Tour statId the rows belong to.
+            rows: The full, current table (raw or normalized rows).
+            key: Returns the natural key of a row (rows without one are skipped).
+            commit (bool): Replace the snapshot with `rows` afterwards.
+
+        Returns:
+            list: Events {"op": "insert" | "update" | "remove", "stat_id", "player_id", "row"}.
+        """
+        old = self.load(stat_id)
+        events, new = diff_rows(stat_id, old, rows, key)
+        if commit and (events or not old):
+            self.save(stat_id, new)
+        return events
+
+def write_delta(stat_id: str, events: List[Dict[str, Any]], outdir: Path = DELTA_DIR) -> Optional[Path]:
+    """Writes the events as `stat_<id>_<utc timestamp>.jsonl`; nothing if there are none."""
+    if not events:
+        return None
+    outdir = Path(outdir); outdir.mkdir(parents=True, exist_ok=True)
+    ts = dt.datetime.now(dt.timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    path = outdir / f"stat_{stat_id}_{ts}.jsonl"
+    with path.open("w", encoding="utf-8") as f:
+        for e in events:
+            f.write(json.dumps(e, ensure_ascii=False) + "\n")
+    return path
@@ -0,0 +1,185 @@
+# Local catalog of every stat pgatour.com lists.
+#
+# The /stats landing page (already downloaded for buildId discovery) carries
+# the full category → stat tree in its __NEXT_DATA__. We pull every stat ID
+# out of it with its name and categories, persist that under cache/ and keep
+# in-memory indexes by ID, category and name. Column metadata is filled in
+# from the stat pages themselves as sweeps fetch them. Sweeps can then target
+# a category and skip IDs the site no longer lists.
+import json, re, threading, time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from next_data import load_next_data
+
+CATALOG_PATH = Path("cache") / "stat_catalog.json"
+DEFAULT_TTL = 24 * 60 * 60  # seconds
+
+_ID_KEYS = ("statId", "statID")
+_NAME_KEYS = ("statTitle", "statName", "title", "name", "displayName")
+_LABEL_KEYS = ("displayName", "categoryName", "title", "name", "category")
+_DETAIL_LINK_RE = re.compile(rb'/stats/detail/(\d+)')
+
+def _label(node: Dict[str, Any]) -> Optional[str]:
+    for k in _LABEL_KEYS:
+        v = node.get(k)
+        if isinstance(v, str) and v.strip():
+            return v.strip()
+    return None
+
+def iter_catalog_stats(node: Any, groups: Tuple[str, ...] = ()) -> Iterator[Dict[str, Any]]:
+    """
+    Walks a __NEXT_DATA__ tree and yields {"stat_id", "name", "groups"} for
+    every stat-like object, where groups are the labels of the enclosing
+    category objects (outermost first).
+    """
+    if isinstance(node, list):
+        for v in node:
+            yield from iter_catalog_stats(v, groups)
+        return
+    if not isinstance(node, dict):
+        return
+    sid = next((node[k] for k in _ID_KEYS if node.get(k) not in (None, "")), None)
+    if sid is None and node.get("statTitle") and node.get("id") not in (None, ""):
+        sid = node["id"]
+    name = next((node[k] for k in _NAME_KEYS if isinstance(node.get(k), str) and node[k].strip()), None)
+    if sid is not None and name:
+        yield {"stat_id": str(sid), "name": name.strip(), "groups": list(groups)}
+        return
+    label = _label(node)
+    inner = groups + (label,) if label and label not in groups else groups
+    for v in node.values():
+        if isinstance(v, (dict, list)):
+            yield from iter_catalog_stats(v, inner)
+
+def columns_from_table(cols: List[Dict[str, Any]], query: Optional[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Column metadata of a located table: its columns list, else the statHeaders of its query."""
+    out = []
+    for c in cols:
+        field = c.get("field") or c.get("id") or c.get("key") or c.get("name")
+        if field:
+            out.append({"field": str(field), "name": str(c.get("name") or c.get("label") or field)})
+    if not out and query:
+        data = (query.get("state") or {}).get("data") or {}
+        headers = data.get("statHeaders") if isinstance(data, dict) else None
+        out = [{"field": str(h), "name": str(h)} for h in headers or [] if isinstance(h, str)]
+    return out
+
+class StatCatalog:
+    """
+    Stat ID → {"name", "category", "subcategory", "groups", "columns"} with a TTL.
+
+    Args:
+        path (Path): JSON file the catalog is persisted to.
+        ttl (float): Seconds before the landing page should be read again.
+    """
+
+    def __init__(self, path: Path = CATALOG_PATH, ttl: float = DEFAULT_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        try:
+            blob = json.loads(self.path.read_text())
+            self._stats: Dict[str, Dict[str, Any]] = blob["stats"]
+            self.fetched_at = float(blob["fetchedAt"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self._stats, self.fetched_at = {}, 0.0
+        self._reindex()
+
+    def _reindex(self):
+        self._by_group: Dict[str, List[str]] = {}
+        self._group_names: Dict[str, str] = {}
+        for sid, entry in self._stats.items():
+            for g in entry.get("groups") or []:
+                self._by_group.setdefault(g.lower(), []).append(sid)
+                self._group_names.setdefault(g.lower(), g)
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"fetchedAt": self.fetched_at, "stats": self._stats}, ensure_ascii=False))
+        tmp.replace(self.path)
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    def __contains__(self, stat_id: str) -> bool:
+        return str(stat_id) in self._stats
+
+    @property
+    def stale(self) -> bool:
+        return not self._stats or time.time() - self.fetched_at >= self.ttl
+
+    # ===== Updating ==========================================================
+    def ingest_landing(self, html: Union[bytes, str]) -> int:
+        """
+        Replaces the catalog with the stats listed on a /stats landing page.
+        Column metadata already known for a surviving stat is kept.
+
+        Returns:
+            int: Number of stats found (0 leaves the catalog untouched).
+        """
+        found: Dict[str, Dict[str, Any]] = {}
+        page = load_next_data(html)
+        for s in iter_catalog_stats((page or {}).get("props") or page or {}):
+            entry = found.get(s["stat_id"])
+            if entry is None:
+                groups = s["groups"]
+                found[s["stat_id"]] = {"name": s["name"], "category": groups[0] if groups else None,
+                                       "subcategory": groups[-1] if len(groups) > 1 else None, "groups": list(groups)}
+            else:
+                entry["groups"] += [g for g in s["groups"] if g not in entry["groups"]]
+        if not found:  # no JSON tree: fall back to the detail links in the markup
+            raw = html.encode("utf-8") if isinstance(html, str) else html
+            for sid in dict.fromkeys(m.decode() for m in _DETAIL_LINK_RE.findall(raw)):
+                found[sid] = {"name": None, "category": None, "subcategory": None, "groups": []}
+        if not found:
+            return 0
+        with self._lock:
+            for sid, entry in found.items():
+                old = self._stats.get(sid) or {}
+                if old.get("columns"):
+                    entry["columns"] = old["columns"]
+            self._stats, self.fetched_at = found, time.time()
+            self._reindex()
+            self._save()
+        return len(found)
+
+    def record_columns(self, stat_id: str, columns: List[Dict[str, str]], name: Optional[str] = None):
+        """Stores a stat's column metadata as seen on its detail page (written only on change)."""
+        if not columns:
+            return
+        with self._lock:
+            entry = self._stats.get(str(stat_id))
+            if entry is None or (entry.get("columns") == columns and (not name or entry.get("name"))):
+                return
+            entry["columns"] = columns
+            if name and not entry.get("name"):
+                entry["name"] = name
+            self._save()
+
+    def refresh(self, fetch_landing, force: bool = False) -> bool:
+        """Re-reads the landing page (via `fetch_landing() -> bytes`) if stale; True if it did."""
+        if not force and not self.stale:
+            return False
+        return self.ingest_landing(fetch_landing()) > 0
+
+    # ===== Lookups ===========================================================
+    def get(self, stat_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._stats.get(str(stat_id))
+        return {"stat_id": str(stat_id), **entry} if entry else None
+
+    def stat_ids(self, category: Optional[str] = None) -> List[str]:
+        """All stat IDs, or those under a category/subcategory (case-insensitive)."""
+        if category is None:
+            return list(self._stats)
+        return list(self._by_group.get(category.strip().lower(), []))
+
+    def categories(self) -> Dict[str, int]:
+        """Category/subcategory label → number of stats under it."""
+        return {self._group_names[g]: len(ids) for g, ids in sorted(self._by_group.items())}
+
+    def search(self, text: str) -> List[Dict[str, Any]]:
+        """Stats whose name contains `text` (case-insensitive)."""
+        t = text.lower()
+        return [self.get(sid) for sid, e in self._stats.items() if t in (e.get("name") or "").lower()]
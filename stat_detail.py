@@ -0,0 +1,468 @@
+# Core of the _next/data stat scraper: fetch a stat's JSON, find the table
+# inside the dehydrated React Query state and normalize its rows.
+# Shared by 2.py (single stat) and sweep.py (many stats).
+# pip install requests
+import json, os
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Optional
+import requests
+
+import http_client, json_stream, metrics
+from build_id_cache import BuildIdCache, parse_build_id
+from records import StatColumns
+from stat_catalog import StatCatalog
+from table_paths import TablePathIndex
+
+BASE = os.environ.get("PGA_BASE_URL", "https://www.pgatour.com").rstrip("/")  # mock_server.py for load tests
+STATS_LANDING = f"{BASE}/stats"
+LANG_PATH = "en"
+
+# ===== BuildId discovery (stays stable across deployments) ===================
+# Cached on disk with a TTL; only rediscovered when a _next/data request 404s.
+BUILD_IDS = BuildIdCache(base_url=BASE)
+# Every stat the landing page lists; refreshed from the same download.
+CATALOG = StatCatalog()
+
+def get_build_id() -> str:
+    with metrics.timer("build_id_discovery") as t:
+        r = http_client.get(STATS_LANDING, timeout=20)
+        r.raise_for_status()
+        t.add(bytes=len(r.content))
+        build_id = parse_build_id(r.content)
+    if CATALOG.stale:
+        try:
+            CATALOG.ingest_landing(r.content)
+        except ValueError:
+            pass  # the catalog is a by-product; never fail discovery over it
+    return build_id
+
+def refresh_catalog(force: bool = False) -> StatCatalog:
+    """Returns CATALOG, re-reading /stats first if it is stale (or `force`)."""
+    def landing() -> bytes:
+        r = http_client.get(STATS_LANDING, timeout=20)
+        r.raise_for_status()
+        return r.content
+    CATALOG.refresh(landing, force)
+    return CATALOG
+
+def stat_detail_params(stat_id: str, season: Optional[int] = None, tournament_id: Optional[str] = None) -> Dict[str, str]:
+    """Query string for a stat page; season/tournament select historical tables."""
+    params = {"statId": stat_id}
+    if season is not None:
+        params["year"] = str(season)
+    if tournament_id:
+        params["tournamentId"] = tournament_id
+    return params
+
+def fetch_stat_detail_response(stat_id: str, season: Optional[int] = None,
+                               tournament_id: Optional[str] = None) -> requests.Response:
+    """The raw _next/data response (`from_cache` is True when the server answered 304)."""
+    def request(build_id: str) -> requests.Response:
+        url = f"{BASE}/_next/data/{build_id}/{LANG_PATH}/stats/detail/{stat_id}.json"
+        return http_client.get(url, params=stat_detail_params(stat_id, season, tournament_id), timeout=30)
+    with metrics.timer("download", stat_id=stat_id) as t:
+        r = BUILD_IDS.fetch(get_build_id, request)
+        r.raise_for_status()
+        t.add(bytes=len(r.content), from_cache=getattr(r, "from_cache", False))
+    return r
+
+def fetch_stat_detail_json(stat_id: str, season: Optional[int] = None, tournament_id: Optional[str] = None) -> Dict[str, Any]:
+    r = fetch_stat_detail_response(stat_id, season, tournament_id)
+    with metrics.timer("json_decode", stat_id=stat_id) as t:
+        t.add(bytes=len(r.content))
+        return r.json()
+
+# ===== Streaming ==============================================================
+# ijson prefixes of the dehydrated React Query state; "item" matches any index.
+QUERY_PREFIX = "pageProps.dehydratedState.queries.item"
+DATA_PREFIX = QUERY_PREFIX + ".state.data"
+
+def _stream_prefix(root: str, path: List[Any]) -> str:
+    """ijson prefix of a learned table path (query indices become "item")."""
+    base = DATA_PREFIX if root == "data" else "pageProps"
+    return ".".join([base] + ["item" if isinstance(k, int) else str(k) for k in path])
+
+def _stream_query_table(events: Iterator[json_stream.Event], stat_id: str, rows_prefixes: Iterable[str],
+                        layout: Optional[str]) -> Iterator[Tuple[str, Any]]:
+    """
+    Yields ("columns", cols) and then ("row", row) per table row, read from the
+    event stream as it arrives. A query is identified by the data.statId that
+    precedes its rows. Rows are only buffered when that can't be decided in
+    time (no statId; the queryKey comes after the state) or when the columns
+    may still follow the rows: they are streamed early only once the holder's
+    columns were read, or if `layout` (learned for this stat) is "none".
+    Yields nothing if no table is found.
+    """
+    rows_prefixes = set(rows_prefixes)
+    holders = {p.rsplit(".", 1)[0] for p in rows_prefixes}
+    query_stat: Optional[str] = None
+    key_match = False
+    cols: Dict[str, List[Dict[str, Any]]] = {}
+    buffered: Optional[Dict[str, Any]] = None  # {"holder", "rows", "matched"} waiting for its holder to close
+    pending: Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]] = None  # waiting for the queryKey
+    fallback: Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]] = None
+
+    def emit(table: Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]) -> Iterator[Tuple[str, Any]]:
+        yield "columns", table[0]
+        for row in table[1]:
+            yield "row", row
+
+    for prefix, event, value in events:
+        if prefix == QUERY_PREFIX and event == "start_map":
+            query_stat, key_match, cols, pending = None, False, {}, None
+        elif prefix == QUERY_PREFIX and event == "end_map":
+            if pending is not None:
+                if key_match:
+                    yield from emit(pending)
+                    return
+                if fallback is None:
+                    fallback = pending
+            pending = None
+        elif prefix == DATA_PREFIX + ".statId" and event in json_stream.SCALAR_EVENTS:
+            query_stat = str(value)
+        elif prefix.startswith(QUERY_PREFIX + ".queryKey") and event in json_stream.SCALAR_EVENTS:
+            key_match = key_match or str(value) == stat_id
+        elif event == "start_array" and prefix.endswith(".columns") and prefix[:-len(".columns")] in holders:
+            built = json_stream.build((prefix, event, value), events)
+            cols[prefix[:-len(".columns")]] = [c for c in built if isinstance(c, dict)]
+        elif event == "start_array" and prefix in rows_prefixes:
+            in_query = prefix.startswith(QUERY_PREFIX + ".")
+            if in_query and query_stat is not None and query_stat != stat_id:
+                continue  # another stat's table; its items are skipped unbuilt
+            holder = prefix.rsplit(".", 1)[0]
+            items = json_stream.iter_array(prefix, events)
+            first = next(items, None)
+            if not isinstance(first, dict):
+                for _ in items:
+                    pass
+                continue
+            matched = not in_query or query_stat == stat_id
+            # Columns may still follow the rows unless they were seen already, or
+            # this stat's own payloads are known to have none
+            if matched and (holder in cols or layout == "none"):
+                yield "columns", cols.get(holder, [])
+                yield "row", first
+                for row in items:
+                    if isinstance(row, dict):
+                        yield "row", row
+                return
+            buffered = {"holder": holder, "rows": [first] + [r for r in items if isinstance(r, dict)], "matched": matched}
+        elif buffered is not None and event == "end_map" and prefix == buffered["holder"]:
+            table = (cols.get(buffered["holder"], []), buffered["rows"])
+            if buffered["matched"]:
+                yield from emit(table)
+                return
+            pending, buffered = table, None
+    if fallback is not None:
+        yield from emit(fallback)
+
+def _stream_targets(stat_id: str, family: str, build_id: Optional[str]) -> Tuple[List[str], Optional[str]]:
+    """ijson prefixes to watch for rows, and the columns layout learned for this very stat (or None)."""
+    if not build_id:
+        return [f"{DATA_PREFIX}.{rk}" for rk in _ROW_KEYS], None
+    index_key = f"{build_id}|{family}"
+    learned = TABLE_PATHS.get(index_key)
+    layout = (TABLE_PATHS.get(f"{index_key}|{stat_id}") or {}).get("columns")
+    if learned and learned.get("path"):
+        return [_stream_prefix(learned["root"], learned["path"])], layout
+    return [f"{DATA_PREFIX}.{rk}" for rk in _ROW_KEYS], layout
+
+def stream_stat_table(stat_id: str, family: str = "statDetails", season: Optional[int] = None,
+                      tournament_id: Optional[str] = None) -> Optional[Tuple[List[Dict[str, Any]], Iterator[Dict[str, Any]]]]:
+    """
+    Streaming variant of fetch → locate: returns (columns, lazy raw rows).
+
+    Rows are parsed straight off the response while it downloads and built
+    one at a time; the rest of the payload is never materialized. The table is
+    found at the path learned by locate_rows_columns for this buildId + stat
+    family, or else at the usual state.data.rows-style keys. Returns None
+    without ijson or when no table turns up, so the caller can fall back to
+    fetch_stat_detail_json.
+    """
+    if not json_stream.available():
+        return None
+    rows_prefixes, layout = _stream_targets(stat_id, family, BUILD_IDS.peek())
+
+    def request(build_id: str) -> requests.Response:
+        url = f"{BASE}/_next/data/{build_id}/{LANG_PATH}/stats/detail/{stat_id}.json"
+        return http_client.get(url, params=stat_detail_params(stat_id, season, tournament_id), timeout=30,
+                               stream=True, use_cache=False)
+    with metrics.timer("download", stat_id=stat_id, stream=True):
+        r = BUILD_IDS.fetch(get_build_id, request)
+        r.raise_for_status()
+    r.raw.decode_content = True  # gzip/br are undone before ijson sees the bytes
+    table = _stream_query_table(json_stream.parse(r.raw), stat_id, rows_prefixes, layout)
+    try:
+        _, cols = next(table)
+    except StopIteration:
+        r.close()
+        return None
+    except BaseException:
+        r.close()
+        raise
+
+    def rows() -> Iterator[Dict[str, Any]]:
+        try:
+            for _, row in table:
+                yield row
+        finally:
+            r.close()
+    return cols, rows()
+
+# ===== Find which React Query contains the table =============================
+# JSON path to rows/columns per (buildId, stat family), learned on first match.
+TABLE_PATHS = TablePathIndex()
+
+def _looks_like_rows(arr: Any) -> bool:
+    return isinstance(arr, list) and arr and isinstance(arr[0], dict)
+
+_ROW_KEYS = ("rows", "data", "tableRows", "items")
+
+def _find_table_path(node: Any) -> Optional[List[Any]]:
+    """Depth-first search for the first table-like array; returns its key/index path."""
+    path: List[Any] = []
+    def scan(x: Any) -> bool:
+        if isinstance(x, dict):
+            for rk in _ROW_KEYS:
+                if rk in x and _looks_like_rows(x[rk]):
+                    path.append(rk)
+                    return True
+            items = x.items()
+        elif isinstance(x, list):
+            items = enumerate(x)
+        else:
+            return False
+        for k, v in items:
+            path.append(k)
+            if scan(v): return True
+            path.pop()
+        return False
+    return path if scan(node) else None
+
+def _table_at(node: Any, path: List[Any]) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+    """O(depth) lookup of a learned path; None if the payload no longer matches it."""
+    if not path:
+        return None
+    holder = node
+    try:
+        for k in path[:-1]:
+            holder = holder[k]
+    except (KeyError, IndexError, TypeError):
+        return None
+    if not isinstance(holder, dict) or not _looks_like_rows(holder.get(path[-1])):
+        return None
+    cols = holder.get("columns")
+    cols = [c for c in cols if isinstance(c, dict)] if isinstance(cols, list) else []
+    return holder[path[-1]], cols
+
+def _columns_layout(node: Any, path: List[Any]) -> str:
+    """Where the table's "columns" sit relative to its rows: "before", "after" or "none" (for streaming)."""
+    holder = node
+    for k in path[:-1]:
+        holder = holder[k]
+    keys = list(holder)
+    if "columns" not in keys:
+        return "none"
+    return "before" if keys.index("columns") < keys.index(path[-1]) else "after"
+
+def _learn_layout(index_key: str, stat_id: str, root: Any, path: List[Any]):
+    # Per stat: stats of one family don't all place (or have) their columns alike
+    TABLE_PATHS.put(f"{index_key}|{stat_id}", {"columns": _columns_layout(root, path)})
+
+def _extract_table_like(node: Any) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    path = _find_table_path(node)
+    return (_table_at(node, path) if path else None) or ([], [])
+
+def _query_family(q: Dict[str, Any]) -> str:
+    key = q.get("queryKey")
+    if isinstance(key, list) and key and isinstance(key[0], str):
+        return key[0]
+    return type(key).__name__
+
+def _path_query(path: List[Any], dehydrated: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """The query a pageProps-rooted path runs through (dehydratedState.queries[i]), if any."""
+    if len(path) > 2 and path[:2] == ["dehydratedState", "queries"] and isinstance(path[2], int):
+        return dehydrated[path[2]] if 0 <= path[2] < len(dehydrated) else None
+    return None
+
+def _path_family(root_name: str, path: List[Any], dehydrated: List[Dict[str, Any]]) -> Optional[str]:
+    q = _path_query(path, dehydrated) if root_name == "pageProps" else None
+    return _query_family(q) if q is not None else None
+
+def _learned_query_matches(learned: Dict[str, Any], dehydrated: List[Dict[str, Any]]) -> bool:
+    """
+    Query order isn't stable across payloads, so a learned pageProps path that
+    goes through queries[i] is only trusted if that query is still of the
+    family it was learned from.
+    """
+    if learned["root"] != "pageProps" or learned.get("family") is None:
+        return True
+    q = _path_query(learned["path"], dehydrated)
+    return q is not None and _query_family(q) == learned["family"]
+
+def locate_rows_columns(page_props: Dict[str, Any], stat_id: str, build_id: Optional[str] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    with metrics.timer("locate", stat_id=stat_id) as t:
+        rows, cols, q = _locate_rows_columns(page_props, stat_id, build_id)
+        t.add(rows=len(rows))
+    return rows, cols, q
+
+def _locate_rows_columns(page_props: Dict[str, Any], stat_id: str, build_id: Optional[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    dehydrated = (page_props.get("dehydratedState") or {}).get("queries") or []
+    best = None
+    # Prefer the query whose key mentions our statId
+    for q in dehydrated:
+        key = q.get("queryKey")
+        key_str = json.dumps(key, ensure_ascii=False)
+        if stat_id in (key_str or ""):
+            best = q
+            break
+    if best is None and dehydrated:
+        best = dehydrated[0]
+
+    if not best: return [], [], None
+    data = (best.get("state") or {}).get("data")
+    if not data: return [], [], best
+
+    roots = {"data": data, "pageProps": page_props}
+    family = _query_family(best)
+    index_key = f"{build_id or BUILD_IDS.peek() or ''}|{family}"
+
+    # Fast path: the table sits where it did in the last payload of this shape
+    learned = TABLE_PATHS.get(index_key)
+    if learned and learned.get("root") in roots and _learned_query_matches(learned, dehydrated):
+        table = _table_at(roots[learned["root"]], learned["path"])
+        if table:
+            _learn_layout(index_key, stat_id, roots[learned["root"]], learned["path"])
+            metrics.cache_result("table_path", True)
+            return table[0], table[1], best
+    metrics.cache_result("table_path", False)
+
+    # Full scan of the query data, then (rare fallback) the whole pageProps
+    for root_name, root in roots.items():
+        path = _find_table_path(root)
+        if path:
+            TABLE_PATHS.put(index_key, {"root": root_name, "path": path, "family": _path_family(root_name, path, dehydrated)})
+            _learn_layout(index_key, stat_id, root, path)
+            rows, cols = _table_at(root, path)
+            return rows, cols, best
+    return [], [], best
+
+def payload_season(query: Optional[Dict[str, Any]]) -> Optional[int]:
+    """Season a stat query reports (state.data.year, else the year in its queryKey), or None."""
+    if not query:
+        return None
+    data = (query.get("state") or {}).get("data")
+    key = query.get("queryKey")
+    candidates = [data.get("year")] if isinstance(data, dict) else []
+    if isinstance(key, list):
+        candidates += [k.get("year") for k in key if isinstance(k, dict)]
+    for year in candidates:
+        try:
+            return int(year)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+# ===== Normalization helpers ==================================================
+# Candidate names in priority order (tuples, so the chosen column is stable).
+PLAYER_FIELDS = ("playerName", "player", "fullName", "name", "playerFullName")
+PLAYER_ID_FIELDS = ("playerId", "player_id", "id")
+RANK_FIELDS   = ("rank", "ranking", "position")
+TARGET_CANDIDATES = (
+    ("avg_distance",       ("avg", "average", "avg_distance", "average_distance", "avgdist")),
+    ("total_yards",        ("total", "total_yards", "yards", "distance_total", "tot")),
+    ("attempts_or_events", ("attempts", "events", "rounds", "att", "evt", "count")),
+)
+_KEEP_IF_ANY = ("player", "avg_distance", "total_yards", "rank")
+
+Plan = Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...], Tuple[Tuple[str, str], ...]]
+
+def _columns_signature(cols: List[Dict[str, Any]]) -> Tuple[Tuple[str, str], ...]:
+    """(source key, lowercase name) per column: everything the plan depends on."""
+    sig = []
+    for c in cols:
+        raw = (c.get("field") or c.get("id") or c.get("key") or c.get("name") or "").lower()
+        if raw:
+            sig.append((c.get("field") or c.get("id") or raw, raw))
+    return tuple(sig)
+
+@lru_cache(maxsize=256)
+def _column_map(col_sig: Tuple[Tuple[str, str], ...]) -> Dict[str, str]:
+    """Column metadata → normalized target names (substring match on the name)."""
+    col_map = {}
+    for src, raw in col_sig:
+        for target, cands in TARGET_CANDIDATES:
+            if any(c in raw for c in cands):
+                col_map[src] = target
+                break
+    return col_map
+
+@lru_cache(maxsize=4096)
+def _row_plan(col_sig: Tuple[Tuple[str, str], ...], row_keys: Tuple[str, ...]) -> Plan:
+    """
+    Compiles the accessors for rows with these keys: the present rank, player
+    and player id keys (tried in order per row) and fixed (target, source key)
+    pairs.
+    """
+    present = set(row_keys)
+    col_map = _column_map(col_sig)
+    assign: Dict[str, str] = {}
+    for k in row_keys:
+        tgt = col_map.get(k)
+        if tgt: assign[tgt] = k
+
+    # fallback by raw keys (exact, case-insensitive)
+    lk = {k.lower(): k for k in row_keys}
+    for target, cands in TARGET_CANDIDATES:
+        if target in assign: continue
+        for cand in cands:
+            if cand in lk:
+                assign[target] = lk[cand]
+                break
+
+    rank_keys = tuple(k for k in RANK_FIELDS if k in present)
+    player_keys = tuple(k for k in PLAYER_FIELDS if k in present)
+    id_keys = tuple(k for k in PLAYER_ID_FIELDS if k in present)
+    return rank_keys, player_keys, id_keys, tuple(assign.items())
+
+def _pick_first(d: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    for k in keys:
+        v = d[k]
+        if v is not None and v != "":
+            return v
+    return None
+
+def normalize_rows(rows: List[Dict[str, Any]], cols: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    with metrics.timer("normalize") as t:
+        out = list(iter_normalized(rows, cols))
+        t.add(rows=len(out))
+    return out
+
+def normalize_columns(rows: Iterable[Dict[str, Any]], cols: List[Dict[str, Any]], stat_id: str) -> StatColumns:
+    """normalize_rows() straight into typed columns: numbers parsed and names interned once, no dict kept per row."""
+    with metrics.timer("normalize") as t:
+        out = StatColumns.from_normalized(stat_id, iter_normalized(rows, cols))
+        t.add(rows=len(out))
+    return out
+
+def iter_normalized(rows: Iterable[Dict[str, Any]], cols: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Lazy normalize_rows: consumes `rows` one at a time (works on a stream)."""
+    col_sig = _columns_signature(cols)
+    plans: Dict[Tuple[str, ...], Plan] = {}  # rows of one table nearly always share keys
+
+    for r in rows:
+        keys = tuple(r)
+        plan = plans.get(keys)
+        if plan is None:
+            plan = plans[keys] = _row_plan(col_sig, keys)
+        rank_keys, player_keys, id_keys, assign = plan
+
+        item = {"rank": _pick_first(r, rank_keys), "player": _pick_first(r, player_keys),
+                "player_id": _pick_first(r, id_keys)}
+        for tgt, src in assign:
+            item[tgt] = r[src]
+
+        for x in _KEEP_IF_ANY:
+            if item.get(x) is not None:
+                yield item
+                break
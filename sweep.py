@@ -0,0 +1,176 @@
+# Fetch many stats' _next/data JSON concurrently and normalize each table.
+#
+#   python sweep.py 101 102 120              # explicit stat IDs
+#   python sweep.py 100-200 --concurrency 16 --rate 8
+#
+# pip install requests  (--format parquet/arrow: pip install pyarrow)
+import argparse, json, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import metrics
+from http_client import DEFAULT_RATE, HostRateLimiter, rate_limited
+from records import StatColumns
+from snapshots import SnapshotStore, write_delta
+from stat_catalog import columns_from_table
+from stat_detail import CATALOG, fetch_stat_detail_json, locate_rows_columns, normalize_columns, payload_season, refresh_catalog
+
+DEFAULT_CONCURRENCY = 8
+
+# ===== Sweep ===================================================================
+def parse_stat_ids(specs: Iterable[str]) -> List[str]:
+    """Expands "101", "101,102" and "100-110" style specs into stat IDs (order kept, deduped)."""
+    out: List[str] = []
+    for spec in specs:
+        for part in str(spec).split(","):
+            part = part.strip()
+            if not part:
+                continue
+            if "-" in part and all(p.isdigit() for p in part.split("-", 1)):
+                lo, hi = (int(p) for p in part.split("-", 1))
+                out.extend(str(i) for i in range(lo, hi + 1))
+            else:
+                out.append(part)
+    return list(dict.fromkeys(out))
+
+def select_stat_ids(specs: Iterable[str], category: Optional[str] = None, use_catalog: bool = True) -> List[str]:
+    """
+    Stat IDs for a run: the explicit specs and/or every stat in `category`.
+    With a catalog available, IDs the site no longer lists are dropped
+    instead of being requested.
+    """
+    stat_ids = parse_stat_ids(specs)
+    if not use_catalog and category is None:
+        return stat_ids
+    try:
+        catalog = refresh_catalog()
+    except Exception as e:
+        if category is not None:
+            raise
+        print(f"// stat catalog unavailable ({type(e).__name__}: {e}); using the IDs as given")
+        return stat_ids
+    if category is not None:
+        listed = catalog.stat_ids(category)
+        if not listed:
+            raise SystemExit(f"No stats under category {category!r}; known: {', '.join(catalog.categories()) or 'none'}")
+        stat_ids = [s for s in stat_ids if s in listed] if stat_ids else listed
+    elif len(catalog):
+        unlisted = [s for s in stat_ids if s not in catalog]
+        if unlisted:
+            print(f"// skipping {len(unlisted)} stat IDs not in the catalog: {', '.join(unlisted[:20])}"
+                  f"{' ...' if len(unlisted) > 20 else ''}")
+        stat_ids = [s for s in stat_ids if s in catalog]
+    return stat_ids
+
+def scrape_stat(stat_id: str, season: Optional[int] = None, tournament_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Fetch → locate → normalize for one stat, the rows normalized into a
+    StatColumns. Errors are returned, not raised. Requests are paced by the
+    limiter the caller installed with http_client.rate_limited().
+    """
+    started = time.perf_counter()
+    result: Dict[str, Any] = {"stat_id": stat_id, "season": season, "tournament_id": tournament_id,
+                              "rows": [], "columns": [], "normalized": StatColumns(), "error": None}
+    try:
+        blob = fetch_stat_detail_json(stat_id, season, tournament_id)
+        rows, cols, query = locate_rows_columns(blob.get("pageProps", {}) or {}, stat_id)
+        result.update(rows=rows, columns=cols, normalized=normalize_columns(rows, cols, stat_id),
+                      season=payload_season(query) or season)
+        if rows:
+            CATALOG.record_columns(stat_id, columns_from_table(cols, query))
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+def sweep(stat_ids: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY, rate: float = DEFAULT_RATE,
+          on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+    """
+    Scrapes many stats with a bounded thread pool and a per-host rate limit.
+
+    Args:
+        stat_ids: Stat IDs to fetch.
+        concurrency (int): Maximum number of requests in flight.
+        rate (float): Requests per second per host (<= 0 disables the limit).
+        on_result: Called with each result as soon as it completes.
+
+    Returns:
+        list: One result dict per stat, in the order the IDs were given.
+    """
+    stat_ids = list(stat_ids)
+    results: Dict[str, Dict[str, Any]] = {}
+    with rate_limited(HostRateLimiter(rate, burst=concurrency)), ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = [pool.submit(scrape_stat, sid) for sid in stat_ids]
+        for fut in as_completed(futures):
+            res = fut.result()
+            results[res["stat_id"]] = res
+            if on_result:
+                on_result(res)
+    return [results[sid] for sid in stat_ids]
+
+def write_normalized(result: Dict[str, Any], outdir: Path = Path("out"), fmt: str = "json"):
+    """Writes one stat's normalized rows as compact JSON or a columnar partition."""
+    if result["error"] or not result["normalized"]:
+        return
+    with metrics.timer("export", stat_id=result["stat_id"], format=fmt) as t:
+        if fmt != "json":
+            import columnar
+            path = columnar.write_partition(result["normalized"], result["stat_id"], fmt=fmt, root=outdir / "columnar",
+                                            season=result["season"])
+        else:
+            outdir.mkdir(exist_ok=True)
+            path = outdir / f"stat_{result['stat_id']}_normalized.json"
+            path.write_text(json.dumps(list(result["normalized"].dicts()), ensure_ascii=False))
+        t.add(rows=len(result["normalized"]), bytes=path.stat().st_size)
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Fetch and normalize many PGA Tour stats concurrently.")
+    ap.add_argument("stat_ids", nargs="*", help='stat IDs, comma lists or ranges like "100-200"')
+    ap.add_argument("--category", help='every stat in this catalog category, e.g. "Off The Tee"')
+    ap.add_argument("--no-catalog", action="store_true", help="request the given IDs even if the catalog doesn't list them")
+    ap.add_argument("--list-categories", action="store_true", help="print the catalog categories and exit")
+    ap.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    ap.add_argument("--rate", type=float, default=DEFAULT_RATE, help="requests/sec per host (0 = unlimited)")
+    ap.add_argument("--out", type=Path, default=Path("out"))
+    ap.add_argument("--format", choices=("json", "parquet", "arrow"), default="json")
+    ap.add_argument("--delta", action="store_true", help="also write per-stat change events vs the last sweep")
+    ap.add_argument("--warehouse", type=Path, nargs="?", const=Path("out") / "warehouse.sqlite",
+                    help="also load normalized rows into this SQLite warehouse")
+    args = ap.parse_args(argv)
+
+    if args.list_categories:
+        for name, n in refresh_catalog().categories().items():
+            print(f"{n:>4}  {name}")
+        return
+    if not args.stat_ids and not args.category:
+        ap.error("give stat IDs and/or --category")
+    stat_ids = select_stat_ids(args.stat_ids, args.category, not args.no_catalog)
+    snapshots = SnapshotStore()
+    started = time.perf_counter()
+
+    def report(res: Dict[str, Any]):
+        if res["error"]:
+            print(f"stat {res['stat_id']}: FAILED ({res['error']})")
+        else:
+            print(f"stat {res['stat_id']}: {len(res['normalized'])} rows in {res['seconds']}s")
+            write_normalized(res, args.out, args.format)
+            if args.delta:
+                write_delta(res["stat_id"], snapshots.diff(res["stat_id"], res["rows"]), args.out / "deltas")
+            if wh:
+                wh.load_normalized(res["stat_id"], res["normalized"], season=res["season"])
+
+    wh = None
+    if args.warehouse:
+        from warehouse import Warehouse
+        wh = Warehouse(args.warehouse)
+    try:
+        results = sweep(stat_ids, args.concurrency, args.rate, on_result=report)
+    finally:
+        if wh:
+            wh.close()
+    failed = sum(1 for r in results if r["error"])
+    print(f"\nSwept {len(results)} stats ({failed} failed) in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# Persisted index of where the rows/columns table lives inside a payload.
+#
+# Payloads for the same deployment and the same kind of stat query share a
+# shape, so once a full scan has found the table we remember its JSON path
+# (keyed by buildId + stat family) and later payloads jump straight to it.
+import json, threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+INDEX_PATH = Path("cache") / "table_paths.json"
+
+class TablePathIndex:
+    """
+    Maps "<buildId>|<stat family>" to {"root": "data" | "pageProps", "path": [...],
+    "family": ...}. "family" names the query a pageProps path runs through, so a
+    reordered payload isn't read at a stale index. "<buildId>|<family>|<statId>"
+    holds {"columns": "before" | "after" | "none"} for streaming that stat.
+
+    Args:
+        path (Path): JSON file the index is persisted to.
+    """
+
+    def __init__(self, path: Path = INDEX_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            self._paths: Dict[str, Dict[str, Any]] = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self._paths = {}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._paths.get(key)
+
+    def put(self, key: str, entry: Dict[str, Any]):
+        with self._lock:
+            if self._paths.get(key) == entry:
+                return
+            self._paths[key] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._paths))
+            tmp.replace(self.path)
+
+    def forget(self, key: str):
+        with self._lock:
+            self._paths.pop(key, None)
@@ -0,0 +1,6 @@
+# The scrapers are flat top-level modules; make them importable from tests/.
+import os, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
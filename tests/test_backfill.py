@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import backfill, sweep, work_queue
+from backfill import Checkpoint, Job
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures"
+
+@pytest.fixture
+def site_ignores_year(tmp_path, monkeypatch):
+    """Every stat request returns the recorded 2025 payload, whatever season was asked for."""
+    monkeypatch.chdir(tmp_path)
+    asked = []
+
+    def fetch(stat_id, season=None, tournament_id=None):
+        asked.append((stat_id, season))
+        return json.loads((FIXTURES / f"stat_{stat_id}_next_data.json").read_text())
+    monkeypatch.setattr(sweep, "fetch_stat_detail_json", fetch)
+    return asked
+
+def test_backfill_fails_jobs_for_seasons_the_site_did_not_serve(tmp_path, site_ignores_year):
+    jobs = list(backfill.enumerate_jobs(["101", "120"], [2024, 2025]))
+    checkpoint = Checkpoint(tmp_path / "checkpoint.jsonl")
+    sunk = []
+
+    def sink(job, res):
+        sunk.append(job)
+        backfill.write_job_output(job, res["normalized"], tmp_path / "out", res["season"])
+
+    counts = backfill.run_backfill(jobs, checkpoint, concurrency=2, rate=0, sink=sink)
+
+    assert counts == {"skipped": 0, "done": 2, "failed": 2}
+    assert checkpoint.done == {"101|2025|", "120|2025|"}
+    assert {j.season for j in sunk} == {2025}
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == ["2025"]
+    failed = [json.loads(line) for line in checkpoint.path.read_text().splitlines()]
+    assert all("not 2024" in e["error"] for e in failed if e["status"] == "failed")
+
+def test_worker_fails_jobs_for_seasons_the_site_did_not_serve(tmp_path, site_ignores_year):
+    queue = work_queue.SQLiteQueue(tmp_path / "queue.sqlite", max_attempts=1)
+    queue.enqueue([Job("101", 2024), Job("101", 2025)])
+    sunk = []
+
+    counts = work_queue.run_worker(queue, lambda job, res: sunk.append(job), threads=1, rate=0, idle_exit=0)
+
+    assert counts == {"done": 1, "failed": 1, "lost": 0}
+    assert sunk == [Job("101", 2025)]
+    assert queue.counts()["failed"] == 1
@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import metrics
+from build_id_cache import BuildIdCache
+
+def _responder(live_build_id, dead_stats=()):
+    calls = []
+
+    def request_for(stat_id):
+        def request(build_id):
+            calls.append((stat_id, build_id))
+            ok = build_id == live_build_id and stat_id not in dead_stats
+            return SimpleNamespace(status_code=200 if ok else 404)
+        return request
+    return request_for, calls
+
+def _discoverer(build_id):
+    calls = []
+
+    def discover():
+        calls.append(build_id)
+        return build_id
+    return discover, calls
+
+REFRESHES = "pga_build_id_refreshes_total"
+
+def test_dead_stat_404_does_not_retry_or_count_a_refresh(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    before = metrics.snapshot().get(REFRESHES, 0)
+    cache = BuildIdCache(tmp_path / "build_id.json", seed="b1")
+    discover, discoveries = _discoverer("b1")
+    request_for, requests = _responder("b1", dead_stats={"999", "998"})
+
+    assert cache.fetch(discover, request_for("999")).status_code == 404
+    assert cache.fetch(discover, request_for("998")).status_code == 404
+    assert cache.fetch(discover, request_for("101")).status_code == 200
+
+    assert len(discoveries) <= 1
+    assert requests == [("999", "b1"), ("998", "b1"), ("101", "b1")]
+    assert metrics.snapshot().get(REFRESHES, 0) == before
+
+def test_new_deployment_404_retries_with_the_new_build_id(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    before = metrics.snapshot().get(REFRESHES, 0)
+    cache = BuildIdCache(tmp_path / "build_id.json", seed="old")
+    discover, discoveries = _discoverer("new")
+    request_for, requests = _responder("new")
+
+    assert cache.fetch(discover, request_for("101")).status_code == 200
+    assert discoveries == ["new"]
+    assert requests == [("101", "old"), ("101", "new")]
+    assert metrics.snapshot().get(REFRESHES, 0) == before + 1
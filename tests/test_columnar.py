@@ -0,0 +1,27 @@
+import datetime as dt
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import analytics
+import columnar
+
+ROWS = [{"rank": "1", "player_id": "1", "player": "A", "avg_distance": 320.5, "total_yards": 641.0,
+         "attempts_or_events": 2.0, "stat_id": "101"}]
+
+def test_long_from_columnar_uses_the_stored_season(tmp_path):
+    # Scraped in January for the season just finished
+    columnar.write_partition(ROWS, "101", root=tmp_path, season=2024,
+                             scraped_at=dt.datetime(2025, 1, 10, tzinfo=dt.timezone.utc))
+    df = analytics.long_from_columnar(tmp_path)
+    assert set(df["season"]) == {2024}
+
+def test_files_without_a_season_fall_back_to_the_scrape_year(tmp_path):
+    import pyarrow.parquet as pq
+    table = columnar.to_table(ROWS, "normalized", dt.datetime(2025, 1, 10, tzinfo=dt.timezone.utc))
+    part = tmp_path / "normalized" / "stat_id=101" / "scrape_date=2025-01-10"
+    part.mkdir(parents=True)
+    pq.write_table(table.drop_columns(["season"]), part / "part-old.parquet")
+    df = analytics.long_from_columnar(tmp_path)
+    assert set(df["season"]) == {2025}
@@ -0,0 +1,43 @@
+from multiprocessing import Pool
+
+import requests
+
+from http_cache import ResponseCache
+
+def _response(status: int, body: bytes = b"", **headers: str) -> requests.Response:
+    r = requests.Response()
+    r.status_code = status
+    r._content = body
+    r.headers.update(headers)
+    r.encoding = "utf-8"
+    return r
+
+def _store(args):
+    root, i = args
+    ResponseCache(root).store(f"https://example.test/stat/{i}", _response(200, b"x" * 10, ETag=f'"e{i}"'))
+
+def test_processes_sharing_the_cache_keep_each_others_validators(tmp_path):
+    with Pool(4) as pool:
+        pool.map(_store, [(tmp_path, i) for i in range(40)])
+
+    cache = ResponseCache(tmp_path)
+    assert all(cache.validators(f"https://example.test/stat/{i}") == {"If-None-Match": f'"e{i}"'} for i in range(40))
+
+def test_304_replays_the_stored_body_and_refreshes_validators(tmp_path):
+    url = "https://example.test/stat/101"
+    writer, reader = ResponseCache(tmp_path), ResponseCache(tmp_path)
+    writer.store(url, _response(200, b"body", ETag='"v1"'))
+
+    r = reader.replay(url, _response(304, ETag='"v2"'))
+
+    assert (r.status_code, r.content, r.from_cache) == (200, b"body", True)
+    assert writer.validators(url) == {"If-None-Match": '"v2"'}
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=300)
+    for i in range(10):
+        cache.store(f"https://example.test/{i}", _response(200, b"y" * 100, ETag='"e"'))
+
+    assert cache.size <= 300
+    assert cache.validators("https://example.test/9")
+    assert not cache.validators("https://example.test/0")
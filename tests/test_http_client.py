@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+
+import http_client
+
+class CountingLimiter:
+    def __init__(self):
+        self.urls = []
+
+    def acquire(self, url):
+        self.urls.append(url)
+
+def test_every_attempt_takes_a_token(monkeypatch):
+    statuses = iter([503, 429, 200])
+    session = SimpleNamespace(get=lambda url, **kw: SimpleNamespace(status_code=next(statuses), headers={}))
+    monkeypatch.setattr(http_client, "get_session", lambda: session)
+    monkeypatch.setattr(http_client.time, "sleep", lambda s: None)
+    limiter = CountingLimiter()
+    with http_client.rate_limited(limiter):
+        r = http_client.get("https://example.test/a", use_cache=False)
+    assert r.status_code == 200
+    assert limiter.urls == ["https://example.test/a"] * 3
+    # the limiter only applies inside the block
+    statuses = iter([200])
+    http_client.get("https://example.test/a", use_cache=False)
+    assert len(limiter.urls) == 3
+
+def test_host_rate_limiter_paces_after_the_burst(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(http_client.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(http_client.time, "sleep", lambda s: clock.__setitem__(0, clock[0] + s))
+    limiter = http_client.HostRateLimiter(rate=2, burst=2)
+    for _ in range(4):
+        limiter.acquire("https://example.test/x")
+    assert clock[0] == 1.0  # two free, then one every half second
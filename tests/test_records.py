@@ -0,0 +1,38 @@
+import math
+
+import pytest
+
+from records import StatColumns
+from warehouse import Warehouse
+
+ROWS = [
+    {"rank": "T1", "player": "A", "player_id": "1", "avg_distance": "1,298.4", "total_yards": "E"},
+    {"rank": "3", "player": "B", "player_id": None, "avg_distance": "-", "attempts_or_events": "72"},
+]
+
+def test_stat_columns_parse_once_and_keep_non_numeric_text():
+    cols = StatColumns.from_normalized("101", ROWS)
+
+    assert len(cols) == 2
+    assert cols.numbers["avg_distance"][0] == 1298.4
+    assert math.isnan(cols.numbers["total_yards"][0])
+    assert cols.value("total_yards", 0) == "E"
+    assert cols.value("total_yards", 1) is None
+    assert list(cols.dicts())[1] == {"rank": "3", "player": "B", "player_id": None, "avg_distance": "-",
+                                     "attempts_or_events": 72.0}
+
+def test_warehouse_loads_stat_columns_without_reparsing(tmp_path):
+    with Warehouse(tmp_path / "w.sqlite") as wh:
+        assert wh.load_normalized("101", StatColumns.from_normalized("101", ROWS), season=2025) == 4
+        values = {(r["player_id"], r["metric"]): (r["value"], r["raw"]) for r in wh.player_history("1")}
+        values.update({(r["player_id"], r["metric"]): (r["value"], r["raw"]) for r in wh.player_history("name:B")})
+
+    assert values == {("1", "avg_distance"): (1298.4, None), ("1", "total_yards"): (None, "E"),
+                      ("name:B", "avg_distance"): (None, "-"), ("name:B", "attempts_or_events"): (72.0, None)}
+
+def test_long_frame_from_stat_columns():
+    analytics = pytest.importorskip("analytics")
+    long = analytics.long_from_normalized([("101", 2025, StatColumns.from_normalized("101", ROWS))])
+
+    assert sorted(zip(long["player_id"], long["metric"], long["value"])) == [
+        ("1", "avg_distance", 1298.4), ("name:B", "attempts_or_events", 72.0)]
@@ -0,0 +1,53 @@
+import io, json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("ijson")
+import json_stream, stat_detail
+from table_paths import TablePathIndex
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures"
+
+def _payload(stat_id: str) -> dict:
+    return json.loads((FIXTURES / f"stat_{stat_id}_next_data.json").read_text())
+
+def _columns_after_rows(blob: dict) -> dict:
+    for q in blob["pageProps"]["dehydratedState"]["queries"]:
+        data = q["state"]["data"]
+        if "columns" in data:
+            q["state"]["data"] = {**{k: v for k, v in data.items() if k != "columns"}, "columns": data["columns"]}
+    return blob
+
+def _stream(stat_id: str, blob: dict, build_id: str):
+    prefixes, layout = stat_detail._stream_targets(stat_id, "statDetails", build_id)
+    events = json_stream.parse(io.BytesIO(json.dumps(blob).encode()))
+    out = list(stat_detail._stream_query_table(events, stat_id, prefixes, layout))
+    return out[0][1], [r for _, r in out[1:]]
+
+@pytest.fixture
+def table_paths(tmp_path, monkeypatch):
+    index = TablePathIndex(tmp_path / "table_paths.json")
+    monkeypatch.setattr(stat_detail, "TABLE_PATHS", index)
+    return index
+
+@pytest.mark.parametrize("locate_first", [False, True])
+def test_columns_after_rows_not_lost_to_another_stats_layout(table_paths, locate_first):
+    # 120 has no columns, so its family entry is learned from a table without any
+    stat_detail.locate_rows_columns(_payload("120")["pageProps"], "120", build_id="b1")
+    blob = _columns_after_rows(_payload("101"))
+    rows, cols, _ = stat_detail.locate_rows_columns(json.loads(json.dumps(blob))["pageProps"], "101", build_id="b1")
+    assert cols
+    if not locate_first:
+        table_paths.forget("b1|statDetails|101")
+
+    streamed_cols, streamed_rows = _stream("101", blob, "b1")
+
+    assert streamed_cols == cols
+    assert streamed_rows == rows
+    assert stat_detail.normalize_rows(streamed_rows, streamed_cols) == stat_detail.normalize_rows(rows, cols)
+
+def test_stat_without_columns_streams(table_paths):
+    blob = _payload("120")
+    rows, cols, _ = stat_detail.locate_rows_columns(blob["pageProps"], "120", build_id="b1")
+    assert _stream("120", blob, "b1") == (cols, rows)
@@ -0,0 +1,236 @@
+# Local SQLite stat warehouse.
+#
+# One file holding every scrape in three tables:
+#   players(player_id, name, country)
+#   stats(stat_id, name)
+#   stat_values(stat_id, player_id, season, tournament_id, scraped_on, metric, value, raw, rank)
+# (tournament_id is '' for season-to-date values; raw keeps the scraped text
+# only when it isn't a number, e.g. "E" or "-"), indexed so "one player across
+# all stats" and "one stat's leaderboard" are single index lookups instead of
+# globbing and parsing files in out/.
+import datetime as dt
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from records import StatColumns, to_float
+
+WAREHOUSE_PATH = Path("out") / "warehouse.sqlite"
+BATCH_SIZE = 5000
+
+# Metric columns per row shape (normalize_rows output / pga.py player_info)
+NORMALIZED_METRICS = ("avg_distance", "total_yards", "attempts_or_events")
+PLAYER_STATS_METRICS = ("scoring_avg", "total_strokes", "total_adjustment", "total_rounds")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    player_id TEXT PRIMARY KEY,
+    name      TEXT,
+    country   TEXT
+);
+CREATE TABLE IF NOT EXISTS stats (
+    stat_id TEXT PRIMARY KEY,
+    name    TEXT
+);
+CREATE TABLE IF NOT EXISTS stat_values (
+    stat_id    TEXT NOT NULL,
+    player_id  TEXT NOT NULL,
+    season     INTEGER NOT NULL,
+    tournament_id TEXT NOT NULL DEFAULT '',
+    scraped_on TEXT NOT NULL,
+    metric     TEXT NOT NULL,
+    value      REAL,
+    raw        TEXT,
+    rank       TEXT,
+    PRIMARY KEY (stat_id, season, tournament_id, scraped_on, player_id, metric)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_stat_values_player ON stat_values (player_id, stat_id, season);
+CREATE INDEX IF NOT EXISTS ix_stat_values_stat ON stat_values (stat_id, season, metric);
+"""
+
+_VALUE_COLUMNS = "stat_id, player_id, season, tournament_id, scraped_on, metric, value, raw, rank"
+
+# ((player_id, name, country), rank, [(metric, value, raw text)]) per player row
+_Record = Tuple[Tuple[Any, ...], Optional[str], List[Tuple[str, Optional[float], Optional[str]]]]
+
+def _player_key(pid: Any, name: Any) -> Optional[str]:
+    if pid not in (None, ""):
+        return str(pid)
+    return f"name:{name}" if name else None
+
+def _column_records(cols: StatColumns) -> Iterator[_Record]:
+    """Rows of a StatColumns, numbers as parsed there (no re-parsing)."""
+    numbers, text = cols.numbers, cols.text
+    for i in range(len(cols)):
+        pid = _player_key(cols.player_id[i], cols.player[i])
+        if pid is None:
+            continue
+        values = []
+        for m in NORMALIZED_METRICS:
+            v = numbers[m][i]
+            if v == v:  # not NaN
+                values.append((m, v, None))
+            elif i in text[m]:
+                values.append((m, None, text[m][i]))
+        yield (pid, cols.player[i], None), cols.rank[i], values
+
+def _dict_records(rows: Iterable[Dict[str, Any]], name_field: str, metrics: Tuple[str, ...]) -> Iterator[_Record]:
+    for r in rows:
+        pid = _player_key(r.get("player_id"), r.get(name_field))
+        if pid is None:
+            continue
+        values = []
+        for m in metrics:
+            raw = r.get(m)
+            if raw is None:
+                continue
+            v = to_float(raw)
+            values.append((m, v, None if v is not None else str(raw)))
+        yield (pid, r.get(name_field), r.get("country")), r.get("rank"), values
+
+class Warehouse:
+    """
+    Thin wrapper around the SQLite file with bulk loaders and a query API.
+
+    Args:
+        path (Path): SQLite database file (created on first use).
+    """
+
+    def __init__(self, path: Path = WAREHOUSE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+        self.conn.executescript(_SCHEMA)
+
+    def _migrate(self):
+        # Files from before tournament_id: the primary key changes, so rebuild the table
+        cols = [r[1] for r in self.conn.execute("PRAGMA table_info(stat_values)")]
+        if not cols or "tournament_id" in cols:
+            return
+        with self.conn:
+            self.conn.execute("ALTER TABLE stat_values RENAME TO stat_values_old")
+            self.conn.execute("DROP INDEX IF EXISTS ix_stat_values_player")
+            self.conn.execute("DROP INDEX IF EXISTS ix_stat_values_stat")
+        self.conn.executescript(_SCHEMA)
+        with self.conn:
+            old = _VALUE_COLUMNS.replace("tournament_id", "''")
+            self.conn.execute(f"INSERT INTO stat_values ({_VALUE_COLUMNS}) SELECT {old} FROM stat_values_old")
+            self.conn.execute("DROP TABLE stat_values_old")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ===== Loading ===========================================================
+    def _load(self, stat_id: str, records: Iterable[_Record], season: Optional[int], tournament_id: Optional[str],
+              scraped_on: Optional[dt.date], stat_name: Optional[str], batch_size: int) -> int:
+        scraped_on = scraped_on or dt.date.today()
+        if season is None:  # callers pass the payload's season; the scrape year is a last resort
+            season = scraped_on.year
+        day = scraped_on.isoformat()
+        tournament = tournament_id or ""
+
+        def values() -> Iterator[Tuple[Tuple[Any, ...], Optional[Tuple[Any, ...]]]]:
+            for player, rank, metric_values in records:
+                pid = player[0]
+                for m, value, raw in metric_values:
+                    yield (stat_id, pid, season, tournament, day, m, value, raw, rank), player
+                    player = None  # one player upsert per row
+
+        n = 0
+        batch: List[Tuple[Any, ...]] = []
+        players: List[Tuple[Any, ...]] = []
+        with self.conn:  # one transaction for the whole load
+            self.conn.execute("INSERT INTO stats (stat_id, name) VALUES (?, ?) "
+                              "ON CONFLICT(stat_id) DO UPDATE SET name = COALESCE(excluded.name, stats.name)",
+                              (stat_id, stat_name))
+            for value, player in values():
+                batch.append(value)
+                if player:
+                    players.append(player)
+                if len(batch) >= batch_size:
+                    n += self._flush(batch, players)
+            n += self._flush(batch, players)
+        return n
+
+    def _flush(self, batch: List[Tuple[Any, ...]], players: List[Tuple[Any, ...]]) -> int:
+        if players:
+            self.conn.executemany(
+                "INSERT INTO players (player_id, name, country) VALUES (?, ?, ?) "
+                "ON CONFLICT(player_id) DO UPDATE SET name = COALESCE(excluded.name, players.name), "
+                "country = COALESCE(excluded.country, players.country)", players)
+        if batch:
+            self.conn.executemany(f"INSERT OR REPLACE INTO stat_values ({_VALUE_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                  batch)
+        n = len(batch)
+        batch.clear(); players.clear()
+        return n
+
+    def load_normalized(self, stat_id: str, rows: Union[Iterable[Dict[str, Any]], StatColumns], season: Optional[int] = None,
+                        scraped_on: Optional[dt.date] = None, stat_name: Optional[str] = None,
+                        batch_size: int = BATCH_SIZE, tournament_id: Optional[str] = None) -> int:
+        """
+        Loads one stat's normalized rows (a StatColumns, or normalize_rows() dicts,
+        which are parsed into one first). Re-loading the same day replaces it.
+        `season` should be the one the payload reports (stat_detail.payload_season)
+        or else the one requested; only if it is None is the scrape year used.
+        Values scraped for a tournament (`tournament_id`) are kept apart from the
+        season-to-date ones.
+
+        Returns:
+            int: Number of stat values written.
+        """
+        if not isinstance(rows, StatColumns):
+            rows = StatColumns.from_normalized(stat_id, rows)
+        return self._load(stat_id, _column_records(rows), season, tournament_id, scraped_on, stat_name, batch_size)
+
+    def load_player_stats(self, stat_id: str, rows: Iterable[Dict[str, Any]], season: Optional[int] = None,
+                          scraped_on: Optional[dt.date] = None, stat_name: Optional[str] = None,
+                          batch_size: int = BATCH_SIZE, tournament_id: Optional[str] = None) -> int:
+        """Loads pga.py `player_info` dicts for one stat (see load_normalized)."""
+        return self._load(stat_id, _dict_records(rows, "player_name", PLAYER_STATS_METRICS), season, tournament_id,
+                          scraped_on, stat_name, batch_size)
+
+    # ===== Queries ===========================================================
+    def find_players(self, name_like: str, limit: int = 20) -> List[Dict[str, Any]]:
+        cur = self.conn.execute("SELECT * FROM players WHERE name LIKE ? ORDER BY name LIMIT ?",
+                                (f"%{name_like}%", limit))
+        return [dict(r) for r in cur]
+
+    def player_history(self, player_id: str, stat_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Every value for one player (optionally one stat), newest first."""
+        sql = "SELECT * FROM stat_values WHERE player_id = ?"
+        args: List[Any] = [player_id]
+        if stat_id is not None:
+            sql += " AND stat_id = ?"; args.append(stat_id)
+        cur = self.conn.execute(sql + " ORDER BY stat_id, season DESC, scraped_on DESC, metric", args)
+        return [dict(r) for r in cur]
+
+    def leaderboard(self, stat_id: str, metric: str, season: Optional[int] = None,
+                    scraped_on: Optional[str] = None, descending: bool = True, limit: int = 50,
+                    tournament_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """One stat/metric ranked by value for the latest (or given) scrape of a season (or tournament)."""
+        tournament = tournament_id or ""
+        if season is None:
+            row = self.conn.execute("SELECT MAX(season) FROM stat_values WHERE stat_id = ? AND tournament_id = ? "
+                                    "AND metric = ?", (stat_id, tournament, metric)).fetchone()
+            season = row[0]
+        if scraped_on is None:
+            row = self.conn.execute("SELECT MAX(scraped_on) FROM stat_values WHERE stat_id = ? AND season = ? "
+                                    "AND tournament_id = ? AND metric = ?", (stat_id, season, tournament, metric)).fetchone()
+            scraped_on = row[0]
+        cur = self.conn.execute(
+            "SELECT v.*, p.name, p.country FROM stat_values v JOIN players p USING (player_id) "
+            "WHERE v.stat_id = ? AND v.season = ? AND v.tournament_id = ? AND v.scraped_on = ? AND v.metric = ? "
+            f"ORDER BY v.value {'DESC' if descending else 'ASC'} LIMIT ?",
+            (stat_id, season, tournament, scraped_on, metric, limit))
+        return [dict(r) for r in cur]
@@ -0,0 +1,448 @@
+# Distributed scrape jobs: a coordinator enqueues (stat_id, season) jobs and
+# any number of worker processes, on any number of hosts, lease, run and
+# acknowledge them.
+#
+#   python work_queue.py enqueue 101,102,120 --seasons 2015-2025 --queue sqlite:///out/queue.sqlite
+#   python work_queue.py work --queue redis://queue-host:6379/0 --threads 4 --rate 5
+#   python work_queue.py status --queue redis://queue-host:6379/0
+#
+# Semantics are at-least-once. Jobs are deduplicated by key on enqueue
+# (`enqueue --force` re-runs ones already done or failed). A
+# lease hides a job for `visibility` seconds; if the worker dies before
+# acking, the job becomes visible again and another worker picks it up. A job
+# that fails (or whose lease expires) `max_attempts` times is parked as failed.
+#
+# Backends: SQLite (one file; fine for workers on one host, or a few over a
+# shared disk) and Redis (any Redis-compatible server; only plain string,
+# hash, set and sorted-set commands are used, no Lua).
+# pip install requests  (redis backend: pip install redis)
+import abc, argparse, json, os, socket, sqlite3, threading, time, uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from backfill import BACKFILL_DIR, Job, check_result, enumerate_jobs, parse_seasons, write_job_output
+from http_client import DEFAULT_RATE, HostRateLimiter, rate_limited
+from sweep import scrape_stat, select_stat_ids
+
+DEFAULT_VISIBILITY = 300.0  # seconds a lease hides a job
+DEFAULT_MAX_ATTEMPTS = 5
+RETRY_DELAY = 30.0  # seconds before a failed job is retried
+
+Lease = Tuple[Job, str]  # (job, lease id)
+
+def _job_payload(job: Job) -> str:
+    return json.dumps({"stat_id": job.stat_id, "season": job.season, "tournament_id": job.tournament_id})
+
+def _job_from_payload(payload: str) -> Job:
+    d = json.loads(payload)
+    return Job(d["stat_id"], d["season"], d.get("tournament_id"))
+
+class JobQueue(abc.ABC):
+    """
+    Interface shared by the backends.
+
+    Args:
+        visibility (float): Seconds a leased job stays hidden from other workers.
+        max_attempts (int): Leases per job before it is parked as failed.
+    """
+
+    def __init__(self, visibility: float = DEFAULT_VISIBILITY, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.visibility = visibility
+        self.max_attempts = max_attempts
+
+    @abc.abstractmethod
+    def enqueue(self, jobs: Iterable[Job], force: bool = False) -> int:
+        """
+        Adds jobs whose key was never enqueued before; returns how many were queued.
+
+        With `force`, jobs already done or failed are queued again with a fresh
+        attempt budget; queued and leased ones are still left alone.
+        """
+
+    @abc.abstractmethod
+    def lease(self, worker: str) -> Optional[Lease]:
+        """Claims the next visible job for `visibility` seconds, or None if there is none."""
+
+    @abc.abstractmethod
+    def ack(self, lease_id: str, job: Job) -> bool:
+        """Marks a leased job done. False if the lease had already expired and moved on."""
+
+    @abc.abstractmethod
+    def fail(self, lease_id: str, job: Job, error: str, retry_in: float = RETRY_DELAY) -> bool:
+        """Gives a job back (visible again after `retry_in`), or parks it once out of attempts."""
+
+    @abc.abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per state: queued, leased, done, failed."""
+
+    @abc.abstractmethod
+    def requeue_failed(self) -> int:
+        """Moves every failed job back to the queue with a fresh attempt budget."""
+
+# ===== SQLite ================================================================
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    key        TEXT PRIMARY KEY,
+    payload    TEXT NOT NULL,
+    state      TEXT NOT NULL DEFAULT 'queued',
+    visible_at REAL NOT NULL DEFAULT 0,
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    lease_id   TEXT,
+    worker     TEXT,
+    error      TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_visible ON jobs (state, visible_at);
+"""
+
+class SQLiteQueue(JobQueue):
+    """
+    Job queue in one SQLite file (WAL; one connection per thread).
+
+    Args:
+        path (Path): Database file (created on first use).
+    """
+
+    def __init__(self, path: Path = Path("out") / "queue.sqlite", **kwargs: Any):
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, jobs: Iterable[Job], force: bool = False) -> int:
+        conn = self._conn()
+        now = time.time()
+        sql = "INSERT INTO jobs (key, payload, visible_at, updated_at) VALUES (?, ?, 0, ?) ON CONFLICT (key) DO "
+        sql += ("UPDATE SET state = 'queued', visible_at = 0, attempts = 0, lease_id = NULL, error = NULL, "
+                "updated_at = excluded.updated_at WHERE state IN ('done', 'failed')" if force else "NOTHING")
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cur = conn.executemany(sql, ((j.key, _job_payload(j), now) for j in jobs))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return cur.rowcount
+
+    def lease(self, worker: str) -> Optional[Lease]:
+        conn = self._conn()
+        while True:
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")  # one leaser at a time; the transaction is two statements
+            try:
+                row = conn.execute("SELECT key, payload, attempts FROM jobs WHERE state IN ('queued', 'leased') "
+                                   "AND visible_at <= ? ORDER BY visible_at, rowid LIMIT 1", (now,)).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                key, payload, attempts = row
+                if attempts >= self.max_attempts:  # lease expired on every attempt
+                    conn.execute("UPDATE jobs SET state = 'failed', error = COALESCE(error, 'lease expired'), "
+                                 "lease_id = NULL, updated_at = ? WHERE key = ?", (now, key))
+                    conn.execute("COMMIT")
+                    continue
+                lease_id = uuid.uuid4().hex
+                conn.execute("UPDATE jobs SET state = 'leased', lease_id = ?, worker = ?, visible_at = ?, "
+                             "attempts = attempts + 1, updated_at = ? WHERE key = ?",
+                             (lease_id, worker, now + self.visibility, now, key))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return _job_from_payload(payload), lease_id
+
+    def ack(self, lease_id: str, job: Job) -> bool:
+        cur = self._conn().execute("UPDATE jobs SET state = 'done', lease_id = NULL, error = NULL, updated_at = ? "
+                                   "WHERE key = ? AND lease_id = ?", (time.time(), job.key, lease_id))
+        return cur.rowcount == 1
+
+    def fail(self, lease_id: str, job: Job, error: str, retry_in: float = RETRY_DELAY) -> bool:
+        now = time.time()
+        cur = self._conn().execute(
+            "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+            "visible_at = ?, lease_id = NULL, error = ?, updated_at = ? WHERE key = ? AND lease_id = ?",
+            (self.max_attempts, now + retry_in, error, now, job.key, lease_id))
+        return cur.rowcount == 1
+
+    def counts(self) -> Dict[str, int]:
+        out = {"queued": 0, "leased": 0, "done": 0, "failed": 0}
+        now = time.time()
+        for state, expired, n in self._conn().execute(
+                "SELECT state, state = 'leased' AND visible_at <= ?, COUNT(*) FROM jobs GROUP BY 1, 2", (now,)):
+            out["queued" if expired else state] += n  # an expired lease is queued again
+        return out
+
+    def requeue_failed(self) -> int:
+        cur = self._conn().execute("UPDATE jobs SET state = 'queued', attempts = 0, visible_at = 0, updated_at = ? "
+                                   "WHERE state = 'failed'", (time.time(),))
+        return cur.rowcount
+
+# ===== Redis =================================================================
+class RedisQueue(JobQueue):
+    """
+    Job queue in a Redis-compatible server.
+
+    Keys (under `namespace`):
+        jobs      hash  key → payload, for every job ever enqueued (the dedupe set)
+        pending   zset  key → time it becomes visible; leased jobs are pushed
+                        `visibility` seconds ahead, so expiry needs no reaper
+        lease:<k> str   lease id, SET NX PX so only one worker wins a job
+        attempts  hash  key → leases so far
+        done      set   finished keys
+        failed    hash  key → last error
+
+    Args:
+        client: A redis.Redis-like client (decode_responses=True), or None to
+            connect to `url`.
+        url (str): redis:// URL used when no client is given.
+        namespace (str): Key prefix, so several queues can share a server.
+    """
+
+    def __init__(self, client: Any = None, url: str = "redis://localhost:6379/0",
+                 namespace: str = "pga:queue", **kwargs: Any):
+        super().__init__(**kwargs)
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("the redis backend needs the redis package: pip install redis") from None
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self.r = client
+        self.ns = namespace
+
+    def _k(self, name: str) -> str:
+        return f"{self.ns}:{name}"
+
+    def enqueue(self, jobs: Iterable[Job], force: bool = False) -> int:
+        n = 0
+        for job in jobs:
+            if self.r.hsetnx(self._k("jobs"), job.key, _job_payload(job)):
+                self.r.zadd(self._k("pending"), {job.key: 0})
+                n += 1
+            elif force and (self.r.srem(self._k("done"), job.key) or self.r.hdel(self._k("failed"), job.key)):
+                self.r.hdel(self._k("attempts"), job.key)
+                self.r.zadd(self._k("pending"), {job.key: 0})
+                n += 1
+        return n
+
+    def lease(self, worker: str) -> Optional[Lease]:
+        while True:
+            now = time.time()
+            candidates = self.r.zrangebyscore(self._k("pending"), "-inf", now, start=0, num=16)
+            if not candidates:
+                return None
+            for key in candidates:
+                lease_id = f"{worker}:{uuid.uuid4().hex}"
+                if not self.r.set(self._k(f"lease:{key}"), lease_id, nx=True, px=int(self.visibility * 1000)):
+                    continue  # another worker holds it
+                if self.r.zscore(self._k("pending"), key) is None:
+                    self.r.delete(self._k(f"lease:{key}"))
+                    continue  # acked between our range read and the claim
+                attempts = self.r.hincrby(self._k("attempts"), key, 1)
+                if attempts > self.max_attempts:
+                    self.r.zrem(self._k("pending"), key)
+                    self.r.hsetnx(self._k("failed"), key, "lease expired")
+                    self.r.delete(self._k(f"lease:{key}"))
+                    continue
+                self.r.zadd(self._k("pending"), {key: now + self.visibility})
+                return _job_from_payload(self.r.hget(self._k("jobs"), key)), lease_id
+            # every visible candidate was taken by someone else; look again
+
+    def _owns(self, lease_id: str, job: Job) -> bool:
+        return self.r.get(self._k(f"lease:{job.key}")) == lease_id
+
+    def ack(self, lease_id: str, job: Job) -> bool:
+        if not self._owns(lease_id, job):
+            return False
+        self.r.zrem(self._k("pending"), job.key)
+        self.r.sadd(self._k("done"), job.key)
+        self.r.hdel(self._k("failed"), job.key)
+        self.r.delete(self._k(f"lease:{job.key}"))
+        return True
+
+    def fail(self, lease_id: str, job: Job, error: str, retry_in: float = RETRY_DELAY) -> bool:
+        if not self._owns(lease_id, job):
+            return False
+        if int(self.r.hget(self._k("attempts"), job.key) or 0) >= self.max_attempts:
+            self.r.zrem(self._k("pending"), job.key)
+            self.r.hset(self._k("failed"), job.key, error)
+        else:
+            self.r.zadd(self._k("pending"), {job.key: time.time() + retry_in})
+        self.r.delete(self._k(f"lease:{job.key}"))
+        return True
+
+    def counts(self) -> Dict[str, int]:
+        now = time.time()
+        pending = self.r.zcard(self._k("pending"))
+        visible = self.r.zcount(self._k("pending"), "-inf", now)
+        return {"queued": visible, "leased": pending - visible, "done": self.r.scard(self._k("done")),
+                "failed": self.r.hlen(self._k("failed"))}
+
+    def requeue_failed(self) -> int:
+        failed = self.r.hkeys(self._k("failed"))
+        for key in failed:
+            self.r.hdel(self._k("attempts"), key)
+            self.r.zadd(self._k("pending"), {key: 0})
+            self.r.hdel(self._k("failed"), key)
+        return len(failed)
+
+def open_queue(url: str, **kwargs: Any) -> JobQueue:
+    """'sqlite:///out/queue.sqlite' (or a plain path) → SQLiteQueue, 'redis://...' → RedisQueue."""
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisQueue(url=url, **kwargs)
+    return SQLiteQueue(Path(url[len("sqlite:///"):] if url.startswith("sqlite:///") else url), **kwargs)
+
+# ===== Worker ================================================================
+def run_worker(queue: JobQueue, sink: Callable[[Job, Dict[str, Any]], None], threads: int = 1,
+               rate: float = DEFAULT_RATE, max_jobs: Optional[int] = None, idle_exit: Optional[float] = None,
+               poll: float = 2.0) -> Dict[str, int]:
+    """
+    Leases and runs jobs (fetch → locate → normalize → sink) until stopped.
+
+    Args:
+        queue (JobQueue): Where jobs come from.
+        sink: Called with (job, sweep result) once it passed check_result();
+            an exception fails the job.
+        threads (int): Jobs in flight in this process.
+        rate (float): Requests per second per host for this process.
+        max_jobs (int): Stop after this many jobs (None = no limit).
+        idle_exit (float): Stop after the queue has been empty this long (None = never).
+        poll (float): Seconds between polls of an empty queue.
+
+    Returns:
+        dict: Counts of "done", "failed" and "lost" (lease expired before ack).
+    """
+    worker_base = f"{socket.gethostname()}:{os.getpid()}"
+    counts = {"done": 0, "failed": 0, "lost": 0}
+    inflight = [0]
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def take() -> bool:
+        # reserve a slot under max_jobs before leasing, so no job is leased and then dropped
+        with lock:
+            if max_jobs is not None and sum(counts.values()) + inflight[0] >= max_jobs:
+                return False
+            inflight[0] += 1
+            return True
+
+    def loop(n: int):
+        worker = f"{worker_base}:{n}"
+        idle_since = None
+        while not stop.is_set():
+            if not take():
+                return
+            leased = queue.lease(worker)
+            if leased is None:
+                with lock:
+                    inflight[0] -= 1
+                idle_since = idle_since or time.monotonic()
+                if idle_exit is not None and time.monotonic() - idle_since >= idle_exit:
+                    return
+                stop.wait(poll)
+                continue
+            idle_since = None
+            job, lease_id = leased
+            res = scrape_stat(job.stat_id, job.season, job.tournament_id)
+            try:
+                check_result(job, res)
+                sink(job, res)
+            except Exception as e:
+                ok, outcome = queue.fail(lease_id, job, str(e)), "failed"
+                print(f"{job.key}: FAILED ({e})")
+            else:
+                ok, outcome = queue.ack(lease_id, job), "done"
+                print(f"{job.key}: {len(res['normalized'])} rows in {res['seconds']}s")
+            with lock:
+                inflight[0] -= 1
+                counts[outcome if ok else "lost"] += 1
+
+    pool = [threading.Thread(target=loop, args=(i,), daemon=True) for i in range(max(1, threads))]
+    with rate_limited(HostRateLimiter(rate, burst=threads)):
+        for t in pool:
+            t.start()
+        try:
+            for t in pool:
+                while t.is_alive():
+                    t.join(0.5)
+        except KeyboardInterrupt:
+            stop.set()
+            for t in pool:
+                t.join()
+    return counts
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Distribute stat scrape jobs over worker processes and hosts.")
+    ap.add_argument("--queue", default=os.environ.get("PGA_QUEUE", "sqlite:///out/queue.sqlite"),
+                    help="sqlite:///path or redis://host:port/db (default: $PGA_QUEUE)")
+    ap.add_argument("--visibility", type=float, default=DEFAULT_VISIBILITY, help="lease length in seconds")
+    ap.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    enq = sub.add_parser("enqueue", help="add (stat, season) jobs")
+    enq.add_argument("stat_ids", nargs="*", help='stat IDs, comma lists or ranges like "100-200"')
+    enq.add_argument("--category", help="every stat in this catalog category")
+    enq.add_argument("--seasons", required=True, help='e.g. "2005-2025" or "2019,2021"')
+    enq.add_argument("--tournaments", default="", help="optional comma-separated tournament IDs")
+    enq.add_argument("--force", action="store_true", help="also re-run jobs that are already done or failed")
+
+    work = sub.add_parser("work", help="lease and run jobs")
+    work.add_argument("--threads", type=int, default=4)
+    work.add_argument("--rate", type=float, default=DEFAULT_RATE, help="requests/sec per host for this worker")
+    work.add_argument("--max-jobs", type=int)
+    work.add_argument("--exit-when-empty", type=float, metavar="SECONDS", help="stop after the queue is empty this long")
+    work.add_argument("--out", type=Path, default=BACKFILL_DIR)
+    work.add_argument("--warehouse", type=Path, nargs="?", const=Path("out") / "warehouse.sqlite",
+                      help="also load each job into this SQLite warehouse")
+
+    sub.add_parser("status", help="job counts per state")
+    sub.add_parser("requeue-failed", help="give failed jobs a fresh attempt budget")
+    args = ap.parse_args(argv)
+
+    queue = open_queue(args.queue, visibility=args.visibility, max_attempts=args.max_attempts)
+    if args.cmd == "enqueue":
+        if not args.stat_ids and not args.category:
+            ap.error("give stat IDs and/or --category")
+        stat_ids = select_stat_ids(args.stat_ids, args.category, use_catalog=False)
+        tournaments = [t for t in args.tournaments.split(",") if t] or [None]
+        jobs = list(enumerate_jobs(stat_ids, parse_seasons(args.seasons), tournaments))
+        verb = "new or re-run" if args.force else "new"
+        print(f"Enqueued {queue.enqueue(jobs, force=args.force)} {verb} of {len(jobs)} jobs -> {queue.counts()}")
+    elif args.cmd == "work":
+        local = threading.local()
+
+        def warehouse():
+            # sqlite connections stay on the thread that opened them, so one per
+            # worker thread; each load commits, and they close at exit
+            if getattr(local, "wh", None) is None:
+                from warehouse import Warehouse
+                local.wh = Warehouse(args.warehouse)
+            return local.wh
+
+        def sink(job: Job, res: Dict[str, Any]):
+            write_job_output(job, res["normalized"], args.out, res["season"])
+            if args.warehouse:
+                warehouse().load_normalized(job.stat_id, res["normalized"], season=res["season"],
+                                            tournament_id=job.tournament_id)
+
+        started = time.perf_counter()
+        counts = run_worker(queue, sink, args.threads, args.rate, args.max_jobs, args.exit_when_empty)
+        print(f"\n{counts} in {time.perf_counter() - started:.1f}s; queue: {queue.counts()}")
+    elif args.cmd == "status":
+        print(json.dumps(queue.counts()))
+    else:
+        print(f"Requeued {queue.requeue_failed()} failed jobs")
+
+if __name__ == "__main__":
+    main()